@@ -2,6 +2,7 @@ import readline
 import os
 
 from core.civilization import Civilization
+from core.civilization.person.brain.llm.cache import get_completion_cache
 from core.civilization.person.tracer.log import LogTracer
 from core.civilization.person.tracer.redis import RedisTracer
 from core.config import settings
@@ -32,13 +33,19 @@ def main():
 
             civilization.solve(problem)
 
+            if settings.LLM_CACHE:
+                logger.debug(f"completion cache: {get_completion_cache().stats()}")
+
             readline.add_history(problem)
         except KeyboardInterrupt:
+            civilization.close()
             os._exit(0)
         except EOFError:
             logger.info("Bye!")
             break
 
+    civilization.close()
+
 
 if __name__ == "__main__":
     main()
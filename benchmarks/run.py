@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, List
+
+DEFAULT_PROBLEMS = [
+    "Tell me the current working directory.",
+    "Say hello to the world.",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark Civilization.solve and Person.respond "
+        "against a scripted local LLM"
+    )
+    parser.add_argument("--problem", action="append", dest="problems")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--mode", choices=["solve", "respond", "all"], default="all")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--script", help="script passed to benchmarks.server")
+    parser.add_argument("--output", default="bench_output.json")
+    return parser.parse_args()
+
+
+def start_server(args) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.server",
+        "--port",
+        str(args.port),
+        "--latency",
+        str(args.latency),
+        "--tokens-per-second",
+        str(args.tokens_per_second),
+    ]
+    if args.script:
+        command += ["--script", args.script]
+    server = subprocess.Popen(command)
+
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", args.port), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("Scripted LLM server did not start")
+
+
+def get_llm_calls(port: int) -> Dict[str, int]:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/v1/stats") as response:
+        return json.load(response)
+
+
+def configure_environment(port: int):
+    # must run before core is imported, settings are read at import time
+    os.environ["OPENAI_API_BASE"] = f"http://127.0.0.1:{port}/v1"
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["PINECONE_API_KEY"] = ""
+    os.environ["LTERM_MEMORY"] = ""
+    os.environ["LLM_CACHE"] = "false"
+    os.environ["LLM_RECORD_PATH"] = ""
+    os.environ["LLM_REPLAY_PATH"] = ""
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+    os.makedirs("playground", exist_ok=True)
+
+
+def get_rss_kb() -> int:
+    # current resident set, ru_maxrss only ever holds the lifetime peak
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Sampler:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_threads = threading.active_count()
+        self.peak_rss_kb = get_rss_kb()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while not self.stopped.is_set():
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_rss_kb = max(self.peak_rss_kb, get_rss_kb())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.children_rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stopped.set()
+        self.thread.join()
+        self.peak_rss_kb = max(self.peak_rss_kb, get_rss_kb())
+        # the largest child reaped during this problem, if it beat earlier ones
+        children_rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        self.peak_children_rss_kb = (
+            children_rss_kb if children_rss_kb > self.children_rss_kb else 0
+        )
+
+
+def measure(name: str, problem: str, port: int, run: Callable[[], None]) -> dict:
+    from benchmarks.tracer import BenchmarkTracer
+
+    BenchmarkTracer.reset()
+    calls_before = get_llm_calls(port)
+
+    with Sampler() as sampler:
+        started_at = time.perf_counter()
+        run()
+        wall_time = time.perf_counter() - started_at
+
+    calls_after = get_llm_calls(port)
+    return {
+        "benchmark": name,
+        "problem": problem,
+        "wall_time": wall_time,
+        "llm_calls": {
+            stage: calls_after[stage] - calls_before.get(stage, 0)
+            for stage in calls_after
+        },
+        **BenchmarkTracer.counts(),
+        "peak_rss_kb": sampler.peak_rss_kb,
+        "peak_children_rss_kb": sampler.peak_children_rss_kb,
+        "peak_threads": sampler.peak_threads,
+    }
+
+
+def respond(user, responder, problem: str):
+    from core.civilization.person import TalkParams
+
+    responder.respond(user, user.to_format(problem), TalkParams(attachment=[]))
+    # take the response off the user's ear so the next solve doesn't see it
+    user.ear.wait()
+
+
+def main():
+    args = parse_args()
+    problems: List[str] = args.problems or DEFAULT_PROBLEMS
+
+    server = start_server(args)
+    configure_environment(args.port)
+    try:
+        from benchmarks.tracer import BenchmarkTracer
+        from core.civilization import Civilization
+        from core.civilization.person import InviteParams
+        from core.civilization.person.default import Person
+        from core.civilization.person.tool.default import Terminal
+
+        civilization = Civilization(default_tracers=[BenchmarkTracer])
+        responder = Person(
+            name="Bench",
+            instruction="Respond to the request.",
+            params=InviteParams(tools={"terminal": Terminal()}),
+            referee=civilization.user,
+        )
+        # the user's ear only takes messages from persons it knows
+        civilization.user.add_expert(responder)
+
+        results = []
+        for _ in range(args.repeat):
+            for problem in problems:
+                if args.mode in ["solve", "all"]:
+                    results.append(
+                        measure(
+                            "solve",
+                            problem,
+                            args.port,
+                            lambda problem=problem: civilization.solve(problem),
+                        )
+                    )
+                if args.mode in ["respond", "all"]:
+                    results.append(
+                        measure(
+                            "respond",
+                            problem,
+                            args.port,
+                            lambda problem=problem: respond(
+                                civilization.user, responder, problem
+                            ),
+                        )
+                    )
+
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        civilization.close()
+    finally:
+        server.kill()
+
+    # ears listen on non-daemon threads, so leave without joining them
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from typing import Dict, List, Tuple
+
+# (marker found in the last user message, stage, reply)
+# The default script makes every person run one terminal command and respond.
+DEFAULT_SCRIPT: List[Tuple[str, str, str]] = [
+    (
+        "Make action based on opinions and your plan.",
+        "execute",
+        "Type: Use\nName: terminal\nInstruction: echo done\nExtra: \n",
+    ),
+    ("Check and increase affordance of your plan", "optimize", "[Accept] ok\n"),
+    ("Check your action was valid", "review", "[Accept] ok\n"),
+    (
+        "make the next plan to achieve the request",
+        "plan",
+        "1. Use: Run a command to answer the request. <N/A>\n"
+        "- precondition: None\n"
+        "- effect: The request is answered.\n"
+        "- constraint: None\n",
+    ),
+]
+
+
+class ScriptedLLM:
+    def __init__(
+        self,
+        script: List[Tuple[str, str, str]],
+        latency: float,
+        tokens_per_second: float,
+    ):
+        self.script = script
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.calls: Dict[str, int] = {}
+        self.lock = Lock()
+
+    def reply(self, messages: List[Dict[str, str]]) -> str:
+        prompt = messages[-1]["content"] if messages else ""
+        for marker, stage, reply in self.script:
+            if marker in prompt:
+                break
+        else:
+            stage, reply = "unknown", "[Accept] ok\n"
+
+        with self.lock:
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+        return reply
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"calls": sum(self.calls.values()), **self.calls}
+
+
+def tokenize(text: str) -> List[str]:
+    # roughly one token per four characters, like the real tokenizer on english
+    return [text[i : i + 4] for i in range(0, len(text), 4)]
+
+
+def to_event(model: str, content: str, finish_reason=None) -> bytes:
+    chunk = {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}
+        ],
+    }
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+def create_handler(llm: ScriptedLLM) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                body = json.dumps(llm.stats()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_error(404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            reply = llm.reply(request.get("messages", []))
+            model = request.get("model", "benchmark")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            time.sleep(llm.latency)
+            try:
+                for token in tokenize(reply):
+                    self.wfile.write(to_event(model, token))
+                    self.wfile.flush()
+                    if llm.tokens_per_second > 0:
+                        time.sleep(1 / llm.tokens_per_second)
+                self.wfile.write(to_event(model, "", "stop"))
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # the brain stops reading once it can parse the answer
+                pass
+            self.close_connection = True
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scripted OpenAI compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds until the first token"
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=0.0, help="0 streams instantly"
+    )
+    parser.add_argument(
+        "--script", help="json list of [marker, stage, reply] replacing the default"
+    )
+    args = parser.parse_args()
+
+    script = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script) as f:
+            script = [tuple(entry) for entry in json.load(f)]
+
+    llm = ScriptedLLM(script, args.latency, args.tokens_per_second)
+    server = ThreadingHTTPServer((args.host, args.port), create_handler(llm))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
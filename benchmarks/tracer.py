@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from core.civilization.person.action import Action, ActionType
+from core.civilization.person.tracer import BasePersonTracer
+
+if TYPE_CHECKING:
+    from core.civilization.person import BasePerson, TalkParams
+
+
+class BenchmarkTracer(BasePersonTracer):
+    lock = Lock()
+    ear_messages = 0
+    mouth_messages = 0
+    peak_queue_depth = 0
+    busy_messages = 0
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.ear_messages = 0
+            cls.mouth_messages = 0
+            cls.peak_queue_depth = 0
+            cls.busy_messages = 0
+
+    @classmethod
+    def counts(cls) -> dict[str, int]:
+        with cls.lock:
+            return {
+                "ear_messages": cls.ear_messages,
+                "mouth_messages": cls.mouth_messages,
+                "peak_queue_depth": cls.peak_queue_depth,
+                "busy_messages": cls.busy_messages,
+            }
+
+    def on_queue(self, sender: BasePerson, depth: int, accepted: bool):
+        with BenchmarkTracer.lock:
+            BenchmarkTracer.peak_queue_depth = max(
+                BenchmarkTracer.peak_queue_depth, depth
+            )
+            if not accepted:
+                BenchmarkTracer.busy_messages += 1
+
+    def on_request(self, sender: BasePerson, prompt: str, params: TalkParams):
+        with BenchmarkTracer.lock:
+            BenchmarkTracer.ear_messages += 1
+
+    def on_act(self, action: Action):
+        if action.type == ActionType.Talk:
+            with BenchmarkTracer.lock:
+                BenchmarkTracer.mouth_messages += 1
+
+    def on_response(self, sender: BasePerson, response: str):
+        with BenchmarkTracer.lock:
+            BenchmarkTracer.mouth_messages += 1
@@ -0,0 +1,3 @@
+from .tiered import TieredCache, hash_key
+
+__all__ = ["TieredCache", "hash_key"]
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+
+def hash_key(*parts: Any) -> str:
+    content = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+# In-memory LRU in front of an optional on-disk store of JSON files.
+# The disk tier is evicted by least recent access once it outgrows max_bytes.
+class TieredCache:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_items: int = 256,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.directory = directory
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.memory: OrderedDict[str, Any] = OrderedDict()
+        self.lock = Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.disk_bytes = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._scan())
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_items": len(self.memory),
+            "disk_bytes": self.disk_bytes,
+        }
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self.memory[key]
+
+            value = self._read(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self._remember(key, value)
+            self._write(key, value)
+
+    def _remember(self, key: str, value: Any) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _read(self, key: str) -> Optional[Any]:
+        if not self.directory:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # bump the access time so eviction treats the entry as recently used
+        os.utime(path)
+        return value
+
+    def _write(self, key: str, value: Any) -> None:
+        if not self.directory:
+            return
+
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False).encode()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if os.path.exists(path):
+            self.disk_bytes -= os.path.getsize(path)
+
+        # write to a temporary file first so a crash never leaves half an entry
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self.disk_bytes += len(data)
+
+        if self.disk_bytes > self.max_bytes:
+            self._evict()
+
+    def _scan(self):
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                if not file.endswith(".json"):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self) -> None:
+        for path, size, _ in sorted(self._scan(), key=lambda entry: entry[2]):
+            if self.disk_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.disk_bytes -= size
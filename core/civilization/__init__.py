@@ -1,16 +1,31 @@
+import asyncio
+from typing import Optional
+
 from core.civilization.person.tool.browser import Browser
 from core.civilization.person.tool.default import CodeWriter, Terminal
+from core.config import settings
 from core.logging import Color
 
-from .person import InviteParams, set_default_tracers
+from .cluster import set_cluster
+from .cluster.launcher import Launcher
+from .person import BasePerson, InviteParams, set_default_tracers
 from .person.action import Action, ActionType
+from .person.brain.llm.session import close_session
 from .person.default import Person as Person
+from .person.ear.loop import get_loop
 from .person.tracer import BasePersonTracer
 
 
 class Civilization:
     def __init__(self, default_tracers: list[type[BasePersonTracer]] = []):
         set_default_tracers(default_tracers)
+        # with workers, every person but the user runs in a worker process
+        self.cluster = (
+            Launcher(settings.CIVILIZATION_WORKERS, default_tracers)
+            if settings.CIVILIZATION_WORKERS > 0
+            else None
+        )
+        set_cluster(self.cluster)
 
         self.user = Person(
             name="David",
@@ -31,7 +46,7 @@ class Civilization:
             "You must manage your civilization well. "
             "You are PM of this civilization. "
         )
-        self.leader = Person(
+        self.leader = self.create_person(
             name="Steve",
             instruction=leader_instructon,
             params=InviteParams(
@@ -48,7 +63,7 @@ class Civilization:
             f"Follow {self.leader.name}'s instructions carefully. "
             f"Respond using markdown. You must fulfill {self.leader.name}'s request."
         )
-        self.ann = Person(
+        self.ann = self.create_person(
             name="Ann",
             instruction=follower_instruction,
             params=InviteParams(
@@ -60,7 +75,7 @@ class Civilization:
             ),
             referee=self.leader,
         )
-        self.mark = Person(
+        self.mark = self.create_person(
             name="Mark",
             instruction=follower_instruction,
             params=InviteParams(
@@ -72,7 +87,7 @@ class Civilization:
             ),
             referee=self.leader,
         )
-        self.john = Person(
+        self.john = self.create_person(
             name="John",
             instruction=follower_instruction,
             params=InviteParams(
@@ -117,19 +132,58 @@ class Civilization:
         #     referee=self.leader,
         # )
 
-        self.user.experts[self.leader.name] = self.leader
+        self.user.add_expert(self.leader)
+
+    def create_person(
+        self,
+        name: str,
+        instruction: str,
+        params: InviteParams,
+        referee: BasePerson,
+    ) -> BasePerson:
+        if self.cluster is not None:
+            return self.cluster.spawn(name, instruction, params, referee=referee)
+        return Person(
+            name=name, instruction=instruction, params=params, referee=referee
+        )
 
-    def solve(self, problem: str):
-        self.user.act(
-            Action(
-                type=ActionType.Talk,
-                name=self.leader.name,
-                instruction=problem,
-                extra="",
-            )
+    def solve(self, problem: str, timeout: Optional[float] = None) -> str:
+        action = Action(
+            type=ActionType.Talk,
+            name=self.leader.name,
+            instruction=problem,
+            extra="",
         )
+        self.user.tracer.on_act(action)
+        # only the leader's reply to this problem resolves the future, not
+        # whatever else reaches the user's ear meanwhile. The reply is what the
+        # leader tells the user, or the result of its last step if it doesn't.
+        reply = self.user.mouth.ask(
+            self.leader.ear, problem, "", timeout=timeout
+        ).result(timeout=timeout)
+        _, _, instruction, _ = reply
+        return instruction
+
+    def close(self):
+        # experts invited along the way are only reachable through the others
+        persons = {}
+        stack = [v for v in vars(self).values() if isinstance(v, Person)]
+        while stack:
+            person = stack.pop()
+            if person.name in persons:
+                continue
+            persons[person.name] = person
+            # remote experts are closed by their workers
+            stack.extend(p for p in person.experts.values() if isinstance(p, Person))
+
+        for person in persons.values():
+            person.close()
+        # completions stream on the shared loop, so their session is closed there
+        asyncio.run_coroutine_threadsafe(close_session(), get_loop()).result()
 
-        self.user.ear.wait()
+        if self.cluster is not None:
+            self.cluster.close()
+            set_cluster(None)
 
 
 __all__ = ["Civilization"]
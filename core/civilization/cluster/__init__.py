@@ -0,0 +1,6 @@
+# Launcher and Worker import Person, which imports this package, so they are
+# imported from their modules instead.
+from .client import Cluster, get_cluster, set_cluster
+from .remote import RemoteEar, RemotePerson
+
+__all__ = ["Cluster", "RemoteEar", "RemotePerson", "get_cluster", "set_cluster"]
@@ -0,0 +1,74 @@
+import glob
+import os
+from typing import List, Optional
+
+from core.civilization.person.base import BasePerson, InviteParams
+from core.civilization.person.ear.address import get_socket_dir
+from core.logging import Color
+
+from .control import WORKER_PREFIX, request
+from .remote import RemotePerson, describe_person, describe_tool, to_endpoint
+
+
+# The workers of a civilization are found by their control sockets in the
+# socket directory they share, so any process of it can spawn persons.
+class Cluster:
+    def get_workers(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(get_socket_dir(), f"{WORKER_PREFIX}*")))
+
+    def get_load(self, path: str) -> Optional[int]:
+        try:
+            return request(path, "load")["persons"]
+        except OSError:
+            # the worker is gone or hasn't started yet
+            return None
+
+    def get_least_loaded(self) -> str:
+        loads = {path: self.get_load(path) for path in self.get_workers()}
+        loads = {path: load for path, load in loads.items() if load is not None}
+        if not loads:
+            raise Exception(f"No workers found in {get_socket_dir()}")
+        return min(loads, key=loads.get)
+
+    def spawn(
+        self,
+        name: str,
+        instruction: str,
+        params: InviteParams,
+        referee: BasePerson,
+        color: Optional[Color] = None,
+    ) -> RemotePerson:
+        color = color or Color.rgb()
+        worker = self.get_least_loaded()
+        result = request(
+            worker,
+            "spawn",
+            name=name,
+            instruction=instruction,
+            color=color.value,
+            tools=[describe_tool(tool) for tool in params.tools.values()],
+            referee=describe_person(referee) if referee else None,
+        )
+        return RemotePerson(
+            name=name,
+            instruction=instruction,
+            color=color,
+            endpoint=to_endpoint(result["endpoint"]),
+            worker=worker,
+        )
+
+    def close(self):
+        pass
+
+
+_cluster: Optional[Cluster] = None
+
+
+# Persons invite their experts into the cluster when there is one.
+def get_cluster() -> Optional[Cluster]:
+    return _cluster
+
+
+def set_cluster(cluster: Optional[Cluster]):
+    global _cluster
+    _cluster = cluster
@@ -0,0 +1,38 @@
+import json
+import os
+from socket import AF_UNIX, SOCK_STREAM, socket
+from typing import Any, Dict
+
+from core.civilization.person.ear import MessageType
+from core.civilization.person.ear.address import get_socket_dir
+from core.civilization.person.ear.frame import Frame, FrameReader, pack_frame
+
+WORKER_PREFIX = ".worker-"
+
+
+def get_worker_path(index: int) -> str:
+    return os.path.join(get_socket_dir(), f"{WORKER_PREFIX}{index}.sock")
+
+
+# Sends one command to a worker and returns its answer. Commands are rare, so
+# each gets its own connection.
+def request(path: str, command: str, **data: Any) -> Dict[str, Any]:
+    with socket(AF_UNIX, SOCK_STREAM) as conn:
+        conn.connect(path)
+        conn.sendall(
+            pack_frame(
+                Frame(
+                    sender="",
+                    message_type=MessageType.Control.value,
+                    instruction=json.dumps({"command": command, **data}),
+                    extra="",
+                )
+            )
+        )
+        reply = FrameReader(conn).read()
+    if reply is None:
+        raise ConnectionError(f"Worker {path} hung up on {command}")
+    result = json.loads(reply.instruction)
+    if "error" in result:
+        raise Exception(result["error"])
+    return result
@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import time
+from typing import List, Optional
+
+from core.civilization.person.ear.address import get_socket_dir
+from core.civilization.person.tracer import BasePersonTracer
+from core.config import settings
+
+from .client import Cluster
+from .control import get_worker_path, request
+from .worker import run_worker
+
+
+# Starts the worker processes of a civilization and stops them on close. Workers
+# are spawned rather than forked, since the ear loop and pools hold threads.
+class Launcher(Cluster):
+    STARTUP_TIMEOUT = 30
+    SHUTDOWN_TIMEOUT = 5
+
+    def __init__(
+        self, workers: int, tracers: Optional[list[type[BasePersonTracer]]] = None
+    ):
+        # the workers reach this process and each other through one directory
+        socket_dir = get_socket_dir()
+        settings.EAR_SOCKET_DIR = socket_dir
+        os.makedirs(socket_dir, exist_ok=True)
+
+        context = multiprocessing.get_context("spawn")
+        self.processes: List[multiprocessing.Process] = []
+        for index in range(workers):
+            process = context.Process(
+                target=run_worker,
+                args=(index, socket_dir, tracers or []),
+                name=f"civilization-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+        self.wait_until_ready()
+
+    def wait_until_ready(self):
+        deadline = time.monotonic() + Launcher.STARTUP_TIMEOUT
+        for index, process in enumerate(self.processes):
+            while not os.path.exists(get_worker_path(index)):
+                if not process.is_alive():
+                    raise Exception(f"Worker {index} exited on startup")
+                if time.monotonic() > deadline:
+                    raise Exception(f"Worker {index} didn't start in time")
+                time.sleep(0.05)
+
+    def close(self):
+        for index, process in enumerate(self.processes):
+            if process.is_alive():
+                try:
+                    request(get_worker_path(index), "stop")
+                except OSError:
+                    pass
+        for process in self.processes:
+            process.join(Launcher.SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
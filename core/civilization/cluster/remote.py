@@ -0,0 +1,134 @@
+import importlib
+from socket import AF_UNIX
+from typing import Any, Dict, Optional
+
+from core.civilization.person.base import BasePerson, InviteParams, TalkParams
+from core.civilization.person.ear import BaseEar
+from core.civilization.person.ear.address import Endpoint
+from core.civilization.person.ear.frame import Frame
+from core.civilization.person.tool import BaseTool
+from core.logging import Color
+
+from . import control
+
+
+# The ear of a person living in another process. Mouths only need its endpoint,
+# and since it isn't in this process they always reach it over a socket. The
+# person's own ear listens and waits there, so there's nothing to do here.
+class RemoteEar(BaseEar):
+    in_process: bool = False
+
+    def __init__(self, endpoint: Endpoint):
+        super().__init__()
+        self.endpoint = endpoint
+        self.port = endpoint.address[1] if endpoint.family != AF_UNIX else None
+
+    def listen(self):
+        pass
+
+    def receive(self, frame: Frame):
+        pass
+
+    def wait(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# Stands in for a person of another process, as an expert or a referee. It has
+# what the local persons read from each other: a name, an instruction, a color
+# and an ear to talk to. It has no tracers, since tracing is done by the person
+# itself and a tracer may reset what it traced when it starts.
+class RemotePerson(BasePerson):
+    # the control socket of the worker it lives in, if it lives in one
+    worker: Optional[str] = None
+
+    def __init__(
+        self,
+        name: str,
+        instruction: str,
+        color: Color,
+        endpoint: Endpoint,
+        worker: Optional[str] = None,
+    ):
+        super().__init__(
+            name=name,
+            instruction=instruction,
+            params=InviteParams(tools={}),
+            color=color,
+            tracers=[],
+        )
+        self.ear = RemoteEar(endpoint)
+        self.worker = worker
+
+    # The person responds in its worker, and this waits for it there. Like any
+    # response, it talks back to the sender's ear on the way.
+    def respond(self, sender: BasePerson, request: str, params: TalkParams) -> str:
+        if self.worker is None:
+            raise Exception(f"{self.name} doesn't live in a worker")
+        return control.request(
+            self.worker,
+            "respond",
+            name=self.name,
+            sender=describe_person(sender),
+            request=request,
+            params=params.dict(),
+        )["result"]
+
+    def close(self):
+        pass
+
+
+def describe_person(person: BasePerson) -> Dict[str, Any]:
+    return {
+        "name": person.name,
+        "instruction": person.instruction,
+        "color": person.color.value,
+        "endpoint": [person.ear.endpoint.family, person.ear.endpoint.address],
+        "worker": getattr(person, "worker", None),
+    }
+
+
+def to_endpoint(data: list) -> Endpoint:
+    family, address = data
+    # json turns the (host, port) of a tcp endpoint into a list
+    return Endpoint(family, tuple(address) if isinstance(address, list) else address)
+
+
+def to_remote_person(data: Dict[str, Any]) -> RemotePerson:
+    return RemotePerson(
+        name=data["name"],
+        instruction=data["instruction"],
+        color=Color(data["color"]),
+        endpoint=to_endpoint(data["endpoint"]),
+        worker=data.get("worker"),
+    )
+
+
+# Tools are passed by their class and the few fields needed to make them again.
+# Coded tools keep their code in a file, which every worker on the host can read.
+def describe_tool(tool: BaseTool) -> Dict[str, Any]:
+    data = {
+        "class": f"{tool.__class__.__module__}:{tool.__class__.__qualname__}",
+        "name": tool.name,
+        "instruction": tool.instruction,
+        "color": tool.color.value,
+    }
+    file_path: Optional[str] = getattr(tool, "file_path", None)
+    if file_path is not None:
+        data["file_path"] = file_path
+    return data
+
+
+def create_tool(data: Dict[str, Any]) -> BaseTool:
+    module, qualname = data["class"].split(":")
+    Tool = getattr(importlib.import_module(module), qualname)
+    tool = Tool(
+        name=data["name"],
+        instruction=data["instruction"],
+        color=Color(data["color"]),
+    )
+    if "file_path" in data:
+        tool.file_path = data["file_path"]
+    return tool
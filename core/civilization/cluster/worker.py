@@ -0,0 +1,158 @@
+import json
+import os
+from socket import AF_UNIX, SOCK_STREAM, socket
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List
+
+from core.civilization.person import InviteParams, TalkParams, set_default_tracers
+from core.civilization.person.default import Person
+from core.civilization.person.ear import MessageType
+from core.civilization.person.ear.frame import Frame, FrameReader, pack_frame
+from core.civilization.person.tracer import BasePersonTracer
+from core.config import settings
+from core.logging import Color, logger
+
+from .client import Cluster, set_cluster
+from .control import get_worker_path
+from .remote import create_tool, to_remote_person
+
+
+# Hosts persons in a process of its own. The launcher and the persons of other
+# workers send it commands on a control socket, and once spawned a person is
+# reached through its ear like any other.
+class Worker:
+    PARENT_CHECK_INTERVAL = 1
+
+    def __init__(self, index: int):
+        self.index = index
+        self.persons: List[Person] = []
+        self.lock = Lock()
+        self.stopped = Event()
+
+        self.path = get_worker_path(index)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.listener_socket = socket(AF_UNIX, SOCK_STREAM)
+        self.listener_socket.bind(self.path)
+        self.listener_socket.listen()
+
+    def serve(self):
+        Thread(target=self.accept, daemon=True).start()
+        # a launcher that exits without stopping its workers mustn't leave them behind
+        parent = os.getppid()
+        while not self.stopped.wait(Worker.PARENT_CHECK_INTERVAL):
+            if os.getppid() != parent:
+                break
+        self.close()
+
+    def accept(self):
+        while not self.stopped.is_set():
+            try:
+                conn, _ = self.listener_socket.accept()
+            except OSError:
+                break
+            # spawning builds a person, so it mustn't hold up load queries
+            Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn: socket):
+        with conn:
+            try:
+                frame = FrameReader(conn).read()
+            except (OSError, ValueError) as e:
+                logger.exception(e)
+                return
+            if frame is None or frame.message_type != MessageType.Control.value:
+                return
+
+            try:
+                data = json.loads(frame.instruction)
+                result = self.get_command(data.pop("command"))(**data)
+            except Exception as e:
+                logger.exception(e)
+                result = {"error": str(e)}
+
+            try:
+                conn.sendall(
+                    pack_frame(
+                        Frame(
+                            sender="",
+                            message_type=MessageType.Control.value,
+                            instruction=json.dumps(result),
+                            extra="",
+                            in_reply_to=frame.message_id,
+                        )
+                    )
+                )
+            except OSError:
+                pass
+
+    def get_command(self, command: str) -> Callable[..., Dict[str, Any]]:
+        commands = {
+            "spawn": self.spawn,
+            "respond": self.respond,
+            "load": self.load,
+            "stop": self.stop,
+        }
+        if command not in commands:
+            raise ValueError(f"Unknown command {command}")
+        return commands[command]
+
+    def spawn(
+        self,
+        name: str,
+        instruction: str,
+        color: list,
+        tools: List[Dict[str, Any]],
+        referee: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        tools = [create_tool(tool) for tool in tools]
+        person = Person(
+            name,
+            instruction,
+            InviteParams(tools={tool.name: tool for tool in tools}),
+            referee=to_remote_person(referee) if referee else None,
+            color=Color(color),
+        )
+        with self.lock:
+            self.persons.append(person)
+        endpoint = person.ear.endpoint
+        return {"endpoint": [endpoint.family, endpoint.address]}
+
+    def respond(
+        self, name: str, sender: Dict[str, Any], request: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        with self.lock:
+            person = next((p for p in self.persons if p.name == name), None)
+        if person is None:
+            raise ValueError(f"{name} doesn't live in worker {self.index}")
+        result = person.respond(to_remote_person(sender), request, TalkParams(**params))
+        return {"result": result}
+
+    def load(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"persons": len(self.persons)}
+
+    def stop(self) -> Dict[str, Any]:
+        self.stopped.set()
+        return {}
+
+    def close(self):
+        try:
+            self.listener_socket.close()
+            os.unlink(self.path)
+        except OSError:
+            pass
+        with self.lock:
+            persons, self.persons = self.persons, []
+        for person in persons:
+            person.close()
+
+
+def run_worker(index: int, socket_dir: str, tracers: list[type[BasePersonTracer]]):
+    # workers are started fresh, so what the launcher set at runtime comes along
+    settings.EAR_SOCKET_DIR = socket_dir
+    set_default_tracers(tracers)
+    # experts invited by the persons here go to the least loaded worker too
+    set_cluster(Cluster())
+    Worker(index).serve()
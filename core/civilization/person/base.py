@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel
@@ -8,6 +7,7 @@ from core.civilization.god.system import System
 from core.logging import ANSI, Color, Style
 
 from .brain import BaseBrain
+from .brain.metrics import ProblemMetrics
 from .ear import BaseEar
 from .mouth import BaseMouth
 from .tool import BaseTool
@@ -33,6 +33,10 @@ class InviteParams(BaseModel):
 
 class TalkParams(BaseModel):
     attachment: list[str]
+    # taken from the frame, so the response can name the message it answers
+    message_id: int = 0
+    in_reply_to: int = 0
+    deadline: float = 0.0
 
     @staticmethod
     def from_str(content: str):
@@ -59,16 +63,6 @@ class PersonMessageFormat:
         )
 
 
-class MessageType(Enum):
-    Default = 1
-
-
-INSTRUCTION_LENGTH_BYTES = 4
-EXTRA_LENGTH_BYTES = 4
-MESSAGE_SENDER_BYTES = 12
-MESSAGE_TYPE_BYTES = 4
-
-
 INVALID_MESSAGE_SENDER_ERROR_MESSAGE = "Invalid Message Sender"
 INVALID_MESSAGE_TYPE_ERROR_MESSAGE = "Invalid Message Type"
 
@@ -89,14 +83,15 @@ class BasePerson(BaseModel, PersonMessageFormat, ABC):
     referee: Optional["BasePerson"] = None
     tools: dict[str, BaseTool] = {}
     brain: BaseBrain = None
+    metrics: ProblemMetrics = None
     experts: dict[str, "BasePerson"] = {}
     tracer: PersonTracerWrapper = None
     ear: BaseEar = None
     mouth: BaseMouth = None
 
-    def __init__(self, **data):
+    def __init__(self, tracers: Optional[list[type[BasePersonTracer]]] = None, **data):
         super().__init__(**data)
-        self.set_tracers(tracers=DEFAULT_TRACERS)
+        self.set_tracers(tracers=DEFAULT_TRACERS if tracers is None else tracers)
 
     def set_tracers(self, tracers: list[BasePersonTracer]):
         self.tracer = PersonTracerWrapper(person=self, tracers=tracers)
@@ -104,6 +99,9 @@ class BasePerson(BaseModel, PersonMessageFormat, ABC):
     def add_tracer(self, Tracer: type[BasePersonTracer]):
         self.tracer.add(Tracer)
 
+    def get_metrics(self) -> ProblemMetrics:
+        return self.metrics
+
     def __str__(self):
         return ANSI((f"{self.name}({self.__class__.__name__})").center(20)).to(
             self.color, Style.bold()
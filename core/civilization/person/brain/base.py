@@ -6,10 +6,12 @@ from pydantic import BaseModel
 from core.civilization.person.action.base import Plan
 
 from .llm import BaseLLM
+from .organize.prefix import PromptPrefix
 
 
 class BaseBrain(BaseModel, ABC):
     llm: BaseLLM = None
+    prefix: PromptPrefix = None
 
     @abstractmethod
     def plan(self, request: str, opinion: str, constraints: List[str]) -> List[Plan]:
@@ -26,3 +28,6 @@ class BaseBrain(BaseModel, ABC):
     @abstractmethod
     def review(self, prompt: str) -> Tuple[str, bool]:
         pass
+
+    class Config:
+        arbitrary_types_allowed = True
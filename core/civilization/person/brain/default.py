@@ -1,5 +1,6 @@
+import time
 from argparse import Action
-from typing import Generator, List, Tuple
+from typing import AsyncGenerator, Generator, List, Optional, Tuple
 
 from core.civilization.person.action.base import Plan
 from core.civilization.person.base import BasePerson
@@ -7,18 +8,29 @@ from core.civilization.person.brain.organize.base import BaseOrganize
 from core.civilization.person.brain.organize.execute import Executor
 from core.civilization.person.brain.organize.optimize import Optimizer
 from core.civilization.person.brain.organize.plan import Planner
+from core.civilization.person.brain.organize.prefix import PromptPrefix
 from core.civilization.person.brain.organize.review import Reviewer
+from core.civilization.person.ear.loop import iterate
 from core.config.env import settings
 
 from .base import BaseBrain
+from .llm import BaseLLM
+from .llm.cache import CachedLLM
+from .fixture import get_fixture
 from .llm.openai import OpenAILLM
-from .memory import BaseMemory, LongTermMemory, ShortTermMemory
+from .llm.replay import RecordingLLM, ReplayLLM
+from .llm.router import LLMRouter
+from .llm.tokens import count_message_tokens, count_tokens, get_cost
+from .memory import BaseMemory, LongTermMemory, PlanCache, ShortTermMemory
+from .metrics import Stage, StageMetrics
 
 
 class Brain(BaseBrain):
     person: BasePerson = None
+    router: LLMRouter = None
     sterm_memory: BaseMemory[list[dict[str, str]]] = None
     lterm_memory: BaseMemory[str] = None
+    plan_cache: PlanCache = None
 
     planner: BaseOrganize = None
     optimizer: BaseOrganize = None
@@ -28,53 +40,82 @@ class Brain(BaseBrain):
     init_message: str = "Your name is {name}. {instruction}"
 
     def __init__(self, person: BasePerson, name: str, instruction: str):
-        super().__init__(llm=OpenAILLM())
+        router = LLMRouter.from_settings(name, create=Brain.create_llm)
+        super().__init__(llm=router.default, router=router)
         self.lterm_memory = (
-            LongTermMemory(name, instruction) if settings.PINECONE_API_KEY else None
+            LongTermMemory(name, instruction) if settings.LTERM_MEMORY else None
         )
         self.sterm_memory = ShortTermMemory(name, instruction, self.init_message)
+        self.plan_cache = (
+            PlanCache(
+                vector=LongTermMemory.create_vector(),
+                similarity=settings.PLAN_CACHE_SIMILARITY,
+            )
+            if settings.PLAN_CACHE
+            else None
+        )
 
         self.person = person
+        self.prefix = PromptPrefix(person)
         self.planner = Planner()
         self.optimizer = Optimizer()
         self.executor = Executor()
         self.reviewer = Reviewer()
 
+    @staticmethod
+    def create_llm(model: str) -> BaseLLM:
+        if settings.LLM_REPLAY_PATH:
+            return ReplayLLM(
+                model=model,
+                fixture=get_fixture(settings.LLM_REPLAY_PATH),
+                realtime=settings.LLM_REPLAY_REALTIME,
+            )
+
+        llm = OpenAILLM(model)
+        if settings.LLM_RECORD_PATH:
+            llm = RecordingLLM(llm=llm, fixture=get_fixture(settings.LLM_RECORD_PATH))
+        return CachedLLM(llm) if settings.LLM_CACHE else llm
+
+    def recall(self, request: str) -> str:
+        if self.lterm_memory is None:
+            return request
+        return self.lterm_memory.load(request)
+
+    # request is what recall returned, with the plans made for similar requests
     def plan(
         self, request: str, opinions: List[str], constraints: List[str]
     ) -> List[Plan]:
         prompt = self.planner.stringify(self.person, request, opinions, constraints)
 
-        thought = ""
-        for t in self._think(prompt):
-            thought += t
+        thought = self._think_through(prompt, self.planner, Stage.Plan)
 
         return self.planner.parse(self.person, thought)
 
     def optimize(self, request: str, plans: List[Plan]) -> Tuple[str, bool]:
         prompt = self.optimizer.stringify(self.person, request, plans)
 
-        thought = ""
-        for t in self._think(prompt):
-            thought += t
+        thought = self._think_through(prompt, self.optimizer, Stage.Optimize)
 
         opinion, ok = self.optimizer.parse(self.person, thought)
         if ok:
-            self.sterm_memory.save(
-                "Make a plan to respond to the request. Request is:\n" + request,
-                "\n".join(map(str, plans)),
-            )
+            self.remember(request, plans)
 
         return opinion, ok
 
+    def remember(self, request: str, plans: List[Plan]):
+        self.sterm_memory.save(
+            "Make a plan to respond to the request. Request is:\n" + request,
+            "\n".join(map(str, plans)),
+        )
+        if self.lterm_memory is not None:
+            self.lterm_memory.save(request, "\n".join(map(str, plans)))
+
     def execute(self, plan: Plan, opinions: str) -> Action:
         prompt = self.executor.stringify(self.person, plan, opinions)
 
         print(prompt)
 
-        thought = ""
-        for t in self._think(prompt):
-            thought += t
+        thought = self._think_through(prompt, self.executor, Stage.Execute)
 
         print(thought)
 
@@ -83,9 +124,7 @@ class Brain(BaseBrain):
     def review(self, plan: str, action: Action, result: str) -> Tuple[str, bool]:
         prompt = self.reviewer.stringify(self.person, plan, action, result)
 
-        thought = ""
-        for t in self._think(prompt):
-            thought += t
+        thought = self._think_through(prompt, self.reviewer, Stage.Review)
 
         opinion, ok = self.reviewer.parse(self.person, thought)
         if ok:
@@ -95,8 +134,80 @@ class Brain(BaseBrain):
             )
         return opinion, ok
 
-    def _think(self, prompt: str) -> Generator[str, None, None]:
+    def close(self):
+        self.sterm_memory.close()
+        if self.lterm_memory is not None:
+            self.lterm_memory.close()
+
+    def _think_through(self, prompt: str, organize: BaseOrganize, stage: Stage) -> str:
+        thought = self._think_with(self.router.get(stage), prompt, organize, stage)
+
+        # a cheaper model may fail to follow the format, retry on the default one
+        escalation = self.router.escalate(stage)
+        if escalation is not None and not organize.is_valid(thought):
+            thought = self._think_with(escalation, prompt, organize, stage)
+
+        return thought
+
+    def _think_with(
+        self, llm: BaseLLM, prompt: str, organize: BaseOrganize, stage: Stage
+    ) -> str:
+        parser = organize.get_stream_parser()
+        prompt_tokens = self.sterm_memory.tokens + count_message_tokens(
+            {"role": "user", "content": prompt}
+        )
+
+        started_at = time.perf_counter()
+        time_to_first_token = None
+        contents = []
+        cached = False
+
+        chunks = self._think(prompt, llm)
+        for chunk in chunks:
+            if time_to_first_token is None:
+                time_to_first_token = time.perf_counter() - started_at
+            content = chunk["choices"][0]["delta"].get("content", "")
+            contents.append(content)
+            cached = chunk.get("cached", False)
+
+            if parser.feed(content):
+                # stop the completion as soon as the answer can be parsed
+                chunks.close()
+                break
+
+        model = getattr(llm, "model", llm.__class__.__name__)
+        # deltas don't map to tokens one to one, so what was generated is counted
+        completion_tokens = count_tokens("".join(contents), model)
+        metrics = StageMetrics(
+            stage=stage,
+            model=model,
+            time_to_first_token=time_to_first_token,
+            duration=time.perf_counter() - started_at,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=0.0 if cached else get_cost(model, prompt_tokens, completion_tokens),
+        )
+        self.person.get_metrics().add_stage(metrics)
+        self.person.tracer.on_stage(metrics)
+
+        return parser.text
+
+    def _think(
+        self, prompt: str, llm: Optional[BaseLLM] = None
+    ) -> Generator[dict, None, None]:
         messages = self.sterm_memory.load(prompt)
 
-        for thought in self.llm.chat_completion(messages):
-            yield thought["choices"][0]["delta"].get("content", "")
+        # the completion streams on the shared loop over the pooled session,
+        # this thread only waits for its chunks
+        yield from iterate(self._athink(messages, llm))
+
+    async def _athink(
+        self, messages: List[dict], llm: Optional[BaseLLM] = None
+    ) -> AsyncGenerator[dict, None]:
+        stream = await (llm or self.llm).achat_completion(messages)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # closing this generator early must close the completion's too
+            await stream.aclose()
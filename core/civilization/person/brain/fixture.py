@@ -0,0 +1,65 @@
+import json
+import os
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List, Optional
+
+
+class MissingRecordError(Exception):
+    def __init__(self, kind: str, key: str):
+        super().__init__(f"No recorded {kind} for request {key}")
+
+
+# Append-only JSON lines file of recorded LLM and embedding responses.
+# Identical requests are replayed in the order they were recorded, and the
+# last record keeps being replayed once they run out.
+class Fixture:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.records: Dict[str, List[dict]] = defaultdict(list)
+        self.cursors: Dict[str, int] = defaultdict(int)
+
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    index = self._index(record["kind"], record["key"])
+                    self.records[index].append(record)
+
+    @staticmethod
+    def _index(kind: str, key: str) -> str:
+        return f"{kind}:{key}"
+
+    def append(self, kind: str, key: str, **data):
+        record = {"kind": kind, "key": key, **data}
+        with self.lock:
+            self.records[self._index(kind, key)].append(record)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def next(self, kind: str, key: str) -> dict:
+        index = self._index(kind, key)
+        with self.lock:
+            records = self.records.get(index)
+            if not records:
+                raise MissingRecordError(kind, key)
+            cursor = self.cursors[index]
+            self.cursors[index] = min(cursor + 1, len(records) - 1)
+            return records[cursor]
+
+
+_fixtures: Dict[str, Fixture] = {}
+
+
+def get_fixture(path: str) -> Optional[Fixture]:
+    if not path:
+        return None
+    if path not in _fixtures:
+        _fixtures[path] = Fixture(path)
+    return _fixtures[path]
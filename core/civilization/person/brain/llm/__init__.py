@@ -1,4 +1,14 @@
 from .base import BaseLLM
+from .cache import CachedLLM
 from .openai import OpenAILLM
+from .replay import RecordingLLM, ReplayLLM
+from .router import LLMRouter
 
-__all__ = ["BaseLLM", "OpenAILLM"]
+__all__ = [
+    "BaseLLM",
+    "CachedLLM",
+    "LLMRouter",
+    "OpenAILLM",
+    "RecordingLLM",
+    "ReplayLLM",
+]
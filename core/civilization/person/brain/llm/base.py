@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Generator, List
+from typing import AsyncGenerator, Dict, Generator, List
 
 from pydantic import BaseModel
 
@@ -8,3 +8,7 @@ class BaseLLM(BaseModel, ABC):
     @abstractmethod
     def chat_completion(self, messages: List[Dict[str, str]]) -> Generator:
         pass
+
+    @abstractmethod
+    async def achat_completion(self, messages: List[Dict[str, str]]) -> AsyncGenerator:
+        pass
@@ -0,0 +1,105 @@
+import inspect
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
+
+from core.cache import TieredCache, hash_key
+from core.config import settings
+
+from .base import BaseLLM
+
+_completion_cache: Optional[TieredCache] = None
+
+
+def get_completion_cache() -> TieredCache:
+    global _completion_cache
+    if _completion_cache is None:
+        _completion_cache = TieredCache(
+            directory=settings.LLM_CACHE_DIR or None,
+            max_items=settings.LLM_CACHE_SIZE,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+        )
+    return _completion_cache
+
+
+# chunks served from the cache are marked, since they cost nothing
+def to_chunk(content: str, cached: bool = False) -> Dict[str, Any]:
+    chunk = {"choices": [{"delta": {"content": content}}]}
+    if cached:
+        chunk["cached"] = True
+    return chunk
+
+
+class CachedLLM(BaseLLM):
+    llm: BaseLLM
+    cache: TieredCache = None
+
+    def __init__(self, llm: BaseLLM, cache: Optional[TieredCache] = None):
+        super().__init__(llm=llm, cache=cache or get_completion_cache())
+
+    @property
+    def model(self) -> str:
+        return getattr(self.llm, "model", self.llm.__class__.__name__)
+
+    # the temperature is part of the key even when the default is used, so a
+    # completion sampled at one temperature is never replayed for another
+    def get_key(self, messages: List[Dict[str, str]], **params) -> str:
+        params.setdefault("temparture", self.get_default_temperature())
+        return hash_key(self.model, messages, params)
+
+    def get_default_temperature(self) -> Optional[float]:
+        parameter = inspect.signature(self.llm.chat_completion).parameters.get(
+            "temparture"
+        )
+        if parameter is None or parameter.default is inspect.Parameter.empty:
+            return None
+        return parameter.default
+
+    def chat_completion(self, messages: List[Dict[str, str]], **params) -> Generator:
+        key = self.get_key(messages, **params)
+        content = self.cache.get(key)
+        if content is not None:
+            return iter([to_chunk(content, cached=True)])
+
+        return self._record(key, self.llm.chat_completion(messages, **params))
+
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], **params
+    ) -> AsyncGenerator:
+        key = self.get_key(messages, **params)
+        content = self.cache.get(key)
+        if content is not None:
+            return self._replay(content)
+
+        return self._arecord(key, await self.llm.achat_completion(messages, **params))
+
+    # Brain closes a stream as soon as the answer can be parsed, so what was
+    # read up to then is cached, as it is all a replay has to give. A stream
+    # that failed midway is not.
+    def _record(self, key: str, stream: Generator) -> Generator:
+        content = ""
+        try:
+            for chunk in stream:
+                content += chunk["choices"][0]["delta"].get("content", "")
+                yield chunk
+        except GeneratorExit:
+            stream.close()
+            self.cache.set(key, content)
+            raise
+        self.cache.set(key, content)
+
+    async def _arecord(self, key: str, stream: AsyncGenerator) -> AsyncGenerator:
+        content = ""
+        try:
+            async for chunk in stream:
+                content += chunk["choices"][0]["delta"].get("content", "")
+                yield chunk
+        except GeneratorExit:
+            await stream.aclose()
+            self.cache.set(key, content)
+            raise
+        self.cache.set(key, content)
+
+    async def _replay(self, content: str) -> AsyncGenerator:
+        yield to_chunk(content, cached=True)
+
+    class Config:
+        arbitrary_types_allowed = True
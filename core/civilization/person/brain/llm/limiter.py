@@ -0,0 +1,192 @@
+import asyncio
+import random
+import time
+from collections import deque
+from threading import Event, Lock
+from typing import Callable, Deque, Optional
+
+from core.config import settings
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: int) -> float:
+        if self.capacity <= 0:
+            return 0.0
+        # a single request larger than the bucket may take the whole bucket
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount: int):
+        if self.capacity > 0:
+            self.tokens -= min(amount, self.capacity)
+
+    def give(self, amount: int):
+        # hands back what was overcharged, a negative amount charges more
+        if self.capacity > 0:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+# A caller waiting for its turn at the buckets. wake is called from whichever
+# thread lets the next caller in, so it has to be safe to call from any thread.
+class Waiter:
+    def __init__(self, tokens: int, wake: Callable[[], None]):
+        self.tokens = tokens
+        self.wake = wake
+
+
+class RateLimiter:
+    # completions are charged this many tokens until some have been measured
+    DEFAULT_COMPLETION_ESTIMATE = 256
+    # weight of the latest completion in the running estimate
+    ESTIMATE_WEIGHT = 0.2
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.paused_until = 0.0
+        self.completion_estimate = float(RateLimiter.DEFAULT_COMPLETION_ESTIMATE)
+        # callers are let in first come, first served, so a large request
+        # isn't passed over by the small ones behind it
+        self.waiters: Deque[Waiter] = deque()
+        self.lock = Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.waiters)
+
+    def estimate(self, max_tokens: int) -> int:
+        # the tokens a completion is charged up front, settled once it's done
+        with self.lock:
+            return min(max_tokens, round(self.completion_estimate))
+
+    def settle(self, estimated: int, used: int):
+        with self.lock:
+            self.tokens.refill(time.monotonic())
+            self.tokens.give(estimated - used)
+            self.completion_estimate += RateLimiter.ESTIMATE_WEIGHT * (
+                used - self.completion_estimate
+            )
+
+    def enqueue(self, tokens: int, wake: Callable[[], None]) -> Waiter:
+        waiter = Waiter(tokens, wake)
+        with self.lock:
+            self.waiters.append(waiter)
+        return waiter
+
+    def dequeue(self, waiter: Waiter):
+        # a caller that gave up mustn't hold up the ones behind it
+        with self.lock:
+            if waiter not in self.waiters:
+                return
+            first = self.waiters[0] is waiter
+            self.waiters.remove(waiter)
+            if first and self.waiters:
+                self.waiters[0].wake()
+
+    def reserve(self, waiter: Waiter) -> Optional[float]:
+        # 0 lets the caller in, None means it isn't its turn yet, and any other
+        # value is how long the first caller should wait
+        with self.lock:
+            if self.waiters[0] is not waiter:
+                return None
+
+            now = time.monotonic()
+            if self.paused_until > now:
+                return self.paused_until - now
+
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            delay = max(
+                self.requests.wait_time(1), self.tokens.wait_time(waiter.tokens)
+            )
+            if delay > 0:
+                return delay
+
+            self.requests.take(1)
+            self.tokens.take(waiter.tokens)
+            self.waiters.popleft()
+            if self.waiters:
+                self.waiters[0].wake()
+            return 0.0
+
+    def acquire(self, tokens: int):
+        turn = Event()
+        waiter = self.enqueue(tokens, turn.set)
+        try:
+            while True:
+                turn.clear()
+                delay = self.reserve(waiter)
+                if delay == 0:
+                    return
+                turn.wait(delay)
+        finally:
+            self.dequeue(waiter)
+
+    async def aacquire(self, tokens: int):
+        loop = asyncio.get_running_loop()
+        turn = asyncio.Event()
+        waiter = self.enqueue(tokens, lambda: loop.call_soon_threadsafe(turn.set))
+        try:
+            while True:
+                turn.clear()
+                delay = self.reserve(waiter)
+                if delay == 0:
+                    return
+                try:
+                    await asyncio.wait_for(turn.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.dequeue(waiter)
+
+    def backoff(self, error: Exception, attempt: int) -> float:
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            # the server knows better, hold back every caller until then
+            with self.lock:
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + retry_after
+                )
+            return retry_after
+
+        # exponential backoff with full jitter so callers don't retry in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return float(value) / scale
+        except ValueError:
+            continue
+    return None
+
+
+rate_limiter = RateLimiter(
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+)
@@ -1,20 +1,31 @@
-from typing import Dict, Generator, List
+import asyncio
+import time
+from typing import AsyncGenerator, Dict, Generator, List
 
 import openai
 from pydantic import BaseModel
-from retry import retry
 
 from core.config import settings
 from core.logging import logger
 
 from .base import BaseLLM
+from .limiter import rate_limiter
+from .session import get_session
+from .tokens import count_message_tokens, count_tokens
 
 openai.api_key = settings.OPENAI_API_KEY
 
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.Timeout,
+    openai.error.APIError,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+)
+
 
 class OpenAILLM(BaseLLM, BaseModel):
-    MAX_RETRIES = 3
-    DELAY = 3
+    MAX_RETRIES = settings.LLM_MAX_RETRIES
     model = "gpt-4"
 
     def __init__(
@@ -24,19 +35,10 @@ class OpenAILLM(BaseLLM, BaseModel):
         super().__init__()
         self.model = model
 
+    def count_prompt_tokens(self, messages: List[Dict[str, str]]) -> int:
+        return sum(count_message_tokens(message, self.model) for message in messages)
+
     # https://platform.openai.com/docs/api-reference/chat/create
-    @retry(
-        (
-            openai.error.RateLimitError,
-            openai.error.Timeout,
-            openai.error.APIError,
-            openai.error.APIConnectionError,
-            openai.error.ServiceUnavailableError,
-        ),
-        tries=MAX_RETRIES,
-        delay=DELAY,
-    )
-    @logger.disable
     def chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -46,12 +48,95 @@ class OpenAILLM(BaseLLM, BaseModel):
         stream: bool = True,
         **kargs,
     ) -> Generator:
-        return openai.ChatCompletion.create(
-            model=self.model,
-            messages=messages,
-            temperature=temparture,
-            top_p=top_p,
-            max_tokens=max_tokens,
-            stream=stream,
-            **kargs,
-        )
+        # the completion is charged an estimate up front and settled once done
+        estimated = rate_limiter.estimate(max_tokens)
+        tokens = self.count_prompt_tokens(messages) + estimated
+
+        for attempt in range(self.MAX_RETRIES):
+            rate_limiter.acquire(tokens)
+            try:
+                response = self._create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temparture,
+                    top_p=top_p,
+                    max_tokens=max_tokens,
+                    stream=stream,
+                    **kargs,
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                delay = rate_limiter.backoff(e, attempt)
+                logger.warning(
+                    f"{e.__class__.__name__}, retrying in {delay:.1f}s "
+                    f"({rate_limiter.queue_depth} waiting)"
+                )
+                time.sleep(delay)
+                continue
+
+            if not stream:
+                rate_limiter.settle(estimated, response["usage"]["completion_tokens"])
+                return response
+            return self._settle(response, estimated)
+
+    @logger.disable
+    def _create(self, **params) -> Generator:
+        return openai.ChatCompletion.create(**params)
+
+    def _settle(self, chunks: Generator, estimated: int) -> Generator:
+        content = ""
+        try:
+            for chunk in chunks:
+                content += chunk["choices"][0]["delta"].get("content", "")
+                yield chunk
+        finally:
+            # a stream closed early is settled with what it generated so far
+            rate_limiter.settle(estimated, count_tokens(content, self.model))
+
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temparture: float = 0.7,
+        top_p: float = 1.0,
+        max_tokens: int = 2048,
+        stream: bool = True,
+        **kargs,
+    ) -> AsyncGenerator:
+        # openai picks the session up from a context variable, so setting it
+        # here only affects the task that is running this completion.
+        openai.aiosession.set(get_session())
+        estimated = rate_limiter.estimate(max_tokens)
+        tokens = self.count_prompt_tokens(messages) + estimated
+
+        for attempt in range(self.MAX_RETRIES):
+            await rate_limiter.aacquire(tokens)
+            try:
+                response = await openai.ChatCompletion.acreate(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temparture,
+                    top_p=top_p,
+                    max_tokens=max_tokens,
+                    stream=stream,
+                    **kargs,
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                await asyncio.sleep(rate_limiter.backoff(e, attempt))
+                continue
+
+            if not stream:
+                rate_limiter.settle(estimated, response["usage"]["completion_tokens"])
+                return response
+            return self._asettle(response, estimated)
+
+    async def _asettle(self, chunks: AsyncGenerator, estimated: int) -> AsyncGenerator:
+        content = ""
+        try:
+            async for chunk in chunks:
+                content += chunk["choices"][0]["delta"].get("content", "")
+                yield chunk
+        finally:
+            rate_limiter.settle(estimated, count_tokens(content, self.model))
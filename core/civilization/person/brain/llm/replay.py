@@ -0,0 +1,97 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Dict, Generator, List, Tuple
+
+from core.cache import hash_key
+
+from ..fixture import Fixture
+from .base import BaseLLM
+from .cache import to_chunk
+
+CHAT = "chat"
+
+
+class RecordingLLM(BaseLLM):
+    llm: BaseLLM
+    fixture: Fixture
+
+    @property
+    def model(self) -> str:
+        return getattr(self.llm, "model", self.llm.__class__.__name__)
+
+    def chat_completion(self, messages: List[Dict[str, str]], **params) -> Generator:
+        key = hash_key(self.model, messages, params)
+        started_at = time.perf_counter()
+        return self._record(
+            key, started_at, self.llm.chat_completion(messages, **params)
+        )
+
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], **params
+    ) -> AsyncGenerator:
+        key = hash_key(self.model, messages, params)
+        started_at = time.perf_counter()
+        return self._arecord(
+            key, started_at, await self.llm.achat_completion(messages, **params)
+        )
+
+    def _record(self, key: str, started_at: float, stream: Generator) -> Generator:
+        chunks: List[Tuple[float, str]] = []
+        try:
+            for chunk in stream:
+                content = chunk["choices"][0]["delta"].get("content", "")
+                chunks.append((time.perf_counter() - started_at, content))
+                yield chunk
+        finally:
+            self.fixture.append(CHAT, key, chunks=chunks)
+
+    async def _arecord(
+        self, key: str, started_at: float, stream: AsyncGenerator
+    ) -> AsyncGenerator:
+        chunks: List[Tuple[float, str]] = []
+        try:
+            async for chunk in stream:
+                content = chunk["choices"][0]["delta"].get("content", "")
+                chunks.append((time.perf_counter() - started_at, content))
+                yield chunk
+        finally:
+            self.fixture.append(CHAT, key, chunks=chunks)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ReplayLLM(BaseLLM):
+    model: str
+    fixture: Fixture
+    # replay at the recorded speed instead of instantly
+    realtime: bool = False
+
+    def chat_completion(self, messages: List[Dict[str, str]], **params) -> Generator:
+        record = self.fixture.next(CHAT, hash_key(self.model, messages, params))
+        return self._replay(record["chunks"])
+
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], **params
+    ) -> AsyncGenerator:
+        record = self.fixture.next(CHAT, hash_key(self.model, messages, params))
+        return self._areplay(record["chunks"])
+
+    def _replay(self, chunks: List[Tuple[float, str]]) -> Generator:
+        started_at = time.perf_counter()
+        for offset, content in chunks:
+            if self.realtime:
+                time.sleep(max(0.0, offset - (time.perf_counter() - started_at)))
+            yield to_chunk(content)
+
+    async def _areplay(self, chunks: List[Tuple[float, str]]) -> AsyncGenerator:
+        started_at = time.perf_counter()
+        for offset, content in chunks:
+            if self.realtime:
+                await asyncio.sleep(
+                    max(0.0, offset - (time.perf_counter() - started_at))
+                )
+            yield to_chunk(content)
+
+    class Config:
+        arbitrary_types_allowed = True
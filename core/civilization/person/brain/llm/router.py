@@ -0,0 +1,59 @@
+from typing import Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+from core.config import settings
+
+from ..metrics import Stage
+from .base import BaseLLM
+
+
+def parse_stage_models(config: str, person: str) -> Dict[Stage, str]:
+    # "optimize=gpt-3.5-turbo,Steve.review=gpt-4": entries prefixed with a
+    # person's name only apply to that person and win over the plain ones
+    general: Dict[Stage, str] = {}
+    personal: Dict[Stage, str] = {}
+    for entry in config.split(","):
+        if "=" not in entry:
+            continue
+        key, model = (part.strip() for part in entry.split("=", 1))
+        name, _, stage = key.rpartition(".")
+        try:
+            stage = Stage(stage)
+        except ValueError:
+            continue
+        if not name:
+            general[stage] = model
+        elif name == person:
+            personal[stage] = model
+    return {**general, **personal}
+
+
+class LLMRouter(BaseModel):
+    default: BaseLLM
+    stages: Dict[Stage, BaseLLM] = {}
+
+    @staticmethod
+    def from_settings(person: str, create: Callable[[str], BaseLLM]) -> "LLMRouter":
+        llms: Dict[str, BaseLLM] = {settings.LLM_MODEL: create(settings.LLM_MODEL)}
+        stages: Dict[Stage, BaseLLM] = {}
+        for stage, model in parse_stage_models(
+            settings.LLM_STAGE_MODELS, person
+        ).items():
+            if model not in llms:
+                llms[model] = create(model)
+            stages[stage] = llms[model]
+        return LLMRouter(default=llms[settings.LLM_MODEL], stages=stages)
+
+    def get(self, stage: Stage) -> BaseLLM:
+        return self.stages.get(stage, self.default)
+
+    # pydantic validates the llms into copies, so they are told apart by model
+    def escalate(self, stage: Stage) -> Optional[BaseLLM]:
+        if get_model(self.get(stage)) == get_model(self.default):
+            return None
+        return self.default
+
+
+def get_model(llm: BaseLLM) -> str:
+    return getattr(llm, "model", llm.__class__.__name__)
@@ -0,0 +1,30 @@
+import asyncio
+import weakref
+
+from aiohttp import ClientSession, TCPConnector
+
+from core.config import settings
+
+# aiohttp sessions are bound to the loop they were created on,
+# so every loop gets exactly one pooled session shared by all persons.
+# Keyed weakly so the sessions of loops that are gone do not pile up.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_session() -> ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = ClientSession(
+            connector=TCPConnector(limit=settings.LLM_MAX_CONNECTIONS)
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_session() -> None:
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
@@ -0,0 +1,48 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# every chat message is wrapped in a few tokens of role/separator markup
+# https://github.com/openai/openai-cookbook/blob/main/examples/How_to_count_tokens_with_tiktoken.ipynb
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    encoding = get_encoding(model)
+    if encoding is None:
+        # rough estimate for english text when tiktoken is not installed
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(message: Dict[str, str], model: str = "gpt-4") -> int:
+    return count_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS
+
+
+# USD per 1K (prompt, completion) tokens
+# https://openai.com/pricing
+PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-32k": (0.06, 0.12),
+    "gpt-3.5-turbo": (0.0015, 0.002),
+    "gpt-3.5-turbo-16k": (0.003, 0.004),
+}
+
+
+def get_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
@@ -1,5 +1,6 @@
 from .base import BaseMemory
 from .long_term import LongTermMemory
+from .plan_cache import PlanCache
 from .short_term import ShortTermMemory
 
-__all__ = ["BaseMemory", "LongTermMemory", "ShortTermMemory"]
+__all__ = ["BaseMemory", "LongTermMemory", "PlanCache", "ShortTermMemory"]
@@ -19,3 +19,9 @@ class BaseMemory(Generic[T], BaseModel, ABC):
     @abstractmethod
     def save(self, prompt: str, thought: str) -> None:
         pass
+
+    def clear(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
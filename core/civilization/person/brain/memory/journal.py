@@ -0,0 +1,82 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Append-only log of a memory's writes plus a periodic snapshot of its whole
+# state. Every entry carries a sequence number and the snapshot records the
+# last one it covers, so a crash between the two writes never replays twice.
+class Journal:
+    def __init__(self, directory: str, name: str):
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r"[^\w.-]", "_", name) or "_"
+        self.path = os.path.join(directory, f"{name}.jsonl")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self.sequence = 0
+        self.entries = 0
+        self.file = None
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        snapshot = None
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            self.sequence = snapshot["sequence"]
+        except (OSError, ValueError, KeyError):
+            snapshot = None
+
+        entries = []
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # the last line may be torn by a crash mid-write
+                        break
+                    if entry["sequence"] > self.sequence:
+                        entries.append(entry)
+                        self.sequence = entry["sequence"]
+        except OSError:
+            pass
+
+        self.entries = len(entries)
+        return snapshot, entries
+
+    def append(self, **data: Any) -> None:
+        if self.file is None:
+            self.file = open(self.path, "a")
+
+        self.sequence += 1
+        self.file.write(
+            json.dumps({"sequence": self.sequence, **data}, ensure_ascii=False) + "\n"
+        )
+        self.file.flush()
+        self.entries += 1
+
+    def snapshot(self, state: Dict[str, Any]) -> None:
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"sequence": self.sequence, **state}, f, ensure_ascii=False)
+        os.replace(temp_path, self.snapshot_path)
+
+        # everything in the journal is covered by the snapshot now
+        self.close()
+        open(self.path, "w").close()
+        self.entries = 0
+
+    def clear(self) -> None:
+        self.close()
+        for path in (self.path, self.snapshot_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.sequence = 0
+        self.entries = 0
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,61 +1,139 @@
 import re
+from typing import Any
 
 import openai
 import pinecone
 
+from core.cache import hash_key
 from core.config import settings
 from core.logging import logger
 
+from ..fixture import get_fixture
 from .base import BaseMemory
-from .vector.openai import OpenAIVector
+from .vector import (
+    BaseVector,
+    CachedVector,
+    LocalIndex,
+    OpenAIVector,
+    RecordingVector,
+    ReplayVector,
+)
 
 openai.api_key = settings.OPENAI_API_KEY
 
+# every person shares one in-process index, their plans are told apart by name
+_local_index: LocalIndex = None
+
 
 class LongTermMemory(BaseMemory[str]):
-    _PLAN_PATTERN = r"- \[(?:x| )\]\s+(.+)\n"
+    vector: BaseVector = None
+
+    _PLAN_PATTERN = r"^\d+\.\s+(.+)$"
+    _RECALL_TEMPLATE = "\n\nPlans you made for similar requests before:\n{plans}"
+    # pinecone recommends upserting at most 100 vectors per request
+    _UPSERT_BATCH_SIZE = 100
 
     @logger.disable
     def __init__(self, name: str, instruction: str):
-        pinecone.init(api_key=settings.PINECONE_API_KEY, environment="us-east1-gcp")
-        index = pinecone.Index(settings.PINECONE_INDEX)
-
-        vector = OpenAIVector()
+        vector = LongTermMemory.create_vector()
 
         super().__init__(
             name=name,
             instruction=instruction,
-            storage=index,
+            storage=LongTermMemory.create_storage(),
             change_to_memory=lambda x: vector.embedding(x),
+            vector=vector,
         )
 
+    @staticmethod
+    def create_storage() -> Any:
+        if settings.LTERM_MEMORY == "local":
+            global _local_index
+            if _local_index is None:
+                _local_index = LocalIndex(
+                    approximate_threshold=settings.LOCAL_INDEX_APPROXIMATE_THRESHOLD,
+                    dtype=settings.LOCAL_INDEX_DTYPE,
+                    directory=settings.LOCAL_INDEX_DIR or None,
+                )
+            return _local_index
+
+        pinecone.init(api_key=settings.PINECONE_API_KEY, environment="us-east1-gcp")
+        return pinecone.Index(settings.PINECONE_INDEX)
+
+    @staticmethod
+    def create_vector() -> BaseVector:
+        if settings.LLM_REPLAY_PATH:
+            return ReplayVector(
+                model=OpenAIVector().model,
+                fixture=get_fixture(settings.LLM_REPLAY_PATH),
+                realtime=settings.LLM_REPLAY_REALTIME,
+            )
+
+        vector = OpenAIVector()
+        if settings.LLM_RECORD_PATH:
+            vector = RecordingVector(
+                vector=vector, fixture=get_fixture(settings.LLM_RECORD_PATH)
+            )
+        return CachedVector(vector) if settings.EMBEDDING_CACHE else vector
+
     def load(self, prompt: str) -> str:
-        return prompt  # TODO
+        try:
+            result = self.storage.query(
+                self.change_to_memory(prompt),
+                top_k=settings.LTERM_MEMORY_TOP_K,
+                namespace=self.name,
+                include_metadata=True,
+            )
+        except Exception as e:
+            logger.exception(e)
+            return prompt
+
+        plans = []
+        for match in result["matches"]:
+            plan = match["metadata"].get("plan")
+            if match["score"] >= settings.LTERM_MEMORY_MIN_SCORE and plan not in plans:
+                plans.append(plan)
+        if not plans:
+            return prompt
+
+        return prompt + LongTermMemory._RECALL_TEMPLATE.format(
+            plans="\n".join(f"- {plan}" for plan in plans)
+        )
 
     def save(self, prompt: str, thought: str) -> None:
-        plans = re.findall(LongTermMemory._PLAN_PATTERN, thought, re.DOTALL)
+        plans = re.findall(LongTermMemory._PLAN_PATTERN, thought, re.MULTILINE)
+        if not plans:
+            return
+
         vectors = [
-            pinecone.Vector(
-                id=LongTermMemory.get_plan_id(self.name, i),
-                values=self.change_to_memory(plan),
-                metadata={"name": self.name},
+            (
+                LongTermMemory.get_plan_id(self.name, plan),
+                embedding,
+                {"name": self.name, "plan": plan, "request": prompt},
             )
-            for i, plan in enumerate(plans)
+            for plan, embedding in zip(plans, self.vector.embed_many(plans))
         ]
-        if vectors:
-            try:
-                self.storage.upsert(vectors=vectors)
-            except Exception as e:
-                logger.exception(e)
+        try:
+            for i in range(0, len(vectors), LongTermMemory._UPSERT_BATCH_SIZE):
+                self.storage.upsert(
+                    vectors=vectors[i : i + LongTermMemory._UPSERT_BATCH_SIZE],
+                    namespace=self.name,
+                )
+        except Exception as e:
+            logger.exception(e)
 
     @staticmethod
-    def get_plan_id(name: str, index: int) -> str:
-        return f"{name}-plan#{index}"
+    def get_plan_id(name: str, plan: str) -> str:
+        return f"{name}-plan#{hash_key(plan)[:16]}"
 
-    def __del__(self):
-        result = self.storage.query(
-            self.change_to_memory("None"), top_k=10000, filter={"name": self.name}
-        )
-        self.storage.delete(
-            ids=[match["id"] for match in result["matches"]], filter={"name": self.name}
-        )
+    def clear(self) -> None:
+        # each person owns a namespace, so forgetting is a single bounded call
+        try:
+            self.storage.delete(delete_all=True, namespace=self.name)
+        except Exception as e:
+            logger.exception(e)
+
+    def close(self) -> None:
+        # a local index is kept by default, so the next run starts with its plans
+        if not settings.LTERM_MEMORY_PERSIST:
+            self.clear()
@@ -0,0 +1,122 @@
+import json
+import re
+from typing import List, Optional
+
+from core.cache import TieredCache, hash_key
+from core.civilization.person.action.base import Plan
+from core.civilization.person.base import BasePerson
+from core.config import settings
+from core.logging import logger
+
+from .vector import BaseVector, LocalIndex
+
+_plan_cache: Optional[TieredCache] = None
+_plan_index: Optional[LocalIndex] = None
+# similar requests whose entries the cache may have evicted since
+_SIMILAR_CANDIDATES = 3
+
+
+def get_plan_cache() -> TieredCache:
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = TieredCache(
+            directory=settings.PLAN_CACHE_DIR or None,
+            max_items=settings.PLAN_CACHE_SIZE,
+        )
+    return _plan_cache
+
+
+# The embedded requests are kept on disk like the entries they point to, so
+# similar requests still match cached plans after a restart.
+def get_plan_index() -> LocalIndex:
+    global _plan_index
+    if _plan_index is None:
+        _plan_index = LocalIndex(directory=settings.PLAN_CACHE_INDEX_DIR or None)
+    return _plan_index
+
+
+def normalize_request(request: str) -> str:
+    return re.sub(r"\s+", " ", request).strip().rstrip(".!?").lower()
+
+
+# Accepted plan lists keyed by the request and everything the planner saw
+# besides it. Requests that are only worded differently can be matched by
+# embedding similarity when a vector is given.
+class PlanCache:
+    def __init__(
+        self,
+        vector: Optional[BaseVector] = None,
+        similarity: float = 0.0,
+        cache: Optional[TieredCache] = None,
+        index: Optional[LocalIndex] = None,
+    ):
+        self.vector = vector if similarity > 0 else None
+        self.similarity = similarity
+        self.cache = cache or get_plan_cache()
+        self.index = (index or get_plan_index()) if self.vector else None
+
+    @staticmethod
+    def get_context(person: BasePerson) -> str:
+        return hash_key(
+            person.name,
+            person.instruction,
+            sorted(person.experts),
+            sorted(person.tools),
+        )
+
+    def get_key(self, context: str, request: str) -> str:
+        return hash_key(context, normalize_request(request))
+
+    def get(self, person: BasePerson, request: str) -> Optional[List[Plan]]:
+        context = PlanCache.get_context(person)
+        plans = self.cache.get(self.get_key(context, request))
+        if plans is None and self.vector is not None:
+            plans = self._get_similar(person, context, request)
+        if plans is None:
+            return None
+
+        return [Plan(**plan) for plan in plans]
+
+    def set(self, person: BasePerson, request: str, plans: List[Plan]) -> None:
+        context = PlanCache.get_context(person)
+        key = self.get_key(context, request)
+        self.cache.set(key, [json.loads(plan.json()) for plan in plans])
+
+        if self.vector is not None:
+            try:
+                self.index.upsert(
+                    vectors=[
+                        (
+                            key,
+                            self.vector.embedding(normalize_request(request)),
+                            {"context": context},
+                        )
+                    ],
+                    namespace=person.name,
+                )
+            except Exception as e:
+                logger.exception(e)
+
+    def _get_similar(
+        self, person: BasePerson, context: str, request: str
+    ) -> Optional[list]:
+        try:
+            result = self.index.query(
+                self.vector.embedding(normalize_request(request)),
+                top_k=_SIMILAR_CANDIDATES,
+                namespace=person.name,
+                filter={"context": context},
+            )
+        except Exception as e:
+            logger.exception(e)
+            return None
+
+        for match in result["matches"]:
+            if match["score"] < self.similarity:
+                break
+            plans = self.cache.get(match["id"])
+            if plans is not None:
+                return plans
+            # the cache evicted the entry, so the index lets go of it too
+            self.index.delete(ids=[match["id"]], namespace=person.name)
+        return None
@@ -1,24 +1,162 @@
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
+
+from core.civilization.person.brain.llm.tokens import count_message_tokens
+from core.config import settings
+
 from .base import BaseMemory
+from .journal import Journal
+
+SUMMARY_HEADER = "Summary of what you have done before:"
+SUMMARY_LINE_LENGTH = 160
+
+
+def shorten(text: str, length: int = SUMMARY_LINE_LENGTH) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    return text if len(text) <= length else text[: length - 3] + "..."
 
 
 class ShortTermMemory(BaseMemory[List[Dict[str, str]]]):
-    def __init__(self, name: str, instruction: str, init_message: str):
+    # 0 disables compaction and keeps the whole conversation
+    token_budget: int = 0
+    min_turns: int = 2
+    token_counts: List[int] = []
+    summary_lines: List[str] = []
+    journal: Optional[Journal] = None
+    snapshot_interval: int = 50
+
+    def __init__(
+        self,
+        name: str,
+        instruction: str,
+        init_message: str,
+        token_budget: int = settings.STM_TOKEN_BUDGET,
+        min_turns: int = settings.STM_MIN_TURNS,
+        journal_dir: str = settings.STM_JOURNAL_DIR,
+        snapshot_interval: int = settings.STM_SNAPSHOT_INTERVAL,
+    ):
+        system_message = {
+            "role": "system",
+            "content": init_message.format(name=name, instruction=instruction),
+        }
         super().__init__(
             name=name,
             instruction=instruction,
-            storage=[
-                {
-                    "role": "system",
-                    "content": init_message.format(name=name, instruction=instruction),
-                }
-            ],
+            storage=[system_message],
             change_to_memory=lambda x: x,
+            token_budget=token_budget,
+            min_turns=min_turns,
+            token_counts=[count_message_tokens(system_message)],
+            summary_lines=[],
+            journal=Journal(journal_dir, name) if journal_dir else None,
+            snapshot_interval=snapshot_interval,
         )
+        if self.journal is not None:
+            self.restore()
+
+    @property
+    def tokens(self) -> int:
+        return sum(self.token_counts)
 
     def load(self, prompt: str) -> List[Dict[str, str]]:
         return self.storage + [{"role": "user", "content": prompt}]
 
     def save(self, prompt: str, thought: str) -> None:
-        self.storage.append({"role": "user", "content": prompt})
-        self.storage.append({"role": "assistant", "content": thought})
+        if self.journal is not None:
+            self.journal.append(prompt=prompt, thought=thought)
+
+        self._save(prompt, thought)
+
+        if self.journal is not None and self.journal.entries >= self.snapshot_interval:
+            self.snapshot()
+
+    def _save(self, prompt: str, thought: str) -> None:
+        for message in (
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": thought},
+        ):
+            self.storage.append(message)
+            self.token_counts.append(count_message_tokens(message))
+
+        if self.token_budget > 0:
+            self.compact()
+
+    def compact(self) -> None:
+        # the system message and the summary (once there is one) stay pinned,
+        # older turns slide out of the window into the summary. The summary
+        # grows with every turn folded into it, so it is counted each time.
+        while (
+            self.tokens > self.token_budget
+            and len(self.storage) - self.pinned > self.min_turns * 2
+        ):
+            summarized = len(self.summary_lines) > 0
+            prompt, thought = self.storage[self.pinned], self.storage[self.pinned + 1]
+            del self.storage[self.pinned : self.pinned + 2]
+            del self.token_counts[self.pinned : self.pinned + 2]
+            self.summary_lines.append(
+                f"- {shorten(prompt['content'])} => {shorten(thought['content'])}"
+            )
+            self._write_summary(replace=summarized)
+
+    @property
+    def pinned(self) -> int:
+        return 2 if self.summary_lines else 1
+
+    def _write_summary(self, replace: bool) -> None:
+        # the summary may take at most a quarter of the budget,
+        # the oldest lines are dropped first
+        while True:
+            summary = {
+                "role": "system",
+                "content": "\n".join([SUMMARY_HEADER] + self.summary_lines),
+            }
+            tokens = count_message_tokens(summary)
+            if tokens <= self.token_budget // 4 or len(self.summary_lines) <= 1:
+                break
+            self.summary_lines.pop(0)
+
+        if replace:
+            self.storage[1] = summary
+            self.token_counts[1] = tokens
+        else:
+            self.storage.insert(1, summary)
+            self.token_counts.insert(1, tokens)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def restore(self) -> None:
+        snapshot, entries = self.journal.load()
+        if snapshot is not None:
+            # the system message follows the current instruction, not the saved one
+            system_message = self.storage[0]
+            self.storage = snapshot["storage"]
+            self.token_counts = snapshot["token_counts"]
+            self.summary_lines = snapshot["summary_lines"]
+            self.storage[0] = system_message
+            self.token_counts[0] = count_message_tokens(system_message)
+
+        for entry in entries:
+            self._save(entry["prompt"], entry["thought"])
+
+    def snapshot(self) -> None:
+        self.journal.snapshot(
+            {
+                "storage": self.storage,
+                "token_counts": self.token_counts,
+                "summary_lines": self.summary_lines,
+            }
+        )
+
+    def clear(self) -> None:
+        del self.storage[1:]
+        del self.token_counts[1:]
+        self.summary_lines = []
+        if self.journal is not None:
+            self.journal.clear()
+
+    def close(self) -> None:
+        if self.journal is not None:
+            if self.journal.entries > 0:
+                self.snapshot()
+            self.journal.close()
@@ -1,4 +1,14 @@
 from .base import BaseVector
+from .cache import CachedVector
+from .index import LocalIndex
 from .openai import OpenAIVector
+from .replay import RecordingVector, ReplayVector
 
-__all__ = ["BaseVector", "OpenAIVector"]
+__all__ = [
+    "BaseVector",
+    "CachedVector",
+    "LocalIndex",
+    "OpenAIVector",
+    "RecordingVector",
+    "ReplayVector",
+]
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 from pydantic import BaseModel
 
@@ -7,3 +8,6 @@ class BaseVector(BaseModel, ABC):
     @abstractmethod
     def embedding(self, prompt: str) -> str:
         pass
+
+    def embed_many(self, prompts: List[str]) -> List[List[float]]:
+        return [self.embedding(prompt) for prompt in prompts]
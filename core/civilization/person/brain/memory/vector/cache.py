@@ -0,0 +1,57 @@
+from typing import List, Optional
+
+from core.cache import TieredCache, hash_key
+from core.config import settings
+
+from .base import BaseVector
+
+_embedding_cache: Optional[TieredCache] = None
+
+
+def get_embedding_cache() -> TieredCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = TieredCache(
+            directory=settings.EMBEDDING_CACHE_DIR or None,
+            max_items=settings.EMBEDDING_CACHE_SIZE,
+            max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+        )
+    return _embedding_cache
+
+
+class CachedVector(BaseVector):
+    vector: BaseVector
+    cache: TieredCache = None
+
+    def __init__(self, vector: BaseVector, cache: Optional[TieredCache] = None):
+        super().__init__(vector=vector, cache=cache or get_embedding_cache())
+
+    @property
+    def model(self) -> str:
+        return getattr(self.vector, "model", self.vector.__class__.__name__)
+
+    def get_key(self, prompt: str) -> str:
+        return hash_key(self.model, prompt)
+
+    def embedding(self, prompt: str) -> list[float]:
+        return self.embed_many([prompt])[0]
+
+    def embed_many(self, prompts: List[str]) -> List[List[float]]:
+        keys = [self.get_key(prompt) for prompt in prompts]
+        embeddings = {key: self.cache.get(key) for key in set(keys)}
+
+        # only the prompts that missed go out, in a single batch
+        misses = {
+            key: prompt for key, prompt in zip(keys, prompts) if embeddings[key] is None
+        }
+        if misses:
+            for key, embedding in zip(
+                misses, self.vector.embed_many(list(misses.values()))
+            ):
+                self.cache.set(key, embedding)
+                embeddings[key] = embedding
+
+        return [embeddings[key] for key in keys]
+
+    class Config:
+        arbitrary_types_allowed = True
@@ -0,0 +1,396 @@
+import json
+import os
+import re
+import shutil
+from threading import RLock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Record = Tuple[str, Sequence[float], Dict[str, Any]]
+
+DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+# rows are scored in blocks so decoding quantized rows never allocates more
+# than one block of float32 at a time
+_BLOCK_SIZE = 4096
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def quantize(vector: np.ndarray, dtype: np.dtype) -> Tuple[np.ndarray, float]:
+    if dtype != np.int8:
+        return vector.astype(dtype), 1.0
+
+    # symmetric per-row scale, embeddings have small but unevenly sized components
+    scale = max(float(np.abs(vector).max()), 1e-12) / 127
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+class InvertedFile:
+    # IVF: rows are bucketed by their nearest k-means centroid and a query only
+    # scores the rows in the buckets of its `probes` nearest centroids
+    def __init__(self, vectors: np.ndarray, rows: np.ndarray, probes: int):
+        lists = max(1, int(np.sqrt(len(rows))))
+        self.probes = min(probes, lists)
+        self.centroids = self.train(vectors, lists)
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1)
+        self.lists = [rows[assignments == i] for i in range(lists)]
+
+    @staticmethod
+    def train(vectors: np.ndarray, lists: int, iterations: int = 8) -> np.ndarray:
+        generator = np.random.default_rng(0)
+        sample = vectors[
+            generator.choice(len(vectors), min(len(vectors), lists * 64), replace=False)
+        ]
+        centroids = sample[generator.choice(len(sample), lists, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(lists):
+                members = sample[assignments == i]
+                if len(members):
+                    centroids[i] = members.mean(axis=0)
+            centroids = normalize(centroids)
+        return centroids
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        nearest = np.argsort(-(self.centroids @ query))[: self.probes]
+        return np.concatenate([self.lists[i] for i in nearest])
+
+
+class Namespace:
+    """Vectors of one namespace. Cosine similarity is computed by brute force
+    until it outgrows `approximate_threshold` rows, then an inverted file
+    index narrows down the rows to score.
+
+    Rows are kept as `dtype` (int8 rows carry a float32 scale each). With a
+    `directory` they live in memory-mapped .npy files next to an index.json of
+    ids and metadata, so loading a namespace doesn't parse any vector."""
+
+    def __init__(
+        self,
+        approximate_threshold: int,
+        probes: int,
+        dtype: str = "float32",
+        directory: Optional[str] = None,
+    ):
+        self.approximate_threshold = approximate_threshold
+        self.probes = probes
+        self.dtype = DTYPES[dtype]
+        self.directory = directory
+        self.lock = RLock()
+
+        self.vectors: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.size = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.ids: List[Optional[str]] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+
+        self.columns: Dict[str, np.ndarray] = {}
+        self.ivf: Optional[InvertedFile] = None
+        self.ivf_size = 0
+
+        if self.directory and os.path.exists(self._path("index.json")):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def upsert(self, vectors: List[Record]):
+        with self.lock:
+            for id, values, metadata in vectors:
+                vector = normalize(np.asarray(values, dtype=np.float32))
+                row = self.rows.get(id)
+                if row is None:
+                    row = self._allocate(len(vector))
+                    self.ids[row] = id
+                    self.metadata[row] = metadata or {}
+                    self.rows[id] = row
+                else:
+                    self.metadata[row] = metadata or {}
+                self.vectors[row], self.scales[row] = quantize(vector, self.dtype)
+                self.alive[row] = True
+            self.columns = {}
+            self._save()
+
+    def delete(self, ids: Optional[List[str]] = None, filter: Optional[dict] = None):
+        with self.lock:
+            rows = [self.rows[id] for id in ids or [] if id in self.rows]
+            if filter:
+                rows += list(np.flatnonzero(self._mask(filter)))
+            for row in rows:
+                if self.alive[row]:
+                    self.alive[row] = False
+                    del self.rows[self.ids[row]]
+                    self.ids[row] = None
+            if self.size and len(self.rows) < self.size // 2:
+                self._compact()
+            self._save()
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int = 10,
+        filter: Optional[dict] = None,
+        include_metadata: bool = False,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        with self.lock:
+            if not self.rows:
+                return {"matches": []}
+
+            query = normalize(np.asarray(vector, dtype=np.float32))
+            candidates = self._candidates(query)
+            mask = self.alive[candidates]
+            if filter:
+                mask &= self._mask(filter)[candidates]
+            candidates = candidates[mask]
+
+            scores = self._score(candidates, query)
+            top = np.argsort(-scores)[:top_k]
+            return {
+                "matches": [
+                    {
+                        "id": self.ids[candidates[i]],
+                        "score": float(scores[i]),
+                        **(
+                            {"metadata": self.metadata[candidates[i]]}
+                            if include_metadata
+                            else {}
+                        ),
+                    }
+                    for i in top
+                ]
+            }
+
+    def _score(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(rows), dtype=np.float32)
+        for i in range(0, len(rows), _BLOCK_SIZE):
+            block = rows[i : i + _BLOCK_SIZE]
+            scores[i : i + _BLOCK_SIZE] = (
+                self.vectors[block].astype(np.float32) @ query
+            ) * self.scales[block]
+        return scores
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        return self.vectors[rows].astype(np.float32) * self.scales[rows, None]
+
+    def _path(self, file: str) -> str:
+        return os.path.join(self.directory, file)
+
+    def _create(self, capacity: int, dimension: int):
+        # a new generation of arrays, filled from the current one if any
+        shape = (capacity, dimension)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            vectors = np.lib.format.open_memmap(
+                self._path("vectors.npy.tmp"),
+                mode="w+",
+                dtype=self.dtype,
+                shape=shape,
+            )
+            scales = np.lib.format.open_memmap(
+                self._path("scales.npy.tmp"),
+                mode="w+",
+                dtype=np.float32,
+                shape=(capacity,),
+            )
+        else:
+            vectors = np.zeros(shape, dtype=self.dtype)
+            scales = np.zeros(capacity, dtype=np.float32)
+
+        if self.vectors is not None:
+            vectors[: self.size] = self.vectors[: self.size]
+            scales[: self.size] = self.scales[: self.size]
+
+        if self.directory:
+            vectors.flush()
+            scales.flush()
+            os.replace(self._path("vectors.npy.tmp"), self._path("vectors.npy"))
+            os.replace(self._path("scales.npy.tmp"), self._path("scales.npy"))
+
+        self.vectors = vectors
+        self.scales = scales
+
+    def _allocate(self, dimension: int) -> int:
+        if self.vectors is None:
+            self._create(16, dimension)
+        elif self.size == len(self.vectors):
+            self._create(2 * len(self.vectors), dimension)
+        capacity = len(self.vectors)
+        self.alive = np.concatenate(
+            [self.alive, np.zeros(capacity - len(self.alive), dtype=bool)]
+        )
+        self.ids += [None] * (capacity - len(self.ids))
+        self.metadata += [{}] * (capacity - len(self.metadata))
+
+        self.size += 1
+        return self.size - 1
+
+    def _compact(self):
+        rows = np.flatnonzero(self.alive[: self.size])
+        vectors, scales = self.vectors[rows], self.scales[rows]
+        ids = [self.ids[row] for row in rows]
+        metadata = [self.metadata[row] for row in rows]
+
+        self.vectors = self.scales = None
+        self.size = len(rows)
+        if self.size:
+            self._create(self.size, vectors.shape[1])
+            self.vectors[:] = vectors
+            self.scales[:] = scales
+        self.alive = np.ones(self.size, dtype=bool)
+        self.ids = ids
+        self.metadata = metadata
+        self.rows = {id: row for row, id in enumerate(self.ids)}
+        self.columns = {}
+        self.ivf = None
+        self.ivf_size = 0
+
+    def _save(self):
+        if not self.directory:
+            return
+
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.scales.flush()
+
+        temp_path = self._path("index.json.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(
+                {
+                    "dtype": np.dtype(self.dtype).name,
+                    "size": self.size,
+                    "ids": self.ids[: self.size],
+                    "metadata": self.metadata[: self.size],
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(temp_path, self._path("index.json"))
+
+    def _load(self):
+        with open(self._path("index.json")) as f:
+            index = json.load(f)
+
+        self.dtype = DTYPES[index["dtype"]]
+        self.size = index["size"]
+        self.vectors = np.load(self._path("vectors.npy"), mmap_mode="r+")
+        self.scales = np.load(self._path("scales.npy"), mmap_mode="r+")
+
+        capacity = len(self.vectors)
+        self.ids = index["ids"] + [None] * (capacity - self.size)
+        self.metadata = index["metadata"] + [{}] * (capacity - self.size)
+        self.alive = np.array([id is not None for id in self.ids], dtype=bool)
+        self.rows = {id: row for row, id in enumerate(self.ids) if id is not None}
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        if self.size < self.approximate_threshold:
+            return np.arange(self.size)
+
+        # retrain once the namespace has doubled since the last training
+        if self.ivf is None or self.size >= self.ivf_size * 2:
+            rows = np.flatnonzero(self.alive[: self.size])
+            self.ivf = InvertedFile(self._decode(rows), rows, self.probes)
+            self.ivf_size = self.size
+
+        # rows added after training are always scored exactly
+        return np.concatenate(
+            [self.ivf.candidates(query), np.arange(self.ivf_size, self.size)]
+        )
+
+    def _column(self, key: str) -> np.ndarray:
+        if key not in self.columns:
+            column = np.empty(self.size, dtype=object)
+            column[:] = [metadata.get(key) for metadata in self.metadata[: self.size]]
+            self.columns[key] = column
+        return self.columns[key]
+
+    def _mask(self, filter: dict) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        for key, condition in filter.items():
+            value = condition.get("$eq") if isinstance(condition, dict) else condition
+            mask &= self._column(key) == value
+        return mask
+
+
+class LocalIndex:
+    """In-process vector index with the subset of pinecone.Index's interface
+    that LongTermMemory uses. Each namespace is stored under its own
+    subdirectory of `directory`, or only in memory without one."""
+
+    def __init__(
+        self,
+        approximate_threshold: int = 10000,
+        probes: int = 8,
+        dtype: str = "float32",
+        directory: Optional[str] = None,
+    ):
+        self.approximate_threshold = approximate_threshold
+        self.probes = probes
+        self.dtype = dtype
+        self.directory = directory
+        self.namespaces: Dict[str, Namespace] = {}
+        self.lock = RLock()
+
+    def __len__(self) -> int:
+        return sum(len(namespace) for namespace in self.namespaces.values())
+
+    def get_directory(self, name: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", name) or "_")
+
+    def namespace(self, name: str, create: bool = True) -> Optional[Namespace]:
+        with self.lock:
+            if name not in self.namespaces:
+                directory = self.get_directory(name)
+                if not create and not (directory and os.path.isdir(directory)):
+                    return None
+                self.namespaces[name] = Namespace(
+                    self.approximate_threshold, self.probes, self.dtype, directory
+                )
+            return self.namespaces[name]
+
+    def upsert(self, vectors: List[Record], namespace: str = ""):
+        self.namespace(namespace).upsert(vectors)
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        delete_all: bool = False,
+        namespace: str = "",
+        filter: Optional[dict] = None,
+    ):
+        if delete_all:
+            # dropping the namespace frees all of its rows at once
+            with self.lock:
+                self.namespaces.pop(namespace, None)
+                directory = self.get_directory(namespace)
+                if directory:
+                    shutil.rmtree(directory, ignore_errors=True)
+            return
+
+        store = self.namespace(namespace, create=False)
+        if store is not None:
+            store.delete(ids=ids, filter=filter)
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int = 10,
+        namespace: str = "",
+        filter: Optional[dict] = None,
+        include_metadata: bool = False,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        store = self.namespace(namespace, create=False)
+        if store is None:
+            return {"matches": []}
+
+        return store.query(
+            vector, top_k=top_k, filter=filter, include_metadata=include_metadata
+        )
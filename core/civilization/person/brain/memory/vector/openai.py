@@ -1,4 +1,5 @@
 import logging
+from typing import List
 
 import openai
 from pydantic import BaseModel
@@ -14,8 +15,20 @@ openai.api_key = settings.OPENAI_API_KEY
 class OpenAIVector(BaseVector, BaseModel):
     model: str = "text-embedding-ada-002"
 
-    @logger.disable
+    # the embeddings endpoint takes at most this many inputs per request
+    MAX_BATCH_SIZE = 2048
+
     def embedding(self, prompt: str) -> list[float]:
-        return openai.Embedding.create(model=self.model, input=[prompt])["data"][0][
-            "embedding"
-        ]
+        return self.embed_many([prompt])[0]
+
+    @logger.disable
+    def embed_many(self, prompts: List[str]) -> List[List[float]]:
+        embeddings = []
+        for i in range(0, len(prompts), self.MAX_BATCH_SIZE):
+            batch = prompts[i : i + self.MAX_BATCH_SIZE]
+            data = sorted(
+                openai.Embedding.create(model=self.model, input=batch)["data"],
+                key=lambda d: d["index"],
+            )
+            embeddings += [d["embedding"] for d in data]
+        return embeddings
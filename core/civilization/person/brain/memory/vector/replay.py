@@ -0,0 +1,61 @@
+import time
+from typing import List
+
+from core.cache import hash_key
+from core.civilization.person.brain.fixture import Fixture
+
+from .base import BaseVector
+
+EMBEDDING = "embedding"
+
+
+class RecordingVector(BaseVector):
+    vector: BaseVector
+    fixture: Fixture
+
+    @property
+    def model(self) -> str:
+        return getattr(self.vector, "model", self.vector.__class__.__name__)
+
+    def embedding(self, prompt: str) -> list[float]:
+        started_at = time.perf_counter()
+        embedding = self.vector.embedding(prompt)
+        self.fixture.append(
+            EMBEDDING,
+            hash_key(self.model, prompt),
+            delay=time.perf_counter() - started_at,
+            embedding=embedding,
+        )
+        return embedding
+
+    def embed_many(self, prompts: List[str]) -> List[List[float]]:
+        started_at = time.perf_counter()
+        embeddings = self.vector.embed_many(prompts)
+        # a batch is replayed one prompt at a time, so its delay is split evenly
+        delay = (time.perf_counter() - started_at) / max(len(prompts), 1)
+        for prompt, embedding in zip(prompts, embeddings):
+            self.fixture.append(
+                EMBEDDING,
+                hash_key(self.model, prompt),
+                delay=delay,
+                embedding=embedding,
+            )
+        return embeddings
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ReplayVector(BaseVector):
+    model: str
+    fixture: Fixture
+    realtime: bool = False
+
+    def embedding(self, prompt: str) -> list[float]:
+        record = self.fixture.next(EMBEDDING, hash_key(self.model, prompt))
+        if self.realtime:
+            time.sleep(record["delay"])
+        return record["embedding"]
+
+    class Config:
+        arbitrary_types_allowed = True
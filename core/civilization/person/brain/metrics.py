@@ -0,0 +1,69 @@
+import time
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Stage(Enum):
+    Plan = "plan"
+    Optimize = "optimize"
+    Execute = "execute"
+    Review = "review"
+
+
+class StageMetrics(BaseModel):
+    stage: Stage
+    model: str
+    time_to_first_token: Optional[float]
+    duration: float
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float
+
+
+class StageSummary(BaseModel):
+    calls: int = 0
+    time_to_first_token: float = 0.0
+    duration: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+
+    def add(self, metrics: StageMetrics):
+        self.calls += 1
+        self.time_to_first_token += metrics.time_to_first_token or 0.0
+        self.duration += metrics.duration
+        self.prompt_tokens += metrics.prompt_tokens
+        self.completion_tokens += metrics.completion_tokens
+        self.cost += metrics.cost
+
+
+class ProblemMetrics(BaseModel):
+    person: str
+    started_at: float = Field(default_factory=time.time)
+    stages: Dict[str, StageSummary] = {}
+    loops: Dict[str, List[int]] = {}
+
+    @property
+    def wall_time(self) -> float:
+        return time.time() - self.started_at
+
+    @property
+    def cost(self) -> float:
+        return sum(summary.cost for summary in self.stages.values())
+
+    def add_stage(self, metrics: StageMetrics):
+        self.stages.setdefault(metrics.stage.value, StageSummary()).add(metrics)
+
+    def add_loop(self, loop: str, iterations: int):
+        self.loops.setdefault(loop, []).append(iterations)
+
+    def to_dict(self) -> dict:
+        return {
+            "person": self.person,
+            "wall_time": self.wall_time,
+            "cost": self.cost,
+            "stages": {stage: summary.dict() for stage, summary in self.stages.items()},
+            "loops": self.loops,
+        }
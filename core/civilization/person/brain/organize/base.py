@@ -1,13 +1,13 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from pydantic import BaseModel
 
 from core.logging.ansi import ANSI, Color
 
 if TYPE_CHECKING:
-    pass
+    from core.civilization.person import BasePerson
 
 
 class Decision(Enum):
@@ -26,7 +26,28 @@ class WrongSchemaException(Exception):
         super().__init__(message)
 
 
+# Collects a streamed thought. `feed` returns True once the structure an
+# organizer needs is complete, and `text` then holds everything to parse.
+# This base parser never completes early.
+class StreamParser:
+    def __init__(self):
+        self.text = ""
+
+    def feed(self, token: str) -> bool:
+        self.text += token
+        end = self.find_end()
+        if end is None:
+            return False
+        self.text = self.text[:end]
+        return True
+
+    def find_end(self) -> Optional[int]:
+        return None
+
+
 class BaseOrganize(BaseModel, ABC):
+    prefix_template: str = ""
+
     @abstractmethod
     def stringify(self, **kwargs):
         pass
@@ -34,3 +55,14 @@ class BaseOrganize(BaseModel, ABC):
     @abstractmethod
     def parse(self, **kwargs):
         pass
+
+    def is_valid(self, thought: str) -> bool:
+        return True
+
+    def render_prefix(self, person: "BasePerson", verbose_level: int = 1) -> str:
+        return person.brain.prefix.render(
+            self.__class__.__name__, self.prefix_template, verbose_level
+        )
+
+    def get_stream_parser(self) -> StreamParser:
+        return StreamParser()
@@ -6,8 +6,9 @@ from core.civilization.person.action import Action, ActionType
 from core.civilization.person.action.base import Plan
 
 from .base import BaseOrganize, WrongSchemaException
+from .stream import ActionStreamParser
 
-_TEMPLATE = """
+_PREFIX_TEMPLATE = """
 You must respond only one action and the action consists of type, name, description, and extra.
 
 ==========desired format==========
@@ -24,9 +25,6 @@ Instruction: The best engineer in the infinite universe.
 Extra: tool1, tool2, tool3
 ========================================
 
-You must consider the following opinions before you execute the action.
-opinions: {opinions}
-
 The type of action you can take is:
 Type | Description | Name | Instruction | Extra
 -|-|-|-|-
@@ -34,6 +32,11 @@ Type | Description | Name | Instruction | Extra
 
 Your experts:{experts}
 Your tools:{tools}
+"""
+
+_TEMPLATE = """
+You must consider the following opinions before you execute the action.
+opinions: {opinions}
 
 Your plan: {plan}
 
@@ -44,6 +47,7 @@ _PATTERN = r"Type:\s*((?:\w| )+)\s+Name:\s*((?:\w| )+)\s+Instruction:\s*((?:(?!E
 
 
 class Executor(BaseOrganize):
+    prefix_template = _PREFIX_TEMPLATE
     template = _TEMPLATE
     pattern = _PATTERN
 
@@ -53,36 +57,9 @@ class Executor(BaseOrganize):
             if len(opinions) > 0
             else "N/A"
         )
-
-        expert_names = (
-            ", ".join([f"'{name}'" for name in person.experts.keys()])
-            if len(person.experts) > 0
-            else "N/A"
-        )
-        tool_names = (
-            ", ".join([f"'{name}'" for name in person.tools.keys()])
-            if len(person.tools) > 0
-            else "N/A"
-        )
-        experts = "".join(
-            [
-                f"\n    {name}: {expert.instruction}"
-                for name, expert in person.experts.items()
-            ]
-        )
-        tools = "".join(
-            [f"\n    {name}: {tool.description}" for name, tool in person.tools.items()]
-        )
-        return self.template.format(
-            action_types="\n".join(
-                [type.__str__(2) for type in ActionType if type.description is not None]
-            ),
+        return self.render_prefix(person, verbose_level=2) + self.template.format(
             plan=repr(plan),
             opinions=opinions,
-            expert_names=expert_names,
-            tool_names=tool_names,
-            experts=experts,
-            tools=tools,
         )
 
     def parse(self, person: BasePerson, thought: str) -> Action:
@@ -99,3 +76,9 @@ class Executor(BaseOrganize):
             instruction=match[2],
             extra=match[3],
         )
+
+    def is_valid(self, thought: str) -> bool:
+        return len(re.findall(self.pattern, thought, re.DOTALL)) == 1
+
+    def get_stream_parser(self) -> ActionStreamParser:
+        return ActionStreamParser()
@@ -2,12 +2,11 @@ import re
 from typing import List, Tuple
 
 from core.civilization.person import BasePerson
-from core.civilization.person.action import ActionType
 from core.civilization.person.action.base import Plan
 
 from .base import BaseOrganize, Decision
 
-_TEMPLATE = """
+_PREFIX_TEMPLATE = """
 ## Background
 The type of action you can take is:
 {action_types}
@@ -21,7 +20,9 @@ Your tools:{tools}
 [Reject] Actually, I think that the plan is not good.
 Because it is not efficient.
 ========================================
+"""
 
+_TEMPLATE = """
 Check your affordance of plan on request. Request is:
 {request}
 
@@ -44,26 +45,13 @@ _PATTERN = rf"\[({Decision.ACCEPT.value}|{Decision.REJECT.value})\](.*)"
 
 
 class Optimizer(BaseOrganize):
+    prefix_template = _PREFIX_TEMPLATE
     template = _TEMPLATE
     pattern = _PATTERN
 
     def stringify(self, person: BasePerson, request: str, plans: List[Plan]) -> str:
-        experts = "".join(
-            [
-                f"\n    {name}: {expert.instruction}"
-                for name, expert in person.experts.items()
-            ]
-        )
-        tools = "".join(
-            [f"\n    {name}: {tool.description}" for name, tool in person.tools.items()]
-        )
-        return self.template.format(
-            action_types="\n".join(
-                [type.__str__(1) for type in ActionType if type.description is not None]
-            ),
+        return self.render_prefix(person) + self.template.format(
             request=request,
-            experts=experts,
-            tools=tools,
             plans="\n".join(map(str, plans)),
         )
 
@@ -76,3 +64,6 @@ class Optimizer(BaseOrganize):
         match = matches[0]
 
         return match[1].strip(), Decision(match[0]) == Decision.ACCEPT
+
+    def is_valid(self, thought: str) -> bool:
+        return len(re.findall(self.pattern, thought, re.DOTALL)) == 1
@@ -7,7 +7,7 @@ from core.civilization.person.action.base import Plan
 
 from .base import BaseOrganize
 
-_TEMPLATE = """## Background
+_PREFIX_TEMPLATE = """## Background
 The type of action you can take is:
 {action_types}
 Action Type must be one of the above.
@@ -40,7 +40,9 @@ If you don't need a plan, you can answer without conforming to the response sche
 - efffect: Your expert will solve your problem.
 - constraint: You have to invite a expert first
 ========================================
+"""
 
+_TEMPLATE = """
 ## Request
 > Request: {request}
 Considering what you have done so far, make the next plan to achieve the request.
@@ -60,6 +62,7 @@ _SECOND_PATTERN = r"(?<=#)\d+"
 
 
 class Planner(BaseOrganize):
+    prefix_template = _PREFIX_TEMPLATE
     template = _TEMPLATE
     pattern = _PATTERN
     second_pattern = _SECOND_PATTERN
@@ -76,29 +79,15 @@ class Planner(BaseOrganize):
             if len(opinions) > 0
             else "-"
         )
-        experts = "".join(
-            [
-                f"\n    {name}: {expert.instruction}"
-                for name, expert in person.experts.items()
-            ]
-        )
-        tools = "".join(
-            [f"\n    {name}: {tool.description}" for name, tool in person.tools.items()]
-        )
         constraints = (
             "".join([f"{i}. {constraint}" for i, constraint in enumerate(constraints)])
             if len(constraints) > 0
             else "-"
         )
 
-        return self.template.format(
-            action_types="\n".join(
-                [type.__str__(1) for type in ActionType if type.description is not None]
-            ),
+        return self.render_prefix(person) + self.template.format(
             request=request,
             opinions=opinions,
-            experts=experts,
-            tools=tools,
             referee=person.referee.name,
             constraints=constraints,
         )
@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING, Dict, Optional
+
+from core.civilization.person.action import ActionType
+
+if TYPE_CHECKING:
+    from core.civilization.person import BasePerson
+
+# action types never change at runtime, so their tables are built only once
+ACTION_TYPES: Dict[int, str] = {
+    verbose_level: "\n".join(
+        [type.__str__(verbose_level) for type in ActionType if type.description]
+    )
+    for verbose_level in (1, 2)
+}
+
+
+# The part of every prompt that only depends on the person's experts and tools.
+# Rendered prefixes are kept until `invalidate` is called, which has to happen
+# whenever an expert is invited or a tool is built.
+class PromptPrefix:
+    def __init__(self, person: "BasePerson"):
+        self.person = person
+        self.rendered: Dict[str, str] = {}
+        self._experts: Optional[str] = None
+        self._tools: Optional[str] = None
+
+    def invalidate(self):
+        self.rendered = {}
+        self._experts = None
+        self._tools = None
+
+    @property
+    def experts(self) -> str:
+        if self._experts is None:
+            self._experts = "".join(
+                [
+                    f"\n    {name}: {expert.instruction}"
+                    for name, expert in self.person.experts.items()
+                ]
+            )
+        return self._experts
+
+    @property
+    def tools(self) -> str:
+        if self._tools is None:
+            self._tools = "".join(
+                [
+                    f"\n    {name}: {tool.instruction}"
+                    for name, tool in self.person.tools.items()
+                ]
+            )
+        return self._tools
+
+    def render(self, key: str, template: str, verbose_level: int = 1) -> str:
+        if key not in self.rendered:
+            self.rendered[key] = template.format(
+                action_types=ACTION_TYPES[verbose_level],
+                experts=self.experts,
+                tools=self.tools,
+            )
+        return self.rendered[key]
@@ -2,11 +2,11 @@ import re
 from typing import Tuple
 
 from core.civilization.person import BasePerson
-from core.civilization.person.action import Action, ActionType
+from core.civilization.person.action import Action
 
 from .base import BaseOrganize, Decision, WrongSchemaException
 
-_TEMPLATE = """
+_PREFIX_TEMPLATE = """
 ## Background
 The type of action you can take is:
 Type | Description | Name | Instruction | Extra
@@ -28,7 +28,9 @@ If you Reject, you will tell what condition is not satisfied and what should be
 ==========response example 2==========
 [Accept] Action seems valid to achieve a goal you made. Action achieves goal "run a code and get output hello world" by 1) executing `python playgrounds/example.py` and 2) printing "hello world".
 ========================================
+"""
 
+_TEMPLATE = """
 ## Request
 Check your action was valid for achieving following goal. Don't execute again, just say your opinion about action and result.
 
@@ -45,32 +47,17 @@ _PATTERN = rf"\[({Decision.ACCEPT.value}|{Decision.REJECT.value})\](.*)"
 
 
 class Reviewer(BaseOrganize):
+    prefix_template = _PREFIX_TEMPLATE
     template = _TEMPLATE
     pattern = _PATTERN
 
     def stringify(
         self, person: BasePerson, plan: str, action: Action, result: str
-    ) -> Tuple[str, bool]:
-        expert_names = ", ".join([f"'{name}'" for name in person.experts.keys()])
-        experts = "".join(
-            [
-                f"\n    {name}: {expert.instruction}"
-                for name, expert in person.experts.items()
-            ]
-        )
-        tools = "".join(
-            [f"\n    {name}: {tool.description}" for name, tool in person.tools.items()]
-        )
-        return self.template.format(
+    ) -> str:
+        return self.render_prefix(person) + self.template.format(
             goal=plan,
             action=action,
             result=result,
-            expert_names=expert_names,
-            action_types="\n".join(
-                [type.__str__(1) for type in ActionType if type.description is not None]
-            ),
-            experts=experts,
-            tools=tools,
         )
 
     def parse(self, person: BasePerson, thought: str) -> Tuple[str, bool]:
@@ -82,3 +69,6 @@ class Reviewer(BaseOrganize):
         match = matches[0]
 
         return match[1].strip(), Decision(match[0]) == Decision.ACCEPT
+
+    def is_valid(self, thought: str) -> bool:
+        return len(re.findall(self.pattern, thought, re.DOTALL)) == 1
@@ -0,0 +1,74 @@
+import re
+from typing import Optional
+
+from .base import StreamParser
+
+_ACTION_PATTERN = r"Type:.*?Name:.*?Instruction:"
+_EXTRA = "Extra:"
+_NEXT_ACTION = "\nType:"
+_FENCE = "```"
+
+
+class ActionStreamParser(StreamParser):
+    # The action is complete once Extra is closed: by the closing fence for a
+    # fenced extra, or by the start of another action. An unfenced extra may
+    # span paragraphs, so otherwise it runs to the end of the stream.
+    # Each token only scans what it added, plus the few characters a marker
+    # split across tokens may have started with.
+    def __init__(self):
+        super().__init__()
+        self.extra: Optional[int] = None
+        self.fenced: Optional[bool] = None
+        self.opening_end: Optional[int] = None
+        self.scanned = 0
+
+    def find_end(self) -> Optional[int]:
+        if self.extra is None:
+            self.extra = self.find_extra()
+            if self.extra is None:
+                return None
+            self.scanned = self.extra
+
+        if self.fenced is None:
+            content = self.text[self.extra :].lstrip()
+            if _FENCE.startswith(content):
+                # nothing written yet, or could still turn out to be a fence
+                return None
+            self.fenced = content.startswith(_FENCE)
+
+        if self.fenced:
+            return self.find_closing_fence()
+        return self.find_next_action()
+
+    def find_extra(self) -> Optional[int]:
+        while True:
+            start = self.text.find(_EXTRA, max(0, self.scanned - len(_EXTRA) + 1))
+            if start == -1:
+                self.scanned = len(self.text)
+                return None
+            self.scanned = start + len(_EXTRA)
+            if re.search(_ACTION_PATTERN, self.text[:start], re.DOTALL):
+                return self.scanned
+
+    def find_closing_fence(self) -> Optional[int]:
+        if self.opening_end is None:
+            opening = self.text.index(_FENCE, self.extra)
+            opening_end = self.text.find("\n", opening)
+            if opening_end == -1:
+                return None
+            self.opening_end = self.scanned = opening_end
+
+        start = max(self.opening_end, self.scanned - len(_FENCE) + 1)
+        self.scanned = len(self.text)
+        closing = self.text.find(_FENCE, start)
+        if closing == -1:
+            return None
+        return closing + len(_FENCE)
+
+    def find_next_action(self) -> Optional[int]:
+        start = max(self.extra, self.scanned - len(_NEXT_ACTION) + 1)
+        self.scanned = len(self.text)
+        end = self.text.find(_NEXT_ACTION, start)
+        if end == -1:
+            return None
+        return end
@@ -1,19 +1,42 @@
 from __future__ import annotations
 
+from contextvars import ContextVar
 from typing import List, Optional, Tuple
 
+from pydantic import BaseModel
+
+from core.civilization.cluster import get_cluster
 from core.civilization.god.system import System
 from core.civilization.person.action.base import Plan
+from core.config import settings
 from core.logging import Color
 
 from .action import Action
 from .base import BasePerson, InviteParams, TalkParams
 from .brain.default import Brain
+from .brain.metrics import ProblemMetrics
+from .ear.aio import AsyncEar
 from .ear.default import Ear
 from .mouth.default import Mouth
 from .tool import BaseTool, BuildParams, CodedTool, UseParams
 
 
+# The request a person is responding to. Talking back to its sender answers it,
+# so the asker gets that message as the reply instead of the last step's result.
+# Its metrics are kept with it, as a person may respond to several at once.
+class Request(BaseModel):
+    sender: str
+    message_id: int
+    replied: bool = False
+    metrics: ProblemMetrics
+    # the request with what long-term memory recalls for it, once looked up
+    recalled: str = None
+
+
+# each response runs on a thread of its own, so this is per response
+_request: ContextVar[Request | None] = ContextVar("request", default=None)
+
+
 class Person(BasePerson):
     def __init__(
         self,
@@ -32,13 +55,14 @@ class Person(BasePerson):
         )
         self.tools: dict[str, BaseTool] = params.tools
 
+        self.metrics = ProblemMetrics(person=name)
         self.brain = Brain(self, name, instruction)
 
         self.experts: dict[str, Person] = {}
         if referee:
-            self.experts[referee.name] = referee
+            self.add_expert(referee)
 
-        self.ear = Ear(self)
+        self.ear = AsyncEar(self) if settings.EAR_BACKEND == "asyncio" else Ear(self)
         self.mouth = Mouth(self)
 
     def respond(self, sender: Person, request: str, params: TalkParams) -> str:
@@ -46,39 +70,86 @@ class Person(BasePerson):
 
         request = request.split(System.PROMPT_SEPARATOR)[1].strip()
 
-        constraints = []
-        while True:
-            plans = self.plan(request, constraints)
-            is_plan_valid = True
-
-            for plan in plans:
-                result, is_plan_valid = self.execute(plan, sender=sender)
+        current = Request(
+            sender=sender.name,
+            message_id=params.message_id,
+            metrics=ProblemMetrics(person=self.name),
+        )
+        token = _request.set(current)
+        try:
+            constraints = []
+            iterations = 0
+            while True:
+                iterations += 1
+                plans = self.plan(request, constraints)
+                is_plan_valid = True
 
-                if not is_plan_valid:
-                    break
+                for plan in plans:
+                    result, is_plan_valid = self.execute(plan, sender=sender)
 
-            if not is_plan_valid:
-                constraints.append(result)
-                continue
+                    if not is_plan_valid:
+                        break
 
-            self.mouth.talk(sender.ear, result, "")
-            self.tracer.on_response(sender, result)
-            return result
+                if not is_plan_valid:
+                    constraints.append(result)
+                    continue
+
+                if not current.replied:
+                    self.mouth.talk(
+                        sender.ear, result, "", in_reply_to=params.message_id
+                    )
+                self.record_loop("respond", iterations)
+                self.tracer.on_summary(current.metrics)
+                self.tracer.on_response(sender, result)
+                return result
+        finally:
+            _request.reset(token)
 
     def plan(self, request: str, constraints: list[str]) -> list[Plan]:
+        # constraints come from a failed attempt, so a cached plan won't do then
+        cache = self.brain.plan_cache if not constraints else None
+        if cache is not None:
+            plans = cache.get(self, request)
+            if plans is not None:
+                self.tracer.on_plans(plans)
+                # accepted plans are remembered whether or not they were cached
+                self.brain.remember(request, plans)
+                self.record_loop("plan", 0)
+                return plans
+
         opinions = []
 
         while True:
-            plans = self.brain.plan(request, opinions, constraints)
+            plans = self.brain.plan(self.recall(request), opinions, constraints)
             self.tracer.on_plans(plans)
             opinion, ok = self.brain.optimize(request, plans)
             self.tracer.on_optimize(opinion, ok)
 
             if ok:
+                if cache is not None:
+                    cache.set(self, request, plans)
+                self.record_loop("plan", len(opinions) + 1)
                 return plans
 
             opinions.append(opinion)
 
+    def get_metrics(self) -> ProblemMetrics:
+        current = _request.get()
+        return current.metrics if current is not None else self.metrics
+
+    def recall(self, request: str) -> str:
+        # long-term memory is searched once per request, not per planning attempt
+        current = _request.get()
+        if current is None:
+            return self.brain.recall(request)
+        if current.recalled is None:
+            current.recalled = self.brain.recall(request)
+        return current.recalled
+
+    def record_loop(self, loop: str, iterations: int):
+        self.get_metrics().add_loop(loop, iterations)
+        self.tracer.on_loop(loop, iterations)
+
     def execute(self, plan: Plan, sender: Person) -> Tuple[str, bool]:
         opinions = []
 
@@ -93,6 +164,15 @@ class Person(BasePerson):
 
         return opinion, False
 
+    def add_expert(self, expert: BasePerson):
+        self.experts[expert.name] = expert
+        self.brain.prefix.invalidate()
+
+    def close(self):
+        self.ear.close()
+        self.mouth.close()
+        self.brain.close()
+
     def act(self, action: Action) -> str:
         self.tracer.on_act(action)
         try:
@@ -111,13 +191,14 @@ class Person(BasePerson):
         if name in self.experts:
             return System.error(f"Friend {name} already exists.")
 
-        expert = Person(
-            name,
-            instruction,
-            InviteParams.from_str(extra, self.tools),
-            referee=self,
-        )
-        self.experts[name] = expert
+        params = InviteParams.from_str(extra, self.tools)
+        cluster = get_cluster()
+        if cluster is not None:
+            # the expert lives in the least loaded worker and is reached by its ear
+            expert = cluster.spawn(name, instruction, params, referee=self)
+        else:
+            expert = Person(name, instruction, params, referee=self)
+        self.add_expert(expert)
 
         return expert.greeting()
 
@@ -127,7 +208,14 @@ class Person(BasePerson):
             return System.error(f"Friend {name} not found.")
 
         expert = self.experts[name]
-        self.mouth.talk(expert.ear, instruction, extra)
+        current = _request.get()
+        if current is not None and current.sender == name and not current.replied:
+            current.replied = True
+            self.mouth.talk(
+                expert.ear, instruction, extra, in_reply_to=current.message_id
+            )
+        else:
+            self.mouth.talk(expert.ear, instruction, extra)
 
         return System.announcement(f"{self.name} talks to {name}")
 
@@ -138,6 +226,7 @@ class Person(BasePerson):
         tool = CodedTool(name=name, instruction=instruction)
         tool.build(params=BuildParams.from_str(extra))
         self.tools[name] = tool
+        self.brain.prefix.invalidate()
 
         return tool.greeting()
 
@@ -1,3 +1,3 @@
-from .base import BaseEar
+from .base import BaseEar, MessageType
 
-__all__ = ["BaseEar"]
+__all__ = ["BaseEar", "MessageType"]
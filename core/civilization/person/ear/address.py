@@ -0,0 +1,87 @@
+import os
+import re
+import tempfile
+from socket import AF_INET, AF_UNIX, SOCK_STREAM
+from socket import socket
+from typing import NamedTuple, Optional, Tuple, Union
+
+from core.config import settings
+
+
+class Endpoint(NamedTuple):
+    family: int
+    address: Union[str, Tuple[str, int]]
+
+    def __str__(self) -> str:
+        if self.family == AF_UNIX:
+            return self.address
+        return f"{self.address[0]}:{self.address[1]}"
+
+
+def get_socket_dir() -> str:
+    # one directory per process unless configured, so that civilizations
+    # on the same host don't see each other's sockets
+    return settings.EAR_SOCKET_DIR or os.path.join(
+        tempfile.gettempdir(), f"aivilization-{os.getpid()}"
+    )
+
+
+def get_socket_path(name: str, suffix: str = "") -> str:
+    return os.path.join(
+        get_socket_dir(), (re.sub(r"[^\w.-]", "_", name) or "_") + suffix + ".sock"
+    )
+
+
+def is_stale(path: str) -> bool:
+    probe = socket(AF_UNIX, SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return False
+    except (ConnectionRefusedError, FileNotFoundError):
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def bind_unix(name: str) -> Optional[Tuple[socket, Endpoint]]:
+    os.makedirs(get_socket_dir(), exist_ok=True)
+    # persons may share a name, later ones get a numbered socket
+    for i in range(1, 100):
+        path = get_socket_path(name, f"-{i}" if i > 1 else "")
+        if os.path.exists(path):
+            if not is_stale(path):
+                continue
+            os.unlink(path)
+
+        listener = socket(AF_UNIX, SOCK_STREAM)
+        try:
+            listener.bind(path)
+            return listener, Endpoint(AF_UNIX, path)
+        except OSError:
+            listener.close()
+    return None
+
+
+def bind_tcp() -> Optional[Tuple[socket, Endpoint]]:
+    host = settings.HOST
+    # the configured range keeps ports predictable, port 0 lets the kernel
+    # pick any free one once the range is used up
+    ports = range(settings.PORT_START, settings.PORT_START + settings.PORT_RANGE)
+    for port in [*ports, 0]:
+        listener = socket(AF_INET, SOCK_STREAM)
+        try:
+            listener.bind((host, port))
+            return listener, Endpoint(AF_INET, listener.getsockname()[:2])
+        except OSError:
+            listener.close()
+    return None
+
+
+def bind(name: str) -> Optional[Tuple[socket, Endpoint]]:
+    if settings.EAR_ADDRESS == "unix":
+        bound = bind_unix(name)
+        if bound is not None:
+            return bound
+    return bind_tcp()
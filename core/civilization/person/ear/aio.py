@@ -0,0 +1,60 @@
+import asyncio
+from asyncio import IncompleteReadError, StreamReader, StreamWriter
+
+from core.civilization.person.base import BasePerson
+
+from .base import MessageType
+from .default import Ear
+from .frame import HEADER, pack_frame, unpack_frame, unpack_header
+from .loop import get_loop
+
+
+class AsyncEar(Ear):
+    server: asyncio.AbstractServer = None
+
+    def start(self):
+        self.server = asyncio.run_coroutine_threadsafe(
+            self.listen(), get_loop()
+        ).result()
+
+    async def listen(self):
+        server = await asyncio.start_server(self.serve, sock=self.listener_socket)
+        print(f"[{self.person.name}-Ear] : Listening On {self.endpoint}")
+        return server
+
+    async def serve(self, reader: StreamReader, writer: StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except IncompleteReadError:
+                    break
+
+                fields, length = unpack_header(header)
+                payload = memoryview(await reader.readexactly(length))
+                try:
+                    frame = unpack_frame(fields, payload)
+                except ValueError as e:
+                    self.reject(e)
+                    continue
+
+                if frame.message_type == MessageType.Negotiate.value:
+                    writer.write(pack_frame(self.negotiate(frame)))
+                    await writer.drain()
+                    continue
+                self.receive(frame)
+        except (IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def trace_queue(self, message_sender: BasePerson, accepted: bool):
+        # tracers may block on I/O, which mustn't hold up the loop
+        self.run(self.person.tracer.on_queue, message_sender, self.work.depth, accepted)
+
+    def close(self):
+        # the server owns the listener socket and closes it on the loop
+        if self.server is not None:
+            get_loop().call_soon_threadsafe(self.server.close)
+            self.server = None
+        self.unbind()
@@ -1,15 +1,27 @@
 from abc import ABC, abstractmethod
 from enum import Enum
 from socket import socket
+from typing import Any
+
+from .frame import Frame
 
 
 class MessageType(Enum):
     Default = 1
+    # the receiver's queue was full and the message was dropped
+    Busy = 2
+    # agrees on a codec when a connection opens, answered on the same connection
+    Negotiate = 3
+    # commands to a worker process of a cluster, never heard by persons
+    Control = 4
 
 
 class BaseEar(ABC):
     listener_socket: socket
+    endpoint: Any
     port: int
+    # whether the ear lives in this process and can be handed messages directly
+    in_process: bool = True
 
     def __init__(self):
         pass
@@ -18,6 +30,14 @@ class BaseEar(ABC):
     def listen(self):
         pass
 
+    @abstractmethod
+    def receive(self, frame: Frame):
+        pass
+
     @abstractmethod
     def wait(self):
         pass
+
+    @abstractmethod
+    def close(self):
+        pass
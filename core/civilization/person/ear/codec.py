@@ -0,0 +1,56 @@
+import zlib
+from typing import Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# the codec of a compressed frame is kept in the low bits of its header flags
+CODEC_MASK = 0x03
+CODEC_FLAGS: Dict[str, int] = {"zlib": 0x01, "zstd": 0x02}
+
+
+def get_codecs() -> List[str]:
+    # installed codecs, most preferred first
+    codecs = ["zlib"]
+    if zstandard is not None:
+        codecs.insert(0, "zstd")
+    return codecs
+
+
+def get_codec(flags: int) -> Optional[str]:
+    for codec, flag in CODEC_FLAGS.items():
+        if flags & CODEC_MASK == flag:
+            return codec
+    return None
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data: bytes, codec: str, max_size: int) -> bytes:
+    # max_size keeps a small frame from inflating into an unbounded buffer
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Received a zstd frame, but zstandard isn't installed")
+        try:
+            if zstandard.frame_content_size(data) > max_size:
+                raise ValueError(f"Decompressed frame exceeds {max_size} bytes")
+            return zstandard.ZstdDecompressor().decompress(
+                data, max_output_size=max_size
+            )
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Invalid zstd frame: {e}") from e
+
+    decompressor = zlib.decompressobj()
+    try:
+        result = decompressor.decompress(data, max_size)
+    except zlib.error as e:
+        raise ValueError(f"Invalid zlib frame: {e}") from e
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Decompressed frame exceeds {max_size} bytes")
+    return result
@@ -1,124 +1,298 @@
-from re import sub
-from socket import AF_INET, SOCK_STREAM
-from socket import error as socket_error
-from socket import socket
-from struct import unpack
+import os
+import time
+from concurrent.futures import Future
+from queue import Full, Queue
+from selectors import EVENT_READ, DefaultSelector
+from socket import AF_INET, AF_UNIX, SHUT_RDWR, socket
 from threading import Thread
 from typing import Tuple
 
 from core.civilization.god.system import System
 from core.civilization.person.base import (
-    EXTRA_LENGTH_BYTES,
-    INSTRUCTION_LENGTH_BYTES,
     INVALID_MESSAGE_SENDER_ERROR_MESSAGE,
     INVALID_MESSAGE_TYPE_ERROR_MESSAGE,
-    MESSAGE_SENDER_BYTES,
-    MESSAGE_TYPE_BYTES,
     BasePerson,
     TalkParams,
 )
 from core.config import settings
+from core.logging import logger
 
+from .address import Endpoint, bind
 from .base import BaseEar, MessageType
+from .codec import get_codecs
+from .frame import Frame, FrameReader, pack_frame
+from .loop import get_worker_pool
+from .work import WorkQueue
 
 
 class Ear(BaseEar):
     listener_socket: socket
     person: BasePerson
+    endpoint: Endpoint
     port: int
 
     def __init__(self, person: BasePerson):
         super().__init__()
         self.person = person
-        self.listener_socket = socket(AF_INET, SOCK_STREAM)
-        if self.bind_port() == False:
+        bound = bind(self.person.name)
+        if bound is None:
             # TODO what if there's no available port? We need to let llm knows about resource limitations
             raise Exception(
                 System.error(f"No Avaialable Ports For {self.person.name}'s Ear")
             )
-        if self.person.name != "David":
-            t = Thread(target=self.listen)
-            t.start()
-
-    def bind_port(self):
-        port_start = settings.PORT_START
-        port_range = settings.PORT_RANGE
-        host = settings.HOST
-        for port in range(port_start, port_start + port_range):
-            try:
-                self.listener_socket.bind((host, port))
-                self.port = port
-                return True
-            except socket_error:
-                pass
-        return False
-
-    def get_instruction_length(self, conn: socket) -> int:
-        instruction_length_data = conn.recv(INSTRUCTION_LENGTH_BYTES)
-        return unpack(">I", instruction_length_data)[0]
-
-    def get_extra_length(self, conn: socket) -> int:
-        extra_length_data = conn.recv(EXTRA_LENGTH_BYTES)
-        return unpack(">I", extra_length_data)[0]
-
-    def get_sender(self, conn: socket) -> BasePerson:
-        message_sender_data = conn.recv(MESSAGE_SENDER_BYTES)
-        message_sender = sub("[\0]", "", message_sender_data.decode())
-        if message_sender not in self.person.experts:
-            raise Exception(INVALID_MESSAGE_SENDER_ERROR_MESSAGE)
-        return self.person.experts[message_sender]
-
-    def get_message_type(self, conn: socket) -> MessageType:
-        message_type_data = conn.recv(MESSAGE_TYPE_BYTES)
-        message_type = (unpack(">I", message_type_data))[0]
-        if message_type not in [e.value for e in MessageType]:
-            raise Exception(INVALID_MESSAGE_TYPE_ERROR_MESSAGE)
-        return MessageType(message_type)
-
-    def get_message(self, conn: socket, message_length: int) -> str:
-        message_body_data = conn.recv(message_length)
-        return message_body_data.decode()
-
-    def parse_data(self, conn: socket) -> Tuple[BasePerson, MessageType, str, str]:
-        instruction_length = self.get_instruction_length(conn)
-        extra_length = self.get_extra_length(conn)
-        sender = self.get_sender(conn)
-        message_type = self.get_message_type(conn)
-        instruction = self.get_message(conn, instruction_length)
-        extra = self.get_message(conn, extra_length)
-        return (sender, message_type, instruction, extra)
+        self.listener_socket, self.endpoint = bound
+        self.port = (
+            self.endpoint.address[1] if self.endpoint.family == AF_INET else None
+        )
 
-    def listen(self):
+        self.inbox: Queue = Queue()
+        self.work = WorkQueue(settings.EAR_QUEUE_SIZE, settings.EAR_PERSON_WORKERS)
+        self.start()
+
+    def start(self):
+        # listen before returning, or a mouth may connect to a socket nobody listens on
         self.listener_socket.listen()
-        print(f"[{self.person.name}-Ear] : Listening On {self.port}")
-        while True:
+        t = Thread(target=self.listen)
+        t.start()
+
+    def parse_frame(
+        self, frame: Frame
+    ) -> Tuple[BasePerson, MessageType, str, TalkParams]:
+        if frame.sender not in self.person.experts:
+            raise ValueError(INVALID_MESSAGE_SENDER_ERROR_MESSAGE)
+        if frame.message_type not in [e.value for e in MessageType]:
+            raise ValueError(INVALID_MESSAGE_TYPE_ERROR_MESSAGE)
+
+        params = TalkParams.from_str(frame.extra)
+        params.message_id = frame.message_id
+        params.in_reply_to = frame.in_reply_to
+        params.deadline = frame.deadline
+        return (
+            self.person.experts[frame.sender],
+            MessageType(frame.message_type),
+            frame.instruction,
+            params,
+        )
+
+    def listen(self):
+        # one thread waits on the listener and every open connection at once,
+        # so a person holds a single thread however many mouths talk to it
+        print(f"[{self.person.name}-Ear] : Listening On {self.endpoint}")
+        with DefaultSelector() as selector:
+            selector.register(self.listener_socket, EVENT_READ)
+            try:
+                while True:
+                    for key, _ in selector.select():
+                        if key.fileobj is self.listener_socket:
+                            if not self.accept(selector):
+                                return
+                        elif not self.serve(key.fileobj, key.data):
+                            selector.unregister(key.fileobj)
+                            key.fileobj.close()
+            finally:
+                for key in list(selector.get_map().values()):
+                    key.fileobj.close()
+
+    def accept(self, selector: DefaultSelector) -> bool:
+        try:
             conn, addr = self.listener_socket.accept()
-            if addr[0] != settings.HOST:
-                print(
-                    System.announcement(f"[{self.person.name}-Ear] : Unknown Message")
-                )
-                continue
+        except OSError:
+            # the ear was closed
+            return False
+        if self.endpoint.family == AF_INET and addr[0] != settings.HOST:
+            print(System.announcement(f"[{self.person.name}-Ear] : Unknown Message"))
+            conn.close()
+            return True
+        # a peer that sends part of a frame must not hold up the others
+        conn.setblocking(False)
+        selector.register(conn, EVENT_READ, FrameReader(conn))
+        return True
+
+    def serve(self, conn: socket, reader: FrameReader) -> bool:
+        # a mouth keeps its connection open and sends any number of frames on it,
+        # this takes in what has arrived and handles the frames it completes
+        try:
+            if not reader.receive():
+                return False
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+        while True:
             try:
-                message_sender, _, instruction, extra = self.parse_data(conn)
-            except Exception as e:
+                frame = reader.next()
+                if frame is None:
+                    return True
+                if frame.message_type == MessageType.Negotiate.value:
+                    conn.sendall(pack_frame(self.negotiate(frame)))
+                    continue
+                message = self.parse_frame(frame)
+            except ValueError as e:
+                # the frame was read whole, so the next one is still aligned
+                self.reject(e)
+                continue
+            except OSError:
+                return False
+            self.dispatch(*message)
+
+    def negotiate(self, frame: Frame) -> Frame:
+        # the mouth offers its codecs by preference, the first one known here wins
+        codecs = get_codecs()
+        codec = next((c for c in frame.instruction.split(",") if c in codecs), "")
+        return Frame(
+            sender=self.person.name,
+            message_type=MessageType.Negotiate.value,
+            instruction=codec,
+            extra="",
+            in_reply_to=frame.message_id,
+        )
+
+    def receive(self, frame: Frame):
+        try:
+            message = self.parse_frame(frame)
+        except ValueError as e:
+            self.reject(e)
+            return
+        self.dispatch(*message)
+
+    def dispatch(
+        self,
+        message_sender: BasePerson,
+        message_type: MessageType,
+        instruction: str,
+        params: TalkParams,
+    ):
+        message = (message_sender, message_type, instruction, params)
+        if self.person.mouth.resolve(params.in_reply_to, message):
+            # the asker waits on a future instead of hearing the reply
+            return
+
+        if message_type == MessageType.Busy:
+            # nothing to respond to, and queueing it could bounce busy replies around
+            self.hear(*message)
+            return
+
+        try:
+            evicted = self.work.put(message, priority=self.get_priority(message_sender))
+        except Full:
+            self.trace_queue(message_sender, False)
+            self.run(self.busy, *message)
+            return
+
+        if evicted is not None:
+            self.trace_queue(evicted[0], False)
+            self.run(self.busy, *evicted)
+        self.trace_queue(message_sender, True)
+        if self.work.acquire():
+            self.run(self.drain)
+
+    def get_priority(self, message_sender: BasePerson) -> int:
+        # the referee is who this person answers to, so its messages go first
+        referee = self.person.referee
+        return 0 if referee is not None and message_sender.name == referee.name else 1
+
+    def trace_queue(self, message_sender: BasePerson, accepted: bool):
+        self.person.tracer.on_queue(message_sender, self.work.depth, accepted)
+
+    def run(self, target, *args):
+        # the sender must not wait for the response, so it runs on the shared pool
+        get_worker_pool().submit(target, *args).add_done_callback(self.report)
+
+    def report(self, future: Future):
+        # a worker has no caller to raise to, so failures are logged here
+        if future.exception() is not None:
+            logger.exception(future.exception())
+
+    def drain(self):
+        while True:
+            message = self.work.get()
+            if message is None:
+                return
+            message_sender, _, instruction, params = message
+            if params.deadline and params.deadline < time.time():
+                # the sender has stopped waiting, the response would go nowhere
                 print(
                     System.announcement(
-                        f"[{self.person.name}-Ear] : Parsing Message Failed\n{e}"
+                        f"[{self.person.name}-Ear] : Message From "
+                        f"{message_sender.name} Expired"
                     )
                 )
                 continue
-            self.person.respond(
-                message_sender,
-                message_sender.to_format(instruction),
-                TalkParams.from_str(extra),
+            try:
+                self.hear(*message)
+            except Exception as e:
+                logger.exception(e)
+
+    def busy(
+        self,
+        message_sender: BasePerson,
+        message_type: MessageType,
+        instruction: str,
+        params: TalkParams,
+    ):
+        self.person.mouth.talk(
+            message_sender.ear,
+            System.announcement(
+                f"{self.person.name} is busy with {self.work.maxsize} messages, "
+                "try again later"
+            ),
+            "",
+            MessageType.Busy,
+            in_reply_to=params.message_id,
+        )
+
+    def reject(self, error: Exception):
+        print(
+            System.announcement(
+                f"[{self.person.name}-Ear] : Parsing Message Failed\n{error}"
             )
+        )
+
+    def hear(
+        self,
+        message_sender: BasePerson,
+        message_type: MessageType,
+        instruction: str,
+        params: TalkParams,
+    ):
+        if message_type == MessageType.Busy:
+            print(System.announcement(f"[{self.person.name}-Ear] : {instruction}"))
+
+        if self.person.name == "David":
+            self.inbox.put((message_sender, message_type, instruction, params))
+            return
+
+        if message_type != MessageType.Default:
+            return
+
+        self.person.respond(
+            message_sender,
+            message_sender.to_format(instruction),
+            params,
+        )
 
     def wait(self):
-        self.listener_socket.listen()
         print(
             System.announcement(
-                f"[{self.person.name}-Ear] : Waiting For Response On {self.port}"
+                f"[{self.person.name}-Ear] : Waiting For Response On {self.endpoint}"
             )
         )
-        _conn, _addr = self.listener_socket.accept()
+        self.inbox.get()
         print(System.announcement(f"[{self.person.name}-Ear] : Response Received"))
+
+    def close(self):
+        # shutdown wakes the listening thread, which closes the socket itself;
+        # closing it here could drop the wakeup before the thread sees it
+        try:
+            self.listener_socket.shutdown(SHUT_RDWR)
+        except OSError:
+            self.listener_socket.close()
+        self.unbind()
+
+    def unbind(self):
+        if self.endpoint.family == AF_UNIX:
+            try:
+                os.unlink(self.endpoint.address)
+            except OSError:
+                pass
@@ -0,0 +1,175 @@
+from socket import socket
+from struct import Struct
+from typing import NamedTuple, Optional, Tuple
+
+from .codec import CODEC_FLAGS, compress, decompress, get_codec
+
+# version, flags, message type, sender length, instruction length, extra length,
+# message id, id of the message replied to, deadline as unix time. The payload
+# is the sender name, the instruction and the extra, in that order.
+HEADER = Struct(">BBHHIIQQd")
+VERSION = 2
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class Frame(NamedTuple):
+    sender: str
+    message_type: int
+    instruction: str
+    extra: str
+    # ids are only unique per sender, 0 means none
+    message_id: int = 0
+    in_reply_to: int = 0
+    # 0 means the sender waits as long as it takes
+    deadline: float = 0.0
+    flags: int = 0
+
+
+def pack_frame(frame: Frame, codec: Optional[str] = None, threshold: int = 0) -> bytes:
+    # with a codec, payloads of at least threshold bytes go compressed and the
+    # lengths in the header are those of the compressed parts
+    sender_data = frame.sender.encode()
+    instruction_data = frame.instruction.encode()
+    extra_data = frame.extra.encode()
+    flags = frame.flags
+    if codec is not None and len(instruction_data) + len(extra_data) >= threshold:
+        instruction_data = compress(instruction_data, codec)
+        extra_data = compress(extra_data, codec)
+        flags |= CODEC_FLAGS[codec]
+    return (
+        HEADER.pack(
+            VERSION,
+            flags,
+            frame.message_type,
+            len(sender_data),
+            len(instruction_data),
+            len(extra_data),
+            frame.message_id,
+            frame.in_reply_to,
+            frame.deadline,
+        )
+        + sender_data
+        + instruction_data
+        + extra_data
+    )
+
+
+def unpack_header(header: bytes) -> Tuple[tuple, int]:
+    # returns the header fields and the length of the payload that follows
+    fields = HEADER.unpack_from(header)
+    if fields[0] != VERSION:
+        # the lengths can't be trusted, so the connection can't be read any further
+        raise ConnectionError(f"Unsupported frame version {fields[0]}")
+    length = fields[3] + fields[4] + fields[5]
+    if length > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    return fields, length
+
+
+def unpack_frame(fields: tuple, payload: memoryview) -> Frame:
+    (
+        _,
+        flags,
+        message_type,
+        sender_length,
+        instruction_length,
+        _,
+        message_id,
+        in_reply_to,
+        deadline,
+    ) = fields
+    instruction_end = sender_length + instruction_length
+    sender_data = payload[:sender_length]
+    instruction_data = payload[sender_length:instruction_end]
+    extra_data = payload[instruction_end:]
+    codec = get_codec(flags)
+    if codec is not None:
+        instruction_data = decompress(instruction_data, codec, MAX_FRAME_BYTES)
+        extra_data = decompress(extra_data, codec, MAX_FRAME_BYTES)
+    return Frame(
+        sender=str(sender_data, "utf-8"),
+        message_type=message_type,
+        instruction=str(instruction_data, "utf-8"),
+        extra=str(extra_data, "utf-8"),
+        message_id=message_id,
+        in_reply_to=in_reply_to,
+        deadline=deadline,
+        flags=flags,
+    )
+
+
+# Reads whole frames into one reusable buffer. The buffer only grows when a
+# frame larger than any before it arrives, and only the payload gets decoded.
+# read() blocks until a frame is whole. receive() and next() are for a
+# non-blocking socket, they keep what has arrived until a frame is complete.
+class FrameReader:
+    def __init__(self, conn: socket, size: int = 4096):
+        self.conn = conn
+        self.buffer = bytearray(max(size, HEADER.size))
+        # bytes received for next() and the header of the frame they start with
+        self.filled = 0
+        self.header: Optional[Tuple[tuple, int]] = None
+
+    def read(self) -> Optional[Frame]:
+        header = self._read_exactly(HEADER.size, boundary=True)
+        if header is None:
+            return None
+
+        fields, length = unpack_header(header)
+        return unpack_frame(fields, self._read_exactly(length))
+
+    def _read_exactly(self, size: int, boundary: bool = False) -> Optional[memoryview]:
+        if size > len(self.buffer):
+            self.buffer = bytearray(size)
+
+        view = memoryview(self.buffer)[:size]
+        received = 0
+        while received < size:
+            count = self.conn.recv_into(view[received:], size - received)
+            if count == 0:
+                # a peer may only hang up between frames
+                if boundary and received == 0:
+                    return None
+                raise ConnectionError("Connection closed in the middle of a frame")
+            received += count
+        return view
+
+    def receive(self) -> bool:
+        # takes in what has arrived without waiting, False once the peer hung up
+        if self.filled == len(self.buffer):
+            self._grow(2 * len(self.buffer))
+        with memoryview(self.buffer) as view:
+            count = self.conn.recv_into(view[self.filled :])
+        if count == 0:
+            if self.filled > 0:
+                raise ConnectionError("Connection closed in the middle of a frame")
+            return False
+        self.filled += count
+        return True
+
+    def next(self) -> Optional[Frame]:
+        # the next frame received whole, None until there is one
+        if self.header is None:
+            if self.filled < HEADER.size:
+                return None
+            self.header = unpack_header(self.buffer[: HEADER.size])
+
+        fields, length = self.header
+        size = HEADER.size + length
+        if self.filled < size:
+            self._grow(size)
+            return None
+
+        self.header = None
+        try:
+            with memoryview(self.buffer) as view:
+                return unpack_frame(fields, view[HEADER.size : size])
+        finally:
+            # the frame is consumed even if it can't be decoded
+            remaining = self.filled - size
+            self.buffer[:remaining] = self.buffer[size : self.filled]
+            self.filled = remaining
+
+    def _grow(self, size: int):
+        if size > len(self.buffer):
+            self.buffer.extend(bytes(size - len(self.buffer)))
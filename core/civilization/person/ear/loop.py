@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from typing import AsyncGenerator, Generator, Optional
+
+from core.config import settings
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_pool: Optional[ThreadPoolExecutor] = None
+_lock = Lock()
+
+
+# One event loop, run by a single thread, serves the listeners of every ear.
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            Thread(target=_loop.run_forever, name="ear-loop", daemon=True).start()
+        return _loop
+
+
+# Persons respond on a shared, bounded pool so that idle persons hold no thread.
+def get_worker_pool() -> ThreadPoolExecutor:
+    global _worker_pool
+    with _lock:
+        if _worker_pool is None:
+            _worker_pool = ThreadPoolExecutor(
+                max_workers=settings.EAR_WORKERS, thread_name_prefix="ear-worker"
+            )
+        return _worker_pool
+
+
+# Runs an async generator on the shared loop for a thread that waits on its items,
+# so the I/O behind them shares the loop with everything else in flight.
+def iterate(stream: AsyncGenerator) -> Generator:
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(
+                    stream.__anext__(), loop
+                ).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(stream.aclose(), loop).result()
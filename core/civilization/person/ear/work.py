@@ -0,0 +1,71 @@
+import heapq
+from itertools import count
+from queue import Full
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class WorkQueue:
+    # Bounded priority queue of heard messages, drained by at most `workers`
+    # workers at a time. Lower priority values are served first, and messages of
+    # the same priority in arrival order.
+    def __init__(self, maxsize: int, workers: int):
+        self.maxsize = maxsize
+        self.workers = max(1, workers)
+        self.items: List[Tuple[int, int, Any]] = []
+        self.sequence = count()
+        self.lock = Lock()
+        self.active = 0
+        self.peak = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.items)
+
+    def put(self, item: Any, priority: int = 0) -> Optional[Any]:
+        # A full queue makes room by evicting its last item of lower priority,
+        # which is returned so its sender can be told. Raises queue.Full if there
+        # is none.
+        evicted = None
+        with self.lock:
+            if self.maxsize > 0 and len(self.items) >= self.maxsize:
+                last = max(self.items)
+                if last[0] <= priority:
+                    self.rejected += 1
+                    raise Full
+                self.items.remove(last)
+                heapq.heapify(self.items)
+                self.rejected += 1
+                evicted = last[2]
+            heapq.heappush(self.items, (priority, next(self.sequence), item))
+            self.accepted += 1
+            self.peak = max(self.peak, len(self.items))
+        return evicted
+
+    def acquire(self) -> bool:
+        # whether the caller should start another worker to drain the queue
+        with self.lock:
+            if self.active >= self.workers or not self.items:
+                return False
+            self.active += 1
+            return True
+
+    def get(self) -> Optional[Any]:
+        # a worker that gets None has been released and must stop
+        with self.lock:
+            if not self.items:
+                self.active -= 1
+                return None
+            return heapq.heappop(self.items)[2]
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "depth": len(self.items),
+                "peak": self.peak,
+                "active": self.active,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+            }
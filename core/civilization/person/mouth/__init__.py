@@ -1,3 +1,4 @@
 from .base import BaseMouth
+from .transport import BaseTransport, DirectTransport, SocketTransport
 
-__all__ = ["BaseMouth"]
+__all__ = ["BaseMouth", "BaseTransport", "DirectTransport", "SocketTransport"]
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from core.civilization.person.ear import BaseEar
+from concurrent.futures import Future
+from typing import Any, Optional
+
+from core.civilization.person.ear import BaseEar, MessageType
 
 
 class BaseMouth(ABC):
@@ -7,5 +10,30 @@ class BaseMouth(ABC):
         pass
 
     @abstractmethod
-    def talk(self, to: BaseEar, instruction: str, extra: str):
+    def talk(
+        self,
+        to: BaseEar,
+        instruction: str,
+        extra: str,
+        message_type: MessageType = MessageType.Default,
+        in_reply_to: int = 0,
+    ):
+        pass
+
+    @abstractmethod
+    def ask(
+        self,
+        to: BaseEar,
+        instruction: str,
+        extra: str,
+        timeout: Optional[float] = None,
+    ) -> Future:
+        pass
+
+    def resolve(self, message_id: int, message: Any) -> bool:
+        # whether the message was the reply to an ask of this mouth
+        return False
+
+    @abstractmethod
+    def close(self):
         pass
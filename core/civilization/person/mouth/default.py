@@ -1,11 +1,17 @@
-from socket import AF_INET, SOCK_STREAM, socket
-from struct import pack
+import time
+from concurrent.futures import Future
+from itertools import count
+from threading import Lock
+from typing import Any, Dict, Optional
 
-from core.civilization.person.base import MESSAGE_SENDER_BYTES, BasePerson, MessageType
-from core.civilization.person.ear import BaseEar
+from core.civilization.person.base import BasePerson
+from core.civilization.person.ear import BaseEar, MessageType
+from core.civilization.person.ear.frame import Frame
+from core.civilization.person.ear.loop import get_loop
 from core.config import settings
 
 from .base import BaseMouth
+from .transport import BaseTransport, DirectTransport, SocketTransport
 
 
 class Mouth(BaseMouth):
@@ -14,36 +20,116 @@ class Mouth(BaseMouth):
     def __init__(self, person: BasePerson):
         super().__init__()
         self.person = person
+        self.local_transport: BaseTransport = DirectTransport()
+        self.remote_transport: BaseTransport = SocketTransport()
+        self.message_ids = count(1)
+        # futures of asked messages, by message id, until their reply arrives
+        self.pending: Dict[int, Future] = {}
+        self.lock = Lock()
 
     def construct_data(
         self,
         message_instruction: str,
         extra: str,
         message_type: MessageType = MessageType.Default,
-    ) -> bytes:
-        sender_data = self.person.name.rjust(MESSAGE_SENDER_BYTES, "\0").encode()
-        message_type_data = pack(">I", message_type.value)
-        instruction_data = message_instruction.encode()
-        instruction_length_data = pack(">I", len(instruction_data))
-        extra_data = extra.encode()
-        extra_length_data = pack(">I", len(extra_data))
-        return (
-            instruction_length_data
-            + extra_length_data
-            + sender_data
-            + message_type_data
-            + instruction_data
-            + extra_data
+        message_id: int = 0,
+        in_reply_to: int = 0,
+        deadline: float = 0.0,
+    ) -> Frame:
+        return Frame(
+            sender=self.person.name,
+            message_type=message_type.value,
+            instruction=message_instruction,
+            extra=extra,
+            message_id=message_id,
+            in_reply_to=in_reply_to,
+            deadline=deadline,
         )
 
+    def get_transport(self, to: BaseEar) -> BaseTransport:
+        if to.in_process and settings.MOUTH_TRANSPORT == "direct":
+            return self.local_transport
+        return self.remote_transport
+
     def talk(
         self,
         to: BaseEar,
         instruction: str,
         extra: str,
+        message_type: MessageType = MessageType.Default,
+        in_reply_to: int = 0,
     ):
-        data = self.construct_data(instruction, extra)
-        client = socket(AF_INET, SOCK_STREAM)
-        client.connect((settings.HOST, to.port))
-        client.send(data)
-        client.close()
+        self.get_transport(to).send(
+            to,
+            self.construct_data(
+                instruction,
+                extra,
+                message_type,
+                message_id=next(self.message_ids),
+                in_reply_to=in_reply_to,
+            ),
+        )
+
+    def ask(
+        self,
+        to: BaseEar,
+        instruction: str,
+        extra: str,
+        timeout: Optional[float] = None,
+    ) -> Future:
+        # Any number of asks can be outstanding at once. The reply is matched by
+        # its in_reply_to, and the future resolves to the heard message.
+        message_id = next(self.message_ids)
+        future = Future()
+        future.add_done_callback(lambda _: self.forget(message_id))
+        with self.lock:
+            self.pending[message_id] = future
+
+        deadline = 0.0
+        if timeout is not None:
+            deadline = time.time() + timeout
+            # a reply that never comes must not keep the future pending forever
+            loop = get_loop()
+            loop.call_soon_threadsafe(loop.call_later, timeout, self.expire, message_id)
+        try:
+            self.get_transport(to).send(
+                to,
+                self.construct_data(
+                    instruction,
+                    extra,
+                    message_id=message_id,
+                    deadline=deadline,
+                ),
+            )
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def resolve(self, message_id: int, message: Any) -> bool:
+        if not message_id:
+            return False
+        with self.lock:
+            future = self.pending.pop(message_id, None)
+        if future is None or not future.set_running_or_notify_cancel():
+            return False
+        future.set_result(message)
+        return True
+
+    def expire(self, message_id: int):
+        with self.lock:
+            future = self.pending.pop(message_id, None)
+        if future is not None and future.set_running_or_notify_cancel():
+            future.set_exception(TimeoutError(f"No reply to message {message_id}"))
+
+    def forget(self, message_id: int):
+        # a cancelled future won't be resolved, so it's dropped here
+        with self.lock:
+            self.pending.pop(message_id, None)
+
+    def close(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            future.cancel()
+        self.local_transport.close()
+        self.remote_transport.close()
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from socket import AF_INET, IPPROTO_TCP, SOCK_STREAM, TCP_NODELAY, socket
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from core.civilization.person.ear import BaseEar, MessageType
+from core.civilization.person.ear.address import Endpoint
+from core.civilization.person.ear.codec import get_codecs
+from core.civilization.person.ear.frame import Frame, FrameReader, pack_frame
+from core.config import settings
+
+
+class BaseTransport(ABC):
+    @abstractmethod
+    def send(self, to: BaseEar, frame: Frame):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+# Hands the frame straight to an ear of this process, nothing is encoded. The
+# ear queues it for the person like any frame it reads from a socket.
+class DirectTransport(BaseTransport):
+    def send(self, to: BaseEar, frame: Frame):
+        to.receive(frame)
+
+    def close(self):
+        # nothing is held open
+        pass
+
+
+# Sends the encoded frame over one long-lived connection per receiving ear. Each
+# connection agrees on a codec when it opens, and large frames go compressed.
+class SocketTransport(BaseTransport):
+    # retries a send once on a fresh connection when the pooled one is broken
+    MAX_ATTEMPTS = 2
+
+    def __init__(self):
+        self.connections: Dict[Endpoint, Tuple[socket, Lock, Optional[str]]] = {}
+        # held while connecting to an endpoint, so slow ears only hold up their own
+        self.connecting: Dict[Endpoint, Lock] = {}
+        self.lock = Lock()
+
+    def send(self, to: BaseEar, frame: Frame):
+        for attempt in range(SocketTransport.MAX_ATTEMPTS):
+            client, lock, codec = self.connect(to.endpoint)
+            data = pack_frame(frame, codec, settings.MOUTH_COMPRESSION_THRESHOLD)
+            try:
+                with lock:
+                    client.sendall(data)
+                return
+            except OSError:
+                self.disconnect(to.endpoint, client)
+                if attempt == SocketTransport.MAX_ATTEMPTS - 1:
+                    raise
+
+    def connect(self, endpoint: Endpoint) -> Tuple[socket, Lock, Optional[str]]:
+        with self.lock:
+            if endpoint in self.connections:
+                return self.connections[endpoint]
+            connecting = self.connecting.setdefault(endpoint, Lock())
+
+        with connecting:
+            with self.lock:
+                if endpoint in self.connections:
+                    # another sender connected while this one waited
+                    return self.connections[endpoint]
+
+            client = socket(endpoint.family, SOCK_STREAM)
+            if endpoint.family == AF_INET:
+                client.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            try:
+                client.connect(endpoint.address)
+                codec = self.negotiate(client)
+            except Exception:
+                client.close()
+                raise
+
+            with self.lock:
+                self.connections[endpoint] = (client, Lock(), codec)
+                return self.connections[endpoint]
+
+    def get_offered_codecs(self) -> List[str]:
+        if settings.MOUTH_COMPRESSION == "auto":
+            return get_codecs()
+        return [c for c in get_codecs() if c == settings.MOUTH_COMPRESSION]
+
+    def negotiate(self, client: socket) -> Optional[str]:
+        # the ear answers with the codec it picked, or nothing to go uncompressed
+        codecs = self.get_offered_codecs()
+        if not codecs:
+            return None
+        client.sendall(
+            pack_frame(
+                Frame(
+                    sender="",
+                    message_type=MessageType.Negotiate.value,
+                    instruction=",".join(codecs),
+                    extra="",
+                )
+            )
+        )
+        reply = FrameReader(client, size=256).read()
+        if reply is None:
+            raise ConnectionError("Connection closed during negotiation")
+        return reply.instruction if reply.instruction in codecs else None
+
+    def disconnect(self, endpoint: Endpoint, client: socket):
+        with self.lock:
+            if self.connections.get(endpoint, (None,))[0] is client:
+                del self.connections[endpoint]
+        client.close()
+
+    def close(self):
+        with self.lock:
+            connections, self.connections = self.connections, {}
+            self.connecting = {}
+        for client, _, _ in connections.values():
+            client.close()
@@ -1,4 +1,5 @@
 import json
+from typing import Optional
 
 from selenium import webdriver
 from selenium.webdriver.common.action_chains import ActionChains
@@ -55,13 +56,26 @@ class Browser(BaseTool):
     _options: webdriver.ChromeOptions = webdriver.ChromeOptions()
     _options.add_experimental_option("prefs", {"intl.accept_languages": "en-GB"})
 
-    _driver: webdriver.Chrome = webdriver.Chrome(
-        executable_path="chromedriver", options=_options
-    )
-    _action_chains: ActionChains = ActionChains(_driver)
+    # Chrome starts on first use rather than when this module is imported
+    _shared_driver: Optional[webdriver.Chrome] = None
+    _shared_action_chains: Optional[ActionChains] = None
     css_selectors = {}
     before_contents = ""
 
+    @property
+    def _driver(self) -> webdriver.Chrome:
+        if Browser._shared_driver is None:
+            Browser._shared_driver = webdriver.Chrome(
+                executable_path="chromedriver", options=Browser._options
+            )
+        return Browser._shared_driver
+
+    @property
+    def _action_chains(self) -> ActionChains:
+        if Browser._shared_action_chains is None:
+            Browser._shared_action_chains = ActionChains(self._driver)
+        return Browser._shared_action_chains
+
     def build(self, params: BuildParams) -> str:
         pass
 
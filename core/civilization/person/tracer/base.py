@@ -6,6 +6,7 @@ from core.civilization.person.action import Action, ActionType, Plan
 
 if TYPE_CHECKING:
     from core.civilization.person import BasePerson, TalkParams
+    from core.civilization.person.brain.metrics import ProblemMetrics, StageMetrics
 
 
 class BasePersonTracer:
@@ -25,6 +26,9 @@ class BasePersonTracer:
     def on_request(self, sender: BasePerson, prompt: str, params: TalkParams):
         pass
 
+    def on_queue(self, sender: BasePerson, depth: int, accepted: bool):
+        pass
+
     def on_thought_start(self):
         pass
 
@@ -55,6 +59,15 @@ class BasePersonTracer:
     def on_review(self, opinion: str, ok: bool):
         pass
 
+    def on_stage(self, metrics: StageMetrics):
+        pass
+
+    def on_loop(self, loop: str, iterations: int):
+        pass
+
+    def on_summary(self, summary: ProblemMetrics):
+        pass
+
     def on_response(self, sender: BasePerson, response: str):
         pass
 
@@ -10,6 +10,7 @@ from core.logging import ANSI, Color, Style, logger
 
 if TYPE_CHECKING:
     from core.civilization.person import BasePerson, TalkParams
+    from core.civilization.person.brain.metrics import ProblemMetrics, StageMetrics
 
 from .base import BasePersonTracer
 
@@ -41,6 +42,19 @@ class LogTracer(BasePersonTracer):
     def on_request(self, sender: BasePerson, prompt: str, params: TalkParams):
         pass
 
+    def on_queue(self, sender: BasePerson, depth: int, accepted: bool):
+        if not accepted:
+            logger.warning(
+                str(self.person)
+                + ANSI("busy".center(12)).to(Color.red(), Style.bold())
+                + f"dropped a message from {sender.name}, {depth} queued"
+            )
+        elif depth > 1:
+            logger.debug(
+                ANSI("[queue] ".rjust(12)).to(Style.dim())
+                + f"{depth} messages waiting for {self.person.name}"
+            )
+
     def on_thought_start(self):
         self.thought = ""
 
@@ -70,9 +84,15 @@ class LogTracer(BasePersonTracer):
                 + ": "
                 + plan.objective
                 + "\n"
-                + ANSI("\tprecondition: " + plan.precondition + "\n").to(Color.rgb(0xC0, 0xC0, 0xC0))
-                + ANSI("\teffect: " + plan.effect + "\n").to(Color.rgb(0xC0, 0xC0, 0xC0))
-                + ANSI("\tconstraint: " + plan.constraint).to(Color.rgb(0xC0, 0xC0, 0xC0))
+                + ANSI("\tprecondition: " + plan.precondition + "\n").to(
+                    Color.rgb(0xC0, 0xC0, 0xC0)
+                )
+                + ANSI("\teffect: " + plan.effect + "\n").to(
+                    Color.rgb(0xC0, 0xC0, 0xC0)
+                )
+                + ANSI("\tconstraint: " + plan.constraint).to(
+                    Color.rgb(0xC0, 0xC0, 0xC0)
+                )
             )
 
     def on_optimize(self, opinion: str, ok: bool):
@@ -105,6 +125,36 @@ class LogTracer(BasePersonTracer):
             + opinion
         )
 
+    def on_stage(self, metrics: StageMetrics):
+        time_to_first_token = (
+            f"{metrics.time_to_first_token:.2f}s"
+            if metrics.time_to_first_token is not None
+            else "N/A"
+        )
+        logger.debug(
+            ANSI(f"[{metrics.stage.value}] ".rjust(12)).to(Style.dim())
+            + f"{metrics.model} | ttft {time_to_first_token} | "
+            f"total {metrics.duration:.2f}s | "
+            f"tokens {metrics.prompt_tokens}+{metrics.completion_tokens} | "
+            f"${metrics.cost:.4f}"
+        )
+
+    def on_summary(self, summary: ProblemMetrics):
+        logger.info(
+            str(self.person)
+            + ANSI("summary".center(12)).to(Style.italic(), Style.dim())
+            + f"{summary.wall_time:.2f}s | ${summary.cost:.4f} | loops {summary.loops}"
+        )
+        for stage, stage_summary in summary.stages.items():
+            logger.info(
+                ANSI(f"[{stage}] ".rjust(12)).to(Style.dim())
+                + f"{stage_summary.calls} calls | "
+                f"ttft {stage_summary.time_to_first_token:.2f}s | "
+                f"total {stage_summary.duration:.2f}s | "
+                f"tokens {stage_summary.prompt_tokens}+{stage_summary.completion_tokens} | "
+                f"${stage_summary.cost:.4f}"
+            )
+
     def on_response(self, sender: BasePerson, response: str):
         logger.info(
             str(self.person)
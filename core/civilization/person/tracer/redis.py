@@ -10,6 +10,7 @@ from core.civilization.person.action import Action, ActionType, Plan
 
 if TYPE_CHECKING:
     from core.civilization.person import BasePerson, TalkParams
+    from core.civilization.person.brain.metrics import ProblemMetrics, StageMetrics
 
 from core.config import settings
 
@@ -43,6 +44,9 @@ class RedisTracer(BasePersonTracer):
     def on_request(self, sender: BasePerson, prompt: str, params: TalkParams):
         pass
 
+    def on_queue(self, sender: BasePerson, depth: int, accepted: bool):
+        self.log("queue", sender.name, depth=depth, accepted=accepted)
+
     def on_thought_start(self):
         self.thought = ""
         self.log("thought_start", "")
@@ -85,6 +89,24 @@ class RedisTracer(BasePersonTracer):
     def on_review(self, opinion: str, ok: bool):
         self.log("optimize", opinion, ok=ok)
 
+    def on_stage(self, metrics: StageMetrics):
+        self.log(
+            "stage",
+            metrics.stage.value,
+            model=metrics.model,
+            time_to_first_token=metrics.time_to_first_token,
+            duration=metrics.duration,
+            prompt_tokens=metrics.prompt_tokens,
+            completion_tokens=metrics.completion_tokens,
+            cost=metrics.cost,
+        )
+
+    def on_loop(self, loop: str, iterations: int):
+        self.log("loop", loop, iterations=iterations)
+
+    def on_summary(self, summary: ProblemMetrics):
+        self.log("summary", "", **summary.to_dict())
+
     def on_response(self, sender: BasePerson, response: str):
         self.log("response", response.split(System.PROMPT_SEPARATOR)[1].strip())
 
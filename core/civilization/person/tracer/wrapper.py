@@ -6,6 +6,7 @@ from core.civilization.person.action import Action, Plan
 
 if TYPE_CHECKING:
     from core.civilization.person import BasePerson, TalkParams
+    from core.civilization.person.brain.metrics import ProblemMetrics, StageMetrics
 
 from .base import BasePersonTracer
 
@@ -24,6 +25,10 @@ class PersonTracerWrapper(BasePersonTracer):
         for tracer in self.tracers:
             tracer.on_request(sender, prompt, params)
 
+    def on_queue(self, sender: BasePerson, depth: int, accepted: bool):
+        for tracer in self.tracers:
+            tracer.on_queue(sender, depth, accepted)
+
     def on_thought_start(self):
         for tracer in self.tracers:
             tracer.on_thought_start()
@@ -64,6 +69,18 @@ class PersonTracerWrapper(BasePersonTracer):
         for tracer in self.tracers:
             tracer.on_review(opinion, ok)
 
+    def on_stage(self, metrics: StageMetrics):
+        for tracer in self.tracers:
+            tracer.on_stage(metrics)
+
+    def on_loop(self, loop: str, iterations: int):
+        for tracer in self.tracers:
+            tracer.on_loop(loop, iterations)
+
+    def on_summary(self, summary: ProblemMetrics):
+        for tracer in self.tracers:
+            tracer.on_summary(summary)
+
     def on_response(self, sender: BasePerson, response: str):
         for tracer in self.tracers:
             tracer.on_response(sender, response)
@@ -11,11 +11,63 @@ class Settings(BaseSettings):
     PORT_START: int = os.getenv("PORT_START", "50000")
     PORT_RANGE: int = os.getenv("PORT_RANGE", "10")
     HOST: str = os.getenv("HOST", "127.0.0.1")
+    EAR_ADDRESS: str = os.getenv("EAR_ADDRESS", "tcp")
+    EAR_SOCKET_DIR: str = os.getenv("EAR_SOCKET_DIR", "")
+    EAR_BACKEND: str = os.getenv("EAR_BACKEND", "thread")
+    EAR_WORKERS: int = os.getenv("EAR_WORKERS", "8")
+    EAR_QUEUE_SIZE: int = os.getenv("EAR_QUEUE_SIZE", "32")
+    EAR_PERSON_WORKERS: int = os.getenv("EAR_PERSON_WORKERS", "1")
+    MOUTH_TRANSPORT: str = os.getenv("MOUTH_TRANSPORT", "socket")
+    CIVILIZATION_WORKERS: int = os.getenv("CIVILIZATION_WORKERS", "0")
+    MOUTH_COMPRESSION: str = os.getenv("MOUTH_COMPRESSION", "none")
+    MOUTH_COMPRESSION_THRESHOLD: int = os.getenv("MOUTH_COMPRESSION_THRESHOLD", "4096")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY")
     PINECONE_INDEX: str = os.getenv("PINECONE_INDEX", "plan")
+    LTERM_MEMORY: str = os.getenv(
+        "LTERM_MEMORY", "pinecone" if os.getenv("PINECONE_API_KEY") else ""
+    )
+    LTERM_MEMORY_PERSIST: bool = os.getenv(
+        "LTERM_MEMORY_PERSIST",
+        "true" if os.getenv("LTERM_MEMORY") == "local" else "false",
+    )
+    LTERM_MEMORY_TOP_K: int = os.getenv("LTERM_MEMORY_TOP_K", "3")
+    LTERM_MEMORY_MIN_SCORE: float = os.getenv("LTERM_MEMORY_MIN_SCORE", "0.8")
+    LOCAL_INDEX_DIR: str = os.getenv("LOCAL_INDEX_DIR", ".cache/plans")
+    LOCAL_INDEX_DTYPE: str = os.getenv("LOCAL_INDEX_DTYPE", "float16")
+    LOCAL_INDEX_APPROXIMATE_THRESHOLD: int = os.getenv(
+        "LOCAL_INDEX_APPROXIMATE_THRESHOLD", "10000"
+    )
     REDIS_HOST: str = os.getenv("REDIS_HOST", "")
     REDIS_PORT: str = os.getenv("REDIS_PORT", "6379")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4")
+    LLM_STAGE_MODELS: str = os.getenv("LLM_STAGE_MODELS", "")
+    LLM_MAX_CONNECTIONS: int = os.getenv("LLM_MAX_CONNECTIONS", "100")
+    LLM_MAX_RETRIES: int = os.getenv("LLM_MAX_RETRIES", "3")
+    LLM_REQUESTS_PER_MINUTE: int = os.getenv("LLM_REQUESTS_PER_MINUTE", "0")
+    LLM_TOKENS_PER_MINUTE: int = os.getenv("LLM_TOKENS_PER_MINUTE", "0")
+    LLM_CACHE: bool = os.getenv("LLM_CACHE", "false")
+    LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", ".cache/completions")
+    LLM_CACHE_SIZE: int = os.getenv("LLM_CACHE_SIZE", "256")
+    LLM_CACHE_MAX_BYTES: int = os.getenv("LLM_CACHE_MAX_BYTES", "268435456")
+    EMBEDDING_CACHE: bool = os.getenv("EMBEDDING_CACHE", "false")
+    EMBEDDING_CACHE_DIR: str = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+    EMBEDDING_CACHE_SIZE: int = os.getenv("EMBEDDING_CACHE_SIZE", "1024")
+    EMBEDDING_CACHE_MAX_BYTES: int = os.getenv("EMBEDDING_CACHE_MAX_BYTES", "268435456")
+    LLM_RECORD_PATH: str = os.getenv("LLM_RECORD_PATH", "")
+    LLM_REPLAY_PATH: str = os.getenv("LLM_REPLAY_PATH", "")
+    LLM_REPLAY_REALTIME: bool = os.getenv("LLM_REPLAY_REALTIME", "false")
+    PLAN_CACHE: bool = os.getenv("PLAN_CACHE", "false")
+    PLAN_CACHE_DIR: str = os.getenv("PLAN_CACHE_DIR", ".cache/accepted_plans")
+    PLAN_CACHE_INDEX_DIR: str = os.getenv(
+        "PLAN_CACHE_INDEX_DIR", ".cache/accepted_plans_index"
+    )
+    PLAN_CACHE_SIZE: int = os.getenv("PLAN_CACHE_SIZE", "256")
+    PLAN_CACHE_SIMILARITY: float = os.getenv("PLAN_CACHE_SIMILARITY", "0")
+    STM_TOKEN_BUDGET: int = os.getenv("STM_TOKEN_BUDGET", "0")
+    STM_MIN_TURNS: int = os.getenv("STM_MIN_TURNS", "2")
+    STM_JOURNAL_DIR: str = os.getenv("STM_JOURNAL_DIR", "")
+    STM_SNAPSHOT_INTERVAL: int = os.getenv("STM_SNAPSHOT_INTERVAL", "50")
 
 
 settings = Settings()
@@ -0,0 +1,86 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.civilization.person.ear import MessageType
+from core.civilization.person.ear.default import Ear
+from core.civilization.person.mouth.default import Mouth
+from core.config import settings
+
+
+def create(name: str, respond) -> SimpleNamespace:
+    person = SimpleNamespace(
+        name=name,
+        experts={},
+        referee=None,
+        tracer=SimpleNamespace(on_queue=lambda *args: None),
+        to_format=lambda instruction: instruction,
+        respond=respond,
+    )
+    person.mouth = Mouth(person)
+    person.ear = Ear(person)
+    return person
+
+
+@pytest.fixture
+def persons(monkeypatch):
+    monkeypatch.setattr(settings, "MOUTH_TRANSPORT", "direct")
+    heard = []
+    ignored = []
+
+    def answer(sender, request, params):
+        heard.append(request)
+        if request == "ignore me":
+            ignored.append(params.message_id)
+        else:
+            bob.mouth.talk(
+                sender.ear, f"re: {request}", "", in_reply_to=params.message_id
+            )
+
+    ann = create("Ann", respond=lambda *args: heard.append("Ann heard"))
+    bob = create("Bob", respond=answer)
+    ann.experts["Bob"] = bob
+    bob.experts["Ann"] = ann
+    yield ann, bob, heard, ignored
+    for person in (ann, bob):
+        person.mouth.close()
+        person.ear.close()
+
+
+def test_reply_resolves_the_ask(persons):
+    ann, bob, heard, _ = persons
+    first = ann.mouth.ask(bob.ear, "first", "")
+    second = ann.mouth.ask(bob.ear, "second", "")
+
+    for future, request in [(second, "second"), (first, "first")]:
+        sender, message_type, instruction, params = future.result(timeout=2)
+        assert sender is bob
+        assert message_type == MessageType.Default
+        assert instruction == f"re: {request}"
+    # the replies went to the futures, Ann never heard them as requests
+    assert sorted(heard) == ["first", "second"]
+    assert ann.mouth.pending == {}
+
+
+def test_ask_without_reply_times_out(persons):
+    ann, bob, _, _ = persons
+    future = ann.mouth.ask(bob.ear, "ignore me", "", timeout=0.2)
+
+    with pytest.raises(TimeoutError):
+        future.result(timeout=2)
+    assert ann.mouth.pending == {}
+
+
+def test_late_reply_is_heard_as_a_message(persons):
+    ann, bob, heard, ignored = persons
+    future = ann.mouth.ask(bob.ear, "ignore me", "", timeout=0.1)
+    with pytest.raises(TimeoutError):
+        future.result(timeout=2)
+
+    bob.mouth.talk(ann.ear, "too late", "", in_reply_to=ignored[0])
+    for _ in range(200):
+        if "Ann heard" in heard:
+            break
+        time.sleep(0.01)
+    assert "Ann heard" in heard
@@ -0,0 +1,149 @@
+import asyncio
+import os
+from typing import AsyncGenerator, Dict, Generator, List
+
+from core.cache import TieredCache, hash_key
+from core.civilization.person.brain.llm import BaseLLM, CachedLLM
+
+
+class FakeLLM(BaseLLM):
+    chunks: List[str] = ["Hello", ", ", "world"]
+    calls: int = 0
+
+    def chat_completion(
+        self, messages: List[Dict[str, str]], temparture: float = 0.7, **params
+    ) -> Generator:
+        self.calls += 1
+        return ({"choices": [{"delta": {"content": c}}]} for c in self.chunks)
+
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], temparture: float = 0.7, **params
+    ) -> AsyncGenerator:
+        self.calls += 1
+        return self._stream()
+
+    async def _stream(self) -> AsyncGenerator:
+        for c in self.chunks:
+            yield {"choices": [{"delta": {"content": c}}]}
+
+
+def read(stream) -> str:
+    return "".join(chunk["choices"][0]["delta"]["content"] for chunk in stream)
+
+
+async def aread(stream) -> str:
+    return "".join([chunk["choices"][0]["delta"]["content"] async for chunk in stream])
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def test_hash_key_ignores_dict_order():
+    assert hash_key({"a": 1, "b": 2}) == hash_key({"b": 2, "a": 1})
+    assert hash_key("a") != hash_key("b")
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TieredCache(max_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["memory_hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_outlives_memory(tmp_path):
+    TieredCache(directory=str(tmp_path)).set("key", {"value": [1, 2]})
+
+    cache = TieredCache(directory=str(tmp_path))
+    assert cache.get("key") == {"value": [1, 2]}
+    assert cache.disk_hits == 1
+    assert cache.get("key") == {"value": [1, 2]}
+    assert cache.memory_hits == 1
+
+
+def test_disk_tier_evicts_oldest_over_max_bytes(tmp_path):
+    cache = TieredCache(directory=str(tmp_path), max_items=1, max_bytes=20)
+    cache.set("old", "x" * 10)
+    path = cache._path("old")
+    os.utime(path, (0, 0))
+    cache.set("new", "y" * 10)
+
+    assert not os.path.exists(path)
+    assert cache.disk_bytes <= 20
+    assert TieredCache(directory=str(tmp_path)).get("new") == "y" * 10
+
+
+def test_cached_llm_replays_completed_stream():
+    llm = FakeLLM()
+    cached = CachedLLM(llm, cache=TieredCache())
+
+    assert read(cached.chat_completion(MESSAGES)) == "Hello, world"
+    assert read(cached.chat_completion(MESSAGES)) == "Hello, world"
+    assert llm.calls == 1
+
+
+def test_cached_llm_keeps_what_a_stream_closed_early_read():
+    llm = FakeLLM()
+    cached = CachedLLM(llm, cache=TieredCache())
+
+    stream = cached.chat_completion(MESSAGES)
+    next(stream)
+    next(stream)
+    stream.close()
+
+    assert read(cached.chat_completion(MESSAGES)) == "Hello, "
+    assert llm.calls == 1
+
+
+def test_cached_llm_skips_stream_that_failed():
+    class FailingLLM(FakeLLM):
+        def chat_completion(self, messages, **params) -> Generator:
+            yield from super().chat_completion(messages, **params)
+            raise ConnectionError
+
+    llm = FailingLLM()
+    cached = CachedLLM(llm, cache=TieredCache())
+
+    for _ in range(2):
+        try:
+            read(cached.chat_completion(MESSAGES))
+        except ConnectionError:
+            pass
+    assert llm.calls == 2
+
+
+def test_cached_llm_keys_by_temperature():
+    llm = FakeLLM()
+    cached = CachedLLM(llm, cache=TieredCache())
+
+    read(cached.chat_completion(MESSAGES))
+    read(cached.chat_completion(MESSAGES, temparture=0.7))
+    assert llm.calls == 1
+
+    read(cached.chat_completion(MESSAGES, temparture=0))
+    assert llm.calls == 2
+
+
+def test_cached_llm_async():
+    llm = FakeLLM()
+    cached = CachedLLM(llm, cache=TieredCache())
+
+    async def run():
+        assert await aread(await cached.achat_completion(MESSAGES)) == "Hello, world"
+        assert await aread(await cached.achat_completion(MESSAGES)) == "Hello, world"
+
+        stream = await cached.achat_completion(MESSAGES + MESSAGES)
+        await stream.__anext__()
+        await stream.aclose()
+        assert (
+            await aread(await cached.achat_completion(MESSAGES + MESSAGES)) == "Hello"
+        )
+
+    asyncio.run(run())
+    assert llm.calls == 2
@@ -0,0 +1,98 @@
+import os
+import socket
+import subprocess
+import sys
+from queue import Queue
+from types import SimpleNamespace
+
+import pytest
+
+from core.civilization.cluster import Cluster
+from core.civilization.cluster.launcher import Launcher
+from core.civilization.person import TalkParams
+from core.civilization.person.base import PersonMessageFormat
+from core.civilization.person.ear.default import Ear
+from core.civilization.person.mouth.default import Mouth
+from core.civilization.person.tool.default import Terminal
+from core.config import settings
+from core.logging import Color
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# The person in this process that invites the others. It is named David, so its
+# ear puts what it hears in the inbox instead of responding.
+class David(PersonMessageFormat):
+    name = "David"
+    instruction = "Ask the others."
+    color = Color.rgb()
+    referee = None
+
+    def __init__(self):
+        self.experts = {}
+        self.tracer = SimpleNamespace(on_queue=lambda *args: None)
+        self.mouth = Mouth(self)
+        self.ear = Ear(self)
+        self.ear.inbox = Queue()
+
+
+@pytest.fixture
+def cluster(tmp_path, monkeypatch):
+    # workers are spawned, so they read their settings from the environment
+    port = get_free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.server", "--port", str(port)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    monkeypatch.setenv("OPENAI_API_BASE", f"http://127.0.0.1:{port}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    for name in ["LTERM_MEMORY", "LLM_RECORD_PATH", "LLM_REPLAY_PATH"]:
+        monkeypatch.setenv(name, "")
+    monkeypatch.setenv("LLM_CACHE", "false")
+    monkeypatch.setenv("PLAN_CACHE", "false")
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("playground", exist_ok=True)
+    monkeypatch.setattr(settings, "EAR_SOCKET_DIR", str(tmp_path / "ears"))
+
+    launcher = Launcher(workers=2)
+    david = David()
+    try:
+        yield Cluster(), david
+    finally:
+        david.mouth.close()
+        david.ear.close()
+        launcher.close()
+        server.kill()
+
+
+def test_persons_are_placed_on_the_least_loaded_worker(cluster):
+    cluster, david = cluster
+    workers = cluster.get_workers()
+    assert len(workers) == 2
+
+    persons = [
+        cluster.spawn(f"P{i}", "Help.", SimpleNamespace(tools={}), referee=david)
+        for i in range(3)
+    ]
+    assert sorted(cluster.get_load(path) for path in workers) == [1, 2]
+    assert {person.worker for person in persons} == set(workers)
+    assert all(not person.ear.in_process for person in persons)
+
+
+def test_remote_person_responds_in_its_worker(cluster):
+    cluster, david = cluster
+    params = SimpleNamespace(tools={"terminal": Terminal()})
+    bob = cluster.spawn("Bob", "Run commands.", params, referee=david)
+    david.experts["Bob"] = bob
+
+    result = bob.respond(david, david.to_format("Say done."), TalkParams(attachment=[]))
+    assert "done" in result
+
+    # Bob talked back to David's ear over a socket on the way
+    sender, _, instruction, _ = david.ear.inbox.get(timeout=30)
+    assert sender is bob
+    assert instruction == result
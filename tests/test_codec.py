@@ -0,0 +1,80 @@
+import zlib
+
+import pytest
+
+from core.civilization.person.ear.codec import (
+    CODEC_FLAGS,
+    compress,
+    decompress,
+    get_codec,
+    get_codecs,
+)
+from core.civilization.person.ear.frame import (
+    HEADER,
+    Frame,
+    pack_frame,
+    unpack_frame,
+    unpack_header,
+)
+
+
+def roundtrip(data: bytes) -> Frame:
+    fields, _ = unpack_header(data[: HEADER.size])
+    return unpack_frame(fields, memoryview(data[HEADER.size :]))
+
+
+@pytest.mark.parametrize("codec", get_codecs())
+def test_compress_roundtrip(codec):
+    data = b"the same words over and over " * 100
+    compressed = compress(data, codec)
+    assert len(compressed) < len(data)
+    assert decompress(compressed, codec, len(data)) == data
+
+
+@pytest.mark.parametrize("codec", get_codecs())
+def test_decompress_stops_at_max_size(codec):
+    compressed = compress(b"\0" * 100000, codec)
+    with pytest.raises(ValueError):
+        decompress(compressed, codec, 1000)
+
+
+def test_decompress_rejects_garbage():
+    with pytest.raises(ValueError):
+        decompress(b"not compressed", "zlib", 1000)
+
+
+def test_codec_is_read_from_flags():
+    assert get_codec(0) is None
+    for codec, flag in CODEC_FLAGS.items():
+        assert get_codec(flag) == codec
+    assert "zlib" in get_codecs()
+
+
+@pytest.mark.parametrize("codec", get_codecs())
+def test_frames_over_threshold_are_compressed(codec):
+    frame = Frame("Ann", 1, "instruction " * 1000, "extra " * 1000, message_id=5)
+
+    data = pack_frame(frame, codec=codec, threshold=4096)
+    assert len(data) < len(pack_frame(frame))
+    decoded = roundtrip(data)
+    assert decoded._replace(flags=0) == frame
+    assert get_codec(decoded.flags) == codec
+
+
+def test_frames_under_threshold_are_sent_as_is():
+    frame = Frame("Ann", 1, "short", "")
+    data = pack_frame(frame, codec="zlib", threshold=4096)
+    assert data == pack_frame(frame)
+    assert roundtrip(data) == frame
+
+
+def test_sender_name_is_not_compressed():
+    frame = Frame("Bartholomew", 1, "x" * 5000, "")
+    data = pack_frame(frame, codec="zlib", threshold=0)
+    fields, _ = unpack_header(data[: HEADER.size])
+    sender_length, instruction_length = fields[3], fields[4]
+
+    payload = data[HEADER.size :]
+    assert payload[:sender_length] == b"Bartholomew"
+    instruction = payload[sender_length : sender_length + instruction_length]
+    assert zlib.decompress(instruction) == b"x" * 5000
@@ -0,0 +1,65 @@
+import socket
+import time
+from queue import Queue
+from types import SimpleNamespace
+
+from core.civilization.person.ear.default import Ear
+from core.civilization.person.ear.frame import Frame, pack_frame
+
+ANN = SimpleNamespace(name="Ann")
+
+
+class Replies:
+    # stands in for the mouth, every frame sent here answers a question
+    def __init__(self):
+        self.received = Queue()
+
+    def resolve(self, in_reply_to: int, message) -> bool:
+        self.received.put((in_reply_to, message[2]))
+        return True
+
+
+def create() -> Ear:
+    person = SimpleNamespace(
+        name="Steve", experts={"Ann": ANN}, referee=None, mouth=Replies()
+    )
+    return Ear(person)
+
+
+def test_partial_frame_does_not_hold_up_other_connections():
+    ear = create()
+    try:
+        stalled = socket.create_connection(ear.endpoint.address)
+        other = socket.create_connection(ear.endpoint.address)
+        with stalled, other:
+            data = pack_frame(Frame("Ann", 1, "first", "", in_reply_to=1))
+            stalled.sendall(data[:1])
+            time.sleep(0.05)
+            other.sendall(pack_frame(Frame("Ann", 1, "second", "", in_reply_to=2)))
+            assert ear.person.mouth.received.get(timeout=1) == (2, "second")
+
+            stalled.sendall(data[1:])
+            assert ear.person.mouth.received.get(timeout=1) == (1, "first")
+    finally:
+        ear.close()
+
+
+def test_frames_split_anywhere_are_put_together():
+    ear = create()
+    frames = [
+        Frame("Ann", 1, "x" * 10000, "", in_reply_to=1),
+        Frame("Ann", 1, "short", "", in_reply_to=2),
+        # a sender the ear doesn't know is rejected, the frames after it still count
+        Frame("Bob", 1, "unknown", "", in_reply_to=3),
+        Frame("Ann", 1, "last", "", in_reply_to=4),
+    ]
+    data = b"".join(pack_frame(frame) for frame in frames)
+    try:
+        with socket.create_connection(ear.endpoint.address) as conn:
+            for i in range(0, len(data), 777):
+                conn.sendall(data[i : i + 777])
+                time.sleep(0.001)
+            received = [ear.person.mouth.received.get(timeout=1) for _ in range(3)]
+        assert received == [(1, "x" * 10000), (2, "short"), (4, "last")]
+    finally:
+        ear.close()
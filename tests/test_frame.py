@@ -0,0 +1,81 @@
+import socket
+
+import pytest
+
+from core.civilization.person.ear.frame import (
+    HEADER,
+    MAX_FRAME_BYTES,
+    Frame,
+    FrameReader,
+    pack_frame,
+    unpack_frame,
+    unpack_header,
+)
+
+
+def roundtrip(data: bytes) -> Frame:
+    fields, length = unpack_header(data[: HEADER.size])
+    payload = memoryview(data[HEADER.size :])
+    assert len(payload) == length
+    return unpack_frame(fields, payload)
+
+
+def test_frame_roundtrip():
+    frame = Frame(
+        sender="Steve",
+        message_type=1,
+        instruction="Write a report",
+        extra="attachment: []",
+        message_id=7,
+        in_reply_to=3,
+        deadline=1234.5,
+    )
+    assert roundtrip(pack_frame(frame)) == frame
+
+
+def test_long_and_unicode_sender_names_are_kept():
+    frame = Frame(
+        sender="Bartholomew the Engineer 에이전트",
+        message_type=1,
+        instruction="안녕하세요",
+        extra="",
+    )
+    assert roundtrip(pack_frame(frame)) == frame
+
+
+def test_unknown_version_is_rejected():
+    data = bytearray(pack_frame(Frame("a", 1, "b", "c")))
+    data[0] = 99
+    with pytest.raises(ConnectionError):
+        unpack_header(bytes(data[: HEADER.size]))
+
+
+def test_oversized_frame_is_rejected():
+    header = HEADER.pack(2, 0, 1, 1, MAX_FRAME_BYTES, 1, 0, 0, 0.0)
+    with pytest.raises(ConnectionError):
+        unpack_header(header)
+
+
+def test_reader_reads_frames_in_order():
+    frames = [
+        Frame("Ann", 1, "x" * 10000, "extra", message_id=1),
+        Frame("Mark", 2, "", "", message_id=2, in_reply_to=1),
+        Frame("John", 1, "short", "", message_id=3),
+    ]
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(b"".join(pack_frame(frame) for frame in frames))
+        left.shutdown(socket.SHUT_WR)
+
+        reader = FrameReader(right, size=16)
+        assert [reader.read() for _ in frames] == frames
+        assert reader.read() is None
+
+
+def test_reader_rejects_frame_cut_short():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(pack_frame(Frame("Ann", 1, "instruction", ""))[:-3])
+        left.shutdown(socket.SHUT_WR)
+        with pytest.raises(ConnectionError):
+            FrameReader(right).read()
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from core.civilization.person.brain.memory.vector import LocalIndex
+from core.civilization.person.brain.memory.vector.index import (
+    InvertedFile,
+    Namespace,
+    normalize,
+    quantize,
+)
+
+DIMENSION = 32
+
+
+def random_vectors(count: int, seed: int = 0) -> np.ndarray:
+    return (
+        np.random.default_rng(seed).normal(size=(count, DIMENSION)).astype(np.float32)
+    )
+
+
+def records(vectors: np.ndarray, prefix: str = "v"):
+    return [
+        (f"{prefix}{i}", vector, {"group": i % 2}) for i, vector in enumerate(vectors)
+    ]
+
+
+def test_query_ranks_by_cosine_similarity():
+    vectors = random_vectors(50)
+    index = LocalIndex()
+    index.upsert(records(vectors), namespace="a")
+
+    result = index.query(vectors[7] * 3, top_k=3, namespace="a")
+    assert result["matches"][0]["id"] == "v7"
+    assert result["matches"][0]["score"] == pytest.approx(1.0, abs=1e-3)
+    scores = [match["score"] for match in result["matches"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_namespaces_and_filters_are_kept_apart():
+    vectors = random_vectors(10)
+    index = LocalIndex()
+    index.upsert(records(vectors), namespace="a")
+
+    assert index.query(vectors[0], namespace="b") == {"matches": []}
+    result = index.query(
+        vectors[0], top_k=10, namespace="a", filter={"group": 1}, include_metadata=True
+    )
+    assert {match["metadata"]["group"] for match in result["matches"]} == {1}
+    assert len(result["matches"]) == 5
+
+
+def test_upsert_replaces_and_delete_removes():
+    vectors = random_vectors(4)
+    index = LocalIndex()
+    index.upsert(records(vectors), namespace="a")
+    index.upsert([("v0", vectors[3], {"group": 9})], namespace="a")
+    assert len(index) == 4
+
+    index.delete(ids=["v3"], namespace="a")
+    result = index.query(vectors[3], top_k=1, namespace="a", include_metadata=True)
+    assert result["matches"][0]["id"] == "v0"
+    assert result["matches"][0]["metadata"] == {"group": 9}
+
+    index.delete(delete_all=True, namespace="a")
+    assert len(index) == 0
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_quantized_scores_stay_close(dtype):
+    vector = normalize(random_vectors(1)[0])
+    values, scale = quantize(vector, np.dtype(dtype).type)
+
+    assert values.dtype == np.dtype(dtype)
+    decoded = values.astype(np.float32) * scale
+    assert float(decoded @ vector) == pytest.approx(1.0, abs=1e-2)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_index_persists_in_its_directory(tmp_path, dtype):
+    vectors = random_vectors(40)
+    index = LocalIndex(dtype=dtype, directory=str(tmp_path))
+    index.upsert(records(vectors), namespace="Steve")
+    index.delete(ids=["v1"], namespace="Steve")
+
+    reloaded = LocalIndex(dtype=dtype, directory=str(tmp_path))
+    assert (
+        reloaded.query(vectors[5], top_k=1, namespace="Steve")["matches"][0]["id"]
+        == "v5"
+    )
+    assert len(reloaded.namespace("Steve")) == 39
+    assert reloaded.namespace("Steve").vectors.dtype == np.dtype(dtype)
+
+
+def test_compaction_keeps_the_rows_alive(tmp_path):
+    vectors = random_vectors(40)
+    namespace = Namespace(10000, 8, directory=str(tmp_path))
+    namespace.upsert(records(vectors))
+    namespace.delete(ids=[f"v{i}" for i in range(30)])
+
+    assert namespace.size == 10
+    result = namespace.query(vectors[35], top_k=1)
+    assert result["matches"][0]["id"] == "v35"
+
+
+def test_inverted_file_finds_the_nearest_rows():
+    vectors = normalize(random_vectors(2000, seed=1))
+    namespace = Namespace(approximate_threshold=500, probes=8)
+    namespace.upsert(records(vectors))
+
+    hits = 0
+    for i in range(0, 2000, 100):
+        result = namespace.query(vectors[i], top_k=1)
+        hits += result["matches"][0]["id"] == f"v{i}"
+    assert namespace.ivf is not None
+    # probing 8 of ~44 lists is approximate, but an exact copy should be found
+    assert hits >= 18
+
+
+def test_inverted_file_buckets_every_row():
+    vectors = normalize(random_vectors(400))
+    rows = np.arange(400)
+    ivf = InvertedFile(vectors, rows, probes=4)
+
+    assert len(ivf.lists) == 20
+    assert sorted(np.concatenate(ivf.lists).tolist()) == rows.tolist()
+    assert len(ivf.candidates(vectors[0])) < 400
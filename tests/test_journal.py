@@ -0,0 +1,80 @@
+from copy import deepcopy
+
+from core.civilization.person.brain.memory.journal import Journal
+from core.civilization.person.brain.memory.short_term import ShortTermMemory
+
+
+def create(journal_dir, instruction: str = "Lead the team.", **kwargs):
+    return ShortTermMemory(
+        "Steve",
+        instruction,
+        "Your name is {name}. {instruction}",
+        journal_dir=str(journal_dir),
+        **kwargs,
+    )
+
+
+def state(memory: ShortTermMemory):
+    return deepcopy((memory.storage, memory.token_counts, memory.summary_lines))
+
+
+def test_crash_without_close_is_restored(tmp_path):
+    memory = create(tmp_path, snapshot_interval=3)
+    for i in range(7):
+        memory.save(f"prompt {i}", f"thought {i}")
+    # crash: the file is left open and nothing is snapshotted on the way out
+    expected = state(memory)
+
+    restored = create(tmp_path, snapshot_interval=3)
+    assert state(restored) == expected
+
+
+def test_compacted_memory_is_restored(tmp_path):
+    memory = create(tmp_path, token_budget=120, snapshot_interval=4)
+    for i in range(15):
+        memory.save(f"prompt {i} " + "word " * 10, f"thought {i} " + "word " * 10)
+    assert memory.summary_lines
+
+    restored = create(tmp_path, token_budget=120, snapshot_interval=4)
+    assert state(restored) == state(memory)
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    memory = create(tmp_path)
+    memory.save("prompt 0", "thought 0")
+    expected = state(memory)
+    memory.save("prompt 1", "thought 1")
+    memory.journal.close()
+
+    # a crash in the middle of the second write
+    with open(memory.journal.path) as f:
+        lines = f.readlines()
+    with open(memory.journal.path, "w") as f:
+        f.write(lines[0] + lines[1][:10])
+
+    assert state(create(tmp_path)) == expected
+
+
+def test_entries_in_the_snapshot_are_not_replayed(tmp_path):
+    journal = Journal(str(tmp_path), "Steve")
+    journal.append(prompt="a", thought="b")
+    journal.append(prompt="c", thought="d")
+    journal.snapshot({"storage": []})
+    # a crash before the journal was truncated would leave its entries behind
+    with open(journal.path, "w") as f:
+        f.write('{"sequence": 2, "prompt": "c", "thought": "d"}\n')
+    journal.append(prompt="e", thought="f")
+
+    snapshot, entries = Journal(str(tmp_path), "Steve").load()
+    assert snapshot["sequence"] == 2
+    assert [entry["prompt"] for entry in entries] == ["e"]
+
+
+def test_restore_follows_the_new_instruction(tmp_path):
+    memory = create(tmp_path)
+    memory.save("prompt 0", "thought 0")
+    memory.close()
+
+    restored = create(tmp_path, instruction="Review the work.")
+    assert restored.storage[0]["content"] == "Your name is Steve. Review the work."
+    assert restored.storage[1:] == memory.storage[1:]
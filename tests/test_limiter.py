@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.civilization.person.brain.llm.limiter import (
+    RateLimiter,
+    TokenBucket,
+    get_retry_after,
+)
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+    started_at = time.monotonic()
+    for _ in range(100):
+        limiter.acquire(100000)
+    assert time.monotonic() - started_at < 0.5
+    assert limiter.queue_depth == 0
+
+
+def test_bucket_refills_at_its_rate():
+    bucket = TokenBucket(per_minute=600)
+    bucket.take(600)
+    assert bucket.wait_time(10) == pytest.approx(1.0)
+
+    bucket.refill(bucket.updated_at + 0.5)
+    assert bucket.tokens == pytest.approx(5)
+
+    # a request larger than the bucket only waits for a full bucket
+    assert bucket.wait_time(6000) == pytest.approx(59.5)
+
+
+def test_waiters_are_let_in_first_come_first_served():
+    # 1000 tokens a second, starting empty
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=60000)
+    limiter.tokens.take(60000)
+    order = []
+
+    def acquire(name: str, tokens: int):
+        limiter.acquire(tokens)
+        order.append(name)
+
+    large = threading.Thread(target=acquire, args=("large", 300))
+    large.start()
+    while limiter.queue_depth < 1:
+        time.sleep(0.001)
+
+    small = [threading.Thread(target=acquire, args=(f"small-{i}", 1)) for i in range(5)]
+    for thread in small:
+        thread.start()
+    for thread in [large, *small]:
+        thread.join(5)
+
+    # polling would have let the small requests take the tokens first
+    assert order[0] == "large"
+    assert sorted(order[1:]) == [f"small-{i}" for i in range(5)]
+    assert limiter.queue_depth == 0
+
+
+def test_waiter_that_gives_up_lets_the_next_in():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=60000)
+    limiter.tokens.take(60000)
+
+    async def run():
+        stuck = asyncio.create_task(limiter.aacquire(60000))
+        await asyncio.sleep(0.01)
+        waiting = asyncio.create_task(limiter.aacquire(1))
+        await asyncio.sleep(0.01)
+        assert limiter.queue_depth == 2
+
+        stuck.cancel()
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(run())
+    assert limiter.queue_depth == 0
+
+
+def test_estimate_is_settled_with_the_tokens_used():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=60000)
+    estimated = limiter.estimate(max_tokens=2048)
+    assert estimated == RateLimiter.DEFAULT_COMPLETION_ESTIMATE
+    assert limiter.estimate(max_tokens=16) == 16
+
+    limiter.acquire(100 + estimated)
+    before = limiter.tokens.tokens
+    limiter.settle(estimated, 56)
+    assert limiter.tokens.tokens == pytest.approx(before + estimated - 56, abs=5)
+
+    # later completions are estimated from what earlier ones used
+    assert limiter.estimate(max_tokens=2048) < estimated
+
+
+def test_retry_after_pauses_every_caller():
+    class RateLimitError(Exception):
+        headers = {"retry-after-ms": "200"}
+
+    assert get_retry_after(RateLimitError()) == pytest.approx(0.2)
+    assert get_retry_after(Exception()) is None
+
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+    assert limiter.backoff(RateLimitError(), attempt=0) == pytest.approx(0.2)
+
+    started_at = time.monotonic()
+    limiter.acquire(1)
+    assert time.monotonic() - started_at >= 0.15
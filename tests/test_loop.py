@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.civilization.person.ear.loop import iterate
+
+
+def test_items_are_made_on_the_shared_loop():
+    threads = []
+
+    async def stream():
+        for i in range(3):
+            threads.append(threading.current_thread())
+            await asyncio.sleep(0)
+            yield i
+
+    assert list(iterate(stream())) == [0, 1, 2]
+    assert threads[0] is not threading.current_thread()
+    assert set(threads) == {threads[0]}
+
+
+def test_closing_early_closes_the_stream():
+    closed = threading.Event()
+
+    async def stream():
+        try:
+            while True:
+                yield "chunk"
+        finally:
+            closed.set()
+
+    items = iterate(stream())
+    assert next(items) == "chunk"
+    items.close()
+    assert closed.is_set()
+
+
+def test_errors_reach_the_waiting_thread():
+    async def stream():
+        yield 1
+        raise ValueError("broken")
+
+    items = iterate(stream())
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+from typing import List
+
+from core.cache import TieredCache
+from core.civilization.person.action import ActionType
+from core.civilization.person.action.base import Plan
+from core.civilization.person.brain.memory.plan_cache import PlanCache
+from core.civilization.person.brain.memory.vector import LocalIndex
+
+
+class LetterVector:
+    # letter counts are close for requests that only differ in a few words
+    def embedding(self, text: str) -> List[float]:
+        return [text.count(c) + 0.01 for c in "abcdefghijklmnopqrstuvwxyz"]
+
+
+PERSON = SimpleNamespace(name="Steve", instruction="Lead.", experts={}, tools={})
+PLANS = [
+    Plan(
+        plan_number=1,
+        action_type=ActionType.Talk,
+        objective="Tell David the answer",
+        preceding_plan_numbers=[],
+        precondition="None",
+        constraint="None",
+        effect="David knows",
+    )
+]
+
+
+def create(cache_dir, index_dir, similarity: float = 0.95) -> PlanCache:
+    return PlanCache(
+        vector=LetterVector(),
+        similarity=similarity,
+        cache=TieredCache(directory=str(cache_dir)),
+        index=LocalIndex(directory=str(index_dir)),
+    )
+
+
+def test_exact_requests_hit_after_normalizing(tmp_path):
+    cache = PlanCache(cache=TieredCache(directory=str(tmp_path)))
+    cache.set(PERSON, "Summarize the news.", PLANS)
+
+    assert cache.get(PERSON, "  summarize   the NEWS!") == PLANS
+    assert cache.get(PERSON, "Summarize the weather") is None
+
+
+def test_other_contexts_miss(tmp_path):
+    cache = PlanCache(cache=TieredCache(directory=str(tmp_path)))
+    cache.set(PERSON, "Summarize the news", PLANS)
+
+    other = SimpleNamespace(**{**vars(PERSON), "tools": {"terminal": None}})
+    assert cache.get(other, "Summarize the news") is None
+
+
+def test_similar_requests_hit_after_restart(tmp_path):
+    create(tmp_path / "cache", tmp_path / "index").set(
+        PERSON, "Summarize today's news for me", PLANS
+    )
+
+    cache = create(tmp_path / "cache", tmp_path / "index")
+    assert cache.get(PERSON, "Summarize todays news for me please") == PLANS
+    assert cache.get(PERSON, "xyz") is None
+
+
+def test_evicted_entries_are_dropped_from_the_index(tmp_path):
+    cache = create(tmp_path / "cache", tmp_path / "index")
+    cache.set(PERSON, "Summarize today's news for me", PLANS)
+
+    # a fresh cache directory has none of the entries the index points to
+    cache = create(tmp_path / "empty", tmp_path / "index")
+    assert cache.get(PERSON, "Summarize todays news for me please") is None
+    assert len(cache.index) == 0
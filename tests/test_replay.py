@@ -0,0 +1,108 @@
+import asyncio
+import socket
+from typing import AsyncGenerator, Dict, Generator, List
+
+import pytest
+
+from core.civilization.person.brain.fixture import Fixture, MissingRecordError
+from core.civilization.person.brain.llm import BaseLLM
+from core.civilization.person.brain.llm.replay import RecordingLLM, ReplayLLM
+from core.civilization.person.brain.memory.vector.base import BaseVector
+from core.civilization.person.brain.memory.vector.replay import (
+    RecordingVector,
+    ReplayVector,
+)
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class ScriptedLLM(BaseLLM):
+    model: str = "gpt-4"
+    chunks: List[str] = ["Hello", ", ", "world"]
+
+    def chat_completion(self, messages: List[Dict[str, str]], **params) -> Generator:
+        return ({"choices": [{"delta": {"content": c}}]} for c in self.chunks)
+
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], **params
+    ) -> AsyncGenerator:
+        return self._stream()
+
+    async def _stream(self) -> AsyncGenerator:
+        for c in self.chunks:
+            yield {"choices": [{"delta": {"content": c}}]}
+
+
+class ScriptedVector(BaseVector):
+    model: str = "text-embedding-ada-002"
+
+    def embedding(self, prompt: str) -> List[float]:
+        return [float(len(prompt)), 1.0]
+
+
+def read(stream) -> str:
+    return "".join(chunk["choices"][0]["delta"]["content"] for chunk in stream)
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def connect(*args, **kwargs):
+        raise OSError("network is disabled")
+
+    monkeypatch.setattr(socket.socket, "connect", connect)
+    monkeypatch.setattr(socket, "create_connection", connect)
+
+
+def test_recorded_completion_replays_offline(tmp_path, offline):
+    path = str(tmp_path / "run.jsonl")
+    recording = RecordingLLM(llm=ScriptedLLM(), fixture=Fixture(path))
+    assert read(recording.chat_completion(MESSAGES, temparture=0)) == "Hello, world"
+
+    replay = ReplayLLM(model="gpt-4", fixture=Fixture(path))
+    assert read(replay.chat_completion(MESSAGES, temparture=0)) == "Hello, world"
+    with pytest.raises(MissingRecordError):
+        replay.chat_completion(MESSAGES, temparture=1)
+
+
+def test_async_recording_replays_in_order(tmp_path, offline):
+    path = str(tmp_path / "run.jsonl")
+    recording = RecordingLLM(llm=ScriptedLLM(), fixture=Fixture(path))
+    replay = ReplayLLM(model="gpt-4", fixture=Fixture(path), realtime=True)
+
+    async def aread(stream) -> str:
+        return "".join([c["choices"][0]["delta"]["content"] async for c in stream])
+
+    async def run():
+        await aread(await recording.achat_completion(MESSAGES))
+        recording.llm.chunks = ["second"]
+        await aread(await recording.achat_completion(MESSAGES))
+
+        replay.fixture = Fixture(path)
+        first = await aread(await replay.achat_completion(MESSAGES))
+        second = await aread(await replay.achat_completion(MESSAGES))
+        # the last record keeps being replayed once they run out
+        third = await aread(await replay.achat_completion(MESSAGES))
+        return first, second, third
+
+    assert asyncio.run(run()) == ("Hello, world", "second", "second")
+
+
+def test_stream_closed_early_records_what_was_read(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    recording = RecordingLLM(llm=ScriptedLLM(), fixture=Fixture(path))
+    stream = recording.chat_completion(MESSAGES)
+    next(stream)
+    stream.close()
+
+    replay = ReplayLLM(model="gpt-4", fixture=Fixture(path))
+    assert read(replay.chat_completion(MESSAGES)) == "Hello"
+
+
+def test_recorded_embeddings_replay_offline(tmp_path, offline):
+    path = str(tmp_path / "run.jsonl")
+    recording = RecordingVector(vector=ScriptedVector(), fixture=Fixture(path))
+    assert recording.embed_many(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+
+    replay = ReplayVector(model="text-embedding-ada-002", fixture=Fixture(path))
+    assert replay.embedding("bb") == [2.0, 1.0]
+    assert replay.embedding("a") == [1.0, 1.0]
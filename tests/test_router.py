@@ -0,0 +1,64 @@
+from typing import Dict, Generator, List
+
+from core.cache import TieredCache
+from core.civilization.person.brain.llm import BaseLLM, CachedLLM
+from core.civilization.person.brain.llm.router import LLMRouter, parse_stage_models
+from core.civilization.person.brain.metrics import Stage
+
+
+class ModelLLM(BaseLLM):
+    model: str
+
+    def chat_completion(self, messages: List[Dict[str, str]], **params) -> Generator:
+        yield {"choices": [{"delta": {"content": self.model}}]}
+
+    async def achat_completion(self, messages: List[Dict[str, str]], **params):
+        raise NotImplementedError
+
+
+def create(stages: Dict[Stage, str]) -> LLMRouter:
+    llms = {"gpt-4": ModelLLM(model="gpt-4")}
+    for model in stages.values():
+        llms.setdefault(model, ModelLLM(model=model))
+    return LLMRouter(
+        default=llms["gpt-4"],
+        stages={stage: llms[model] for stage, model in stages.items()},
+    )
+
+
+def test_stage_on_the_default_model_does_not_escalate():
+    router = create({Stage.Review: "gpt-4"})
+
+    assert router.escalate(Stage.Review) is None
+    assert router.escalate(Stage.Plan) is None
+
+
+def test_cheap_stage_escalates_to_the_default():
+    router = create({Stage.Optimize: "gpt-3.5-turbo"})
+
+    assert router.get(Stage.Optimize).model == "gpt-3.5-turbo"
+    assert router.escalate(Stage.Optimize).model == "gpt-4"
+
+
+def test_cached_llms_are_told_apart_by_model():
+    cache = TieredCache()
+    router = LLMRouter(
+        default=CachedLLM(ModelLLM(model="gpt-4"), cache=cache),
+        stages={
+            Stage.Plan: CachedLLM(ModelLLM(model="gpt-4"), cache=cache),
+            Stage.Review: CachedLLM(ModelLLM(model="gpt-3.5-turbo"), cache=cache),
+        },
+    )
+
+    assert router.escalate(Stage.Plan) is None
+    assert router.escalate(Stage.Review) is not None
+
+
+def test_personal_stage_models_win():
+    config = "optimize=gpt-3.5-turbo,Steve.optimize=gpt-4,review=gpt-3.5-turbo,bad"
+
+    assert parse_stage_models(config, "Steve") == {
+        Stage.Optimize: "gpt-4",
+        Stage.Review: "gpt-3.5-turbo",
+    }
+    assert parse_stage_models(config, "David")[Stage.Optimize] == "gpt-3.5-turbo"
@@ -0,0 +1,80 @@
+from core.civilization.person.brain.memory.short_term import (
+    SUMMARY_HEADER,
+    ShortTermMemory,
+)
+
+
+def create(token_budget: int = 0, min_turns: int = 2) -> ShortTermMemory:
+    return ShortTermMemory(
+        "Steve",
+        "Lead the team.",
+        "Your name is {name}. {instruction}",
+        token_budget=token_budget,
+        min_turns=min_turns,
+        journal_dir="",
+    )
+
+
+def turn(i: int):
+    return f"prompt {i} " + "word " * 20, f"thought {i} " + "word " * 20
+
+
+def test_no_budget_keeps_everything():
+    memory = create()
+    for i in range(20):
+        memory.save(*turn(i))
+
+    assert len(memory.storage) == 1 + 20 * 2
+    assert memory.summary_lines == []
+
+
+def test_compaction_starts_at_the_budget():
+    memory = create()
+    for i in range(3):
+        memory.save(*turn(i))
+    budget = memory.tokens
+
+    memory = create(token_budget=budget)
+    for i in range(3):
+        memory.save(*turn(i))
+    assert memory.summary_lines == []
+
+    memory.save(*turn(3))
+    assert memory.summary_lines
+    assert memory.storage[1]["content"].startswith(SUMMARY_HEADER)
+
+
+def test_recent_turns_are_kept_verbatim():
+    memory = create(token_budget=300, min_turns=2)
+    for i in range(10):
+        memory.save(*turn(i))
+
+    prompt, thought = turn(9)
+    assert memory.storage[-2:] == [
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": thought},
+    ]
+    assert memory.storage[-4]["content"] == turn(8)[0]
+    # the turn before the oldest one kept is the newest line of the summary
+    oldest = int(memory.storage[2]["content"].split()[1])
+    newest_line = memory.storage[1]["content"].splitlines()[-1]
+    assert newest_line.startswith(f"- prompt {oldest - 1} ")
+
+
+def test_compaction_stays_within_budget():
+    memory = create(token_budget=300, min_turns=2)
+    for i in range(50):
+        memory.save(*turn(i))
+        assert memory.tokens <= 300
+        assert memory.tokens == sum(memory.token_counts)
+        assert len(memory.token_counts) == len(memory.storage)
+    assert memory.storage[0]["content"] == "Your name is Steve. Lead the team."
+
+
+def test_min_turns_win_over_the_budget():
+    memory = create(token_budget=10, min_turns=3)
+    for i in range(6):
+        memory.save(*turn(i))
+
+    # system message, summary and the last three turns
+    assert len(memory.storage) == 2 + 3 * 2
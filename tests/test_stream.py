@@ -0,0 +1,75 @@
+from core.civilization.person.brain.organize.base import StreamParser
+from core.civilization.person.brain.organize.execute import Executor
+from core.civilization.person.brain.organize.optimize import Optimizer
+from core.civilization.person.brain.organize.stream import ActionStreamParser
+
+
+def feed(parser: StreamParser, text: str, size: int = 1) -> bool:
+    for i in range(0, len(text), size):
+        if parser.feed(text[i : i + size]):
+            return True
+    return False
+
+
+ACTION = "Type: Talk\nName: John\nInstruction: Write the report.\nExtra: "
+
+
+def test_unfenced_extra_keeps_blank_lines():
+    extra = "First paragraph.\n\nSecond paragraph.\n\n- a list item\n"
+    parser = ActionStreamParser()
+
+    # without another action, the extra runs to the end of the stream
+    assert not feed(parser, ACTION + extra)
+    assert parser.text == ACTION + extra
+
+    action = Executor().parse(None, parser.text)
+    assert action.extra.strip() == extra.strip()
+
+
+def test_unfenced_extra_ends_at_next_action():
+    extra = "First paragraph.\n\nSecond paragraph."
+    for size in (1, 3, 7):
+        parser = ActionStreamParser()
+        assert feed(parser, ACTION + extra + "\nType: Use\nName: x\n", size)
+        assert parser.text == ACTION + extra
+
+
+def test_empty_extra_ends_at_next_action():
+    parser = ActionStreamParser()
+    assert feed(parser, "Type: Talk\nName: John\nInstruction: Hi\nExtra:\nType: Use")
+    assert parser.text == "Type: Talk\nName: John\nInstruction: Hi\nExtra:"
+
+
+def test_fenced_extra_ends_at_closing_fence():
+    extra = "```python\ndef f():\n\n    return 1\n```"
+    for size in (1, 2, 5):
+        parser = ActionStreamParser()
+        assert feed(parser, ACTION + extra + "\n\nThat is all.", size)
+        assert parser.text == ACTION + extra
+
+
+def test_fenced_extra_waits_for_opening_line():
+    parser = ActionStreamParser()
+    assert not feed(parser, ACTION + "``")
+    assert not feed(parser, "`py")
+    assert not feed(parser, "thon```")
+    assert feed(parser, "\nprint()\n```")
+    assert parser.text.endswith("print()\n```")
+
+
+def test_extra_before_action_is_ignored():
+    preamble = "I will fill Extra: later.\n"
+    parser = ActionStreamParser()
+    assert feed(parser, preamble + ACTION + "notes\nType: Use")
+    assert parser.text == preamble + ACTION + "notes"
+
+
+def test_decision_keeps_full_opinion():
+    thought = "[Accept] The plan is good.\n\nIt also covers the edge cases."
+    parser = Optimizer().get_stream_parser()
+
+    assert not feed(parser, thought)
+    assert Optimizer().parse(None, parser.text) == (
+        "The plan is good.\n\nIt also covers the edge cases.",
+        True,
+    )
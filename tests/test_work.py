@@ -0,0 +1,92 @@
+import threading
+from queue import Full
+
+import pytest
+
+from core.civilization.person.ear.work import WorkQueue
+
+
+def drain(queue: WorkQueue) -> list:
+    items = []
+    while (item := queue.get()) is not None:
+        items.append(item)
+    return items
+
+
+def test_priority_then_arrival_order():
+    queue = WorkQueue(maxsize=10, workers=1)
+    for item, priority in [("a", 1), ("b", 1), ("referee", 0), ("c", 1)]:
+        queue.put(item, priority)
+
+    assert queue.acquire()
+    assert drain(queue) == ["referee", "a", "b", "c"]
+
+
+def test_full_queue_rejects_equal_priority():
+    queue = WorkQueue(maxsize=2, workers=1)
+    queue.put("a", 1)
+    queue.put("b", 1)
+
+    with pytest.raises(Full):
+        queue.put("c", 1)
+    assert queue.stats()["rejected"] == 1
+    assert queue.depth == 2
+
+
+def test_full_queue_evicts_last_lower_priority_item():
+    queue = WorkQueue(maxsize=2, workers=1)
+    queue.put("a", 1)
+    queue.put("b", 1)
+
+    assert queue.put("referee", 0) == "b"
+    assert queue.acquire()
+    assert drain(queue) == ["referee", "a"]
+    assert queue.stats()["accepted"] == 3
+
+
+def test_unbounded_queue():
+    queue = WorkQueue(maxsize=0, workers=1)
+    for i in range(100):
+        assert queue.put(i) is None
+    assert queue.stats()["peak"] == 100
+
+
+def test_workers_are_bounded_and_released():
+    queue = WorkQueue(maxsize=10, workers=2)
+    assert not queue.acquire()
+
+    queue.put("a")
+    queue.put("b")
+    assert queue.acquire()
+    assert queue.acquire()
+    assert not queue.acquire()
+
+    assert queue.get() == "a"
+    assert queue.get() == "b"
+    assert queue.get() is None
+    assert queue.get() is None
+    assert queue.stats()["active"] == 0
+
+
+def test_every_item_is_served_once_under_contention():
+    queue = WorkQueue(maxsize=0, workers=4)
+    served = []
+    lock = threading.Lock()
+    threads = []
+
+    def work():
+        while (item := queue.get()) is not None:
+            with lock:
+                served.append(item)
+
+    for i in range(500):
+        queue.put(i)
+        if queue.acquire():
+            thread = threading.Thread(target=work)
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(served) == list(range(500))
+    assert queue.stats()["active"] == 0